@@ -0,0 +1,210 @@
+# ameisen_sd_numpy.py
+# Vektorisierter Integrator für das SD-Modell aus Ameisen_SD_BPTK.ipynb.
+#
+# Gleiche Stocks, Flows und Gleichungen wie das BPTK-Modell ("Ameisen",
+# "Invasive Ameisen", "Habitatsqualität", "Ressourcen", "Erderwärmung",
+# "Erhöhung pro Jahr"), gleicher Zeitraster (0..20 Jahre, dt=0.25).
+# Statt ein Szenario nach dem anderen zu rechnen, ist jeder Parameter
+# entweder ein Skalar oder ein Array mit einem Wert pro Szenario; alle
+# Szenarien werden gleichzeitig als eine Array-Achse integriert.
+#
+# Hinweis: Das Notebook-Szenario "Eintragungsdruck_invasive_init_5" setzt die
+# Konstante "invasive", die im BPTK-Modell nicht existiert, und rechnet darum
+# dasselbe wie "base". Hier heisst der Anfangswert wie der Stock:
+# {"Invasive Ameisen": 5.0}.
+#
+# Beispiel: 100'000 Zufallsziehungen für Erwärmungsrate und Management
+#
+#     import numpy as np
+#     from ameisen_sd_numpy import simulate
+#
+#     rng = np.random.default_rng(1)
+#     n = 100_000
+#     result = simulate(
+#         {
+#             "Erhöhung pro Jahr": rng.uniform(0.02, 0.10, n),
+#             "inv_loss_rate": rng.uniform(0.4, 0.6, n),
+#             "Invasive Ameisen": rng.choice([1.0, 5.0], n),
+#         },
+#         n_scenarios=n,
+#     )
+#     ameisen_nach_20_jahren = result.stocks["Ameisen"][-1]     # Shape (n,)
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+STOCKS = [
+    "Ameisen",
+    "Invasive Ameisen",
+    "Habitatsqualität",
+    "Ressourcen",
+    "Erderwärmung",
+    "Erhöhung pro Jahr",
+]
+
+# Anfangswerte der Stocks und Konstanten der Gleichungen (Notebook-Stand)
+DEFAULTS = {
+    # Stocks (Initialwerte)
+    "Ameisen": 20.0,
+    "Invasive Ameisen": 1.0,
+    "Habitatsqualität": 100.0,
+    "Ressourcen": 100.0,
+    "Erderwärmung": 1.6,
+    "Erhöhung pro Jahr": 0.02,
+    # Ameisen
+    "ant_growth_rate": 0.6,
+    "ant_loss_rate": 0.3,
+    "suppression_rate": 0.4,        # Unterdrückung: max. Stärke
+    "suppression_scale": 10.0,      # Unterdrückung: Sättigungsskala
+    # Invasive Ameisen
+    "inv_growth_rate": 0.8,
+    "inv_loss_rate": 0.4,           # LE4-Management: 0.4 -> 0.6
+    # Habitat
+    "climate_reference": 1.6,       # ΔT = max(0, Erderwärmung - 1.6)
+    "climate_habitat_impact": 2.0,
+    "invasive_habitat_impact": 0.08,
+    "habitat_regen_rate": 0.02,
+    # Ressourcen
+    "resource_use_native": 0.20,
+    "resource_use_invasive": 0.15,
+    "resource_regen_rate": 0.1,
+    # Bounds (Overflow/Underflow) für Habitat und Ressourcen
+    "bound_rate": 5.0,
+}
+
+
+@dataclass
+class SDResult:
+    """
+    times  = Zeitpunkte (Jahre), Shape (n_times,)
+    stocks = Stock-Name -> Array mit Shape (n_times, n_scenarios)
+    """
+
+    times: np.ndarray
+    stocks: dict
+
+    def scenario_frame(self, i: int = 0):
+        """Ein Szenario als DataFrame (Index = Zeit), vergleichbar mit BPTK-Ausgaben."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: values[:, i] for name, values in self.stocks.items()},
+            index=pd.Index(self.times, name="t"),
+        )
+
+
+def derivatives(state: dict, p: dict) -> dict:
+    """Netto-Flüsse pro Stock (BPTK: stock.equation = Zuflüsse - Abflüsse)."""
+    A = state["Ameisen"]
+    I = state["Invasive Ameisen"]
+    H = state["Habitatsqualität"]
+    R = state["Ressourcen"]
+    T = state["Erderwärmung"]
+    E = state["Erhöhung pro Jahr"]
+
+    # Ressourcen
+    resource_consumption = A * p["resource_use_native"] + I * p["resource_use_invasive"]
+    resource_regen = np.maximum(0.0, 100.0 - R) * p["resource_regen_rate"]
+    resource_overflow = np.maximum(0.0, R - 100.0) * p["bound_rate"]
+    resource_underflow = np.maximum(0.0, 0.0 - R) * p["bound_rate"]
+
+    # Invasive Ameisen
+    invasive_growth = I * p["inv_growth_rate"] * (R / (R + 20.0)) * (H / (H + 25.0))
+    invasive_loss = I * p["inv_loss_rate"]
+
+    # Habitat
+    habitat_loss = np.maximum(0.0, T - p["climate_reference"]) * p["climate_habitat_impact"]
+    habitat_change = I * p["invasive_habitat_impact"]
+    habitat_regen = np.maximum(0.0, 100.0 - H) * p["habitat_regen_rate"]
+    habitat_overflow = np.maximum(0.0, H - 100.0) * p["bound_rate"]
+    habitat_underflow = np.maximum(0.0, 0.0 - H) * p["bound_rate"]
+
+    # Ameisen
+    ant_growth = A * p["ant_growth_rate"] * (H / (H + 30.0)) * (R / (R + 25.0))
+    ant_loss = A * p["ant_loss_rate"]
+    unterdrueckung = A * p["suppression_rate"] * (I / (I + p["suppression_scale"]))
+
+    return {
+        "Ameisen": ant_growth - ant_loss - unterdrueckung,
+        "Invasive Ameisen": invasive_growth - invasive_loss,
+        "Habitatsqualität": habitat_regen - habitat_loss - habitat_change - habitat_overflow + habitat_underflow,
+        "Ressourcen": resource_regen - resource_consumption - resource_overflow + resource_underflow,
+        "Erderwärmung": E,
+        "Erhöhung pro Jahr": np.zeros_like(E),
+    }
+
+
+def _advance(state: dict, deriv: dict, h: float) -> dict:
+    return {name: state[name] + h * deriv[name] for name in STOCKS}
+
+
+def simulate(
+    params: Optional[dict] = None,
+    n_scenarios: Optional[int] = None,
+    starttime: float = 0.0,
+    stoptime: float = 20.0,
+    dt: float = 0.25,
+    method: str = "euler",
+) -> SDResult:
+    """
+    Integriert alle Szenarien gleichzeitig.
+
+    params      = Überschreibungen von DEFAULTS; Skalar oder Array (n_scenarios,)
+    n_scenarios = Anzahl Szenarien (Standard: aus der Länge der Array-Parameter)
+    method      = "euler" (wie BPTK) oder "rk4"
+    """
+    p = dict(DEFAULTS)
+    for name, value in (params or {}).items():
+        if name not in DEFAULTS:
+            raise KeyError(f"Unbekannter Parameter: {name}")
+        p[name] = value
+
+    if n_scenarios is None:
+        sizes = {np.size(v) for v in p.values() if np.ndim(v) > 0}
+        if len(sizes) > 1:
+            raise ValueError(f"Array-Parameter mit unterschiedlicher Länge: {sorted(sizes)}")
+        n_scenarios = sizes.pop() if sizes else 1
+
+    # Konstanten bleiben Skalare, wo möglich (spart Rechenzeit pro Schritt)
+    p = {name: np.asarray(value, dtype=float) for name, value in p.items()}
+
+    n_steps = int(round((stoptime - starttime) / dt))
+    times = starttime + dt * np.arange(n_steps + 1)
+    out = {name: np.empty((n_steps + 1, n_scenarios)) for name in STOCKS}
+
+    state = {name: np.broadcast_to(p[name], (n_scenarios,)).copy() for name in STOCKS}
+    for name in STOCKS:
+        out[name][0] = state[name]
+
+    for k in range(1, n_steps + 1):
+        if method == "euler":
+            state = _advance(state, derivatives(state, p), dt)
+        elif method == "rk4":
+            k1 = derivatives(state, p)
+            k2 = derivatives(_advance(state, k1, dt / 2), p)
+            k3 = derivatives(_advance(state, k2, dt / 2), p)
+            k4 = derivatives(_advance(state, k3, dt), p)
+            state = {
+                name: state[name] + dt / 6.0 * (k1[name] + 2 * k2[name] + 2 * k3[name] + k4[name])
+                for name in STOCKS
+            }
+        else:
+            raise ValueError(f"Unbekannte Methode: {method} (euler | rk4)")
+        for name in STOCKS:
+            out[name][k] = state[name]
+
+    return SDResult(times=times, stocks=out)
+
+
+if __name__ == "__main__":
+    # LE4-Klima-Szenarien in einem Aufruf
+    rates = np.array([0.02, 0.04, 0.06, 0.10])
+    result = simulate({"Erhöhung pro Jahr": rates})
+    for i, rate in enumerate(rates):
+        print(f"Erhöhung pro Jahr = {rate:.2f} °C -> Ameisen nach 20 Jahren: "
+              f"{result.stocks['Ameisen'][-1, i]:.2f}")
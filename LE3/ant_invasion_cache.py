@@ -0,0 +1,156 @@
+# ant_invasion_cache.py
+# Ergebnis-Cache für Modellläufe auf der Disk.
+#
+# Schlüssel eines Laufs = SHA-256 über
+# - Engine ("agents" | "vectorized" | "tiled")
+# - alle Konstruktor-Argumente inkl. Standardwerte (ohne n_steps/debug_counters/
+#   profile/collect_hills/processes/kernels/hill_events/death_events, die die Modelldaten
+#   nicht verändern); Dateipfade
+#   (z.B. Hügel-Positionen) über den Inhalt der Datei
+# - Seed und Anzahl Steps
+# - Code-Version (Hash der Quelldateien der Modelle und der Numba-Kernels)
+#
+# Gespeichert werden die Modelldaten (get_model_vars_dataframe) als .npz pro
+# Lauf. Ist der Cache grösser als max_bytes, werden die am längsten nicht mehr
+# benutzten Einträge gelöscht (LRU über die Änderungszeit der Dateien).
+#
+# Das setzt reproduzierbare Läufe voraus (gleicher Seed = gleicher Lauf,
+# siehe AntInvasionModel).
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+# Quelldateien, deren Inhalt die Resultate bestimmt. Die Kernels gehören dazu:
+# "kernels" zählt nicht zum Schlüssel (numba und numpy rechnen dasselbe), eine
+# Änderung an den Kernels muss also über die Code-Version alte Einträge ungültig machen.
+CODE_FILES = [
+    "ants_invasion_model.py",
+    "ants_invasion_vectorized.py",
+    "ants_invasion_tiled.py",
+    "ants_invasion_kernels.py",
+]
+
+# Konstruktor-Argumente ohne Einfluss auf die Modelldaten
+NON_RESULT_KWARGS = {"n_steps", "debug_counters", "profile", "collect_hills", "processes", "kernels",
+                     "hill_events", "death_events"}
+
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """Hash über die Modell-Quelldateien (ändert sich mit jeder Code-Änderung)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        here = Path(__file__).resolve().parent
+        for name in CODE_FILES:
+            digest.update(name.encode())
+            digest.update((here / name).read_bytes())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def _file_digest(value):
+    # Dateien als Parameter (z.B. Hügel-Positionen) über ihren Inhalt schlüsseln
+    if isinstance(value, str) and os.path.isfile(value):
+        return "sha256:" + hashlib.sha256(Path(value).read_bytes()).hexdigest()
+    return value
+
+
+def run_key(model_cls, engine: str, params: dict, seed: int, n_steps: int) -> str:
+    """Cache-Schlüssel eines Laufs (Standardwerte werden ergänzt)."""
+    bound = inspect.signature(model_cls.__init__).bind_partial(None, **params)
+    bound.apply_defaults()
+    kwargs = {
+        name: _file_digest(value)
+        for name, value in bound.arguments.items()
+        if name not in ("self", "seed") and name not in NON_RESULT_KWARGS
+    }
+    payload = json.dumps(
+        {
+            "engine": engine,
+            "kwargs": kwargs,
+            "seed": seed,
+            "n_steps": n_steps,
+            "code": code_version(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Modelldaten pro Lauf als <key>.npz in cache_dir.
+
+    max_bytes = Obergrenze für die Grösse des Caches (None = unbegrenzt)
+    """
+
+    def __init__(self, cache_dir, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str):
+        """DataFrame des Laufs oder None. Ein Treffer zählt als Benutzung (LRU)."""
+        import pandas as pd
+
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = [str(name) for name in data["columns"]]
+                df = pd.DataFrame({name: data[f"col{i}"] for i, name in enumerate(columns)})
+                if "stop_reason" in data.files:
+                    df.attrs["stop_reason"] = str(data["stop_reason"]) or None
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # inzwischen von put() eines Workers verdrängt, df ist trotzdem gültig
+            pass
+        return df
+
+    def put(self, key: str, df):
+        """Speichert die Modelldaten eines Laufs und räumt danach auf."""
+        arrays = {f"col{i}": df[name].to_numpy() for i, name in enumerate(df.columns)}
+        arrays["columns"] = np.array([str(name) for name in df.columns])
+        arrays["stop_reason"] = np.array(df.attrs.get("stop_reason") or "")
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            np.savez_compressed(fh, **arrays)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Älteste (am längsten nicht benutzte) Einträge löschen, bis max_bytes eingehalten ist."""
+        if self.max_bytes is None:
+            return
+        entries = []
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # gleichzeitig von einem anderen Prozess gelöscht
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
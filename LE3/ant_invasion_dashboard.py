@@ -0,0 +1,334 @@
+# ant_invasion_dashboard.py
+# Dashboard mit Hintergrund-Lauf: das Modell rechnet in einem eigenen Thread
+# so schnell es geht, die Seite zeigt mit fester Bildrate den letzten Stand.
+#
+# In ant_invasion_viz.py (SolaraViz) wartet jeder Step, bis alle Plots und das
+# Grid neu gezeichnet sind. Hier sind Rechnen und Zeichnen entkoppelt:
+#
+# - BackgroundRunner steppt das Modell in einem Thread (Play/Pause, N Steps
+#   springen, optional gedrosselt auf max. Steps pro Sekunde)
+# - snapshot() liest unter einem Lock Step, Rasterbild (ant_invasion_raster.py)
+#   und das Ende der Modelldaten; die Seite zeichnet nur aus diesen Snapshots,
+#   nie direkt aus dem laufenden Modell
+# - die Seite fragt alle 1/fps Sekunden einen neuen Snapshot ab und zeichnet
+#   ihn; nur solange pausiert das Modell
+#
+# Starten (aus dem Ordner LE3):
+#     solara run ant_invasion_dashboard.py
+#
+# Ein Jahr Simulationszeit sind bei 7 Minuten pro Step rund 75'000 Steps
+# ("1 Jahr" springt direkt dorthin).
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import solara
+from matplotlib.figure import Figure
+
+from ant_invasion_raster import raster_image
+from ant_invasion_viz import model_params
+from ants_invasion_model import AntInvasionModel, ColumnarDataCollector
+
+STEPS_PER_YEAR = round(365 * 24 * 60 / 7)   # 1 Step = 7 Minuten
+DEFAULT_FPS = 2
+MAX_PLOT_POINTS = 2000                       # längere Verläufe werden ausgedünnt
+
+
+# -------------------------------------------------------
+# Modelldaten ohne kompletten DataFrame
+# -------------------------------------------------------
+
+def collector_rows(collector) -> int:
+    if isinstance(collector, ColumnarDataCollector):
+        return collector.n_rows
+    return len(next(iter(collector.model_vars.values()), []))
+
+
+def collector_tail(collector, tail: Optional[int] = None, max_points: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """
+    Die letzten `tail` Zeilen der Modelldaten (None = alle), höchstens
+    max_points davon (gleichmässig ausgedünnt, die letzte Zeile immer dabei).
+    Index = Zeilennummer wie in get_model_vars_dataframe().
+    """
+    n = collector_rows(collector)
+    start = 0 if tail is None else max(0, n - tail)
+    stride = max(1, -(-(n - start) // max_points))
+    rows = np.arange(n - 1, start - 1, -stride)[::-1]
+
+    if isinstance(collector, ColumnarDataCollector):
+        data = {name: column[rows] for name, column in collector.columns.items()}
+    else:
+        data = {name: [values[i] for i in rows] for name, values in collector.model_vars.items()}
+    return pd.DataFrame(data, index=rows, columns=list(collector.model_reporters))
+
+
+# -------------------------------------------------------
+# Hintergrund-Lauf
+# -------------------------------------------------------
+
+class BackgroundRunner:
+    """
+    Steppt ein Modell in einem Hintergrund-Thread.
+
+    play() / pause()     = Dauerlauf starten / anhalten
+    jump(n)              = n Steps rechnen, dann anhalten
+    max_rate             = höchstens so viele Steps pro Sekunde (None = unbegrenzt)
+    snapshot()           = konsistenter Stand für die Anzeige (unter dem Lock)
+    hold()               = solange der with-Block läuft, beginnt kein neuer Step
+
+    Zwischen zwei Steps wird der Lock freigegeben, ein Snapshot wartet also
+    höchstens einen Step (snapshot() und jump() melden sich über hold() an,
+    sonst schnappt der Thread sich den Lock sofort wieder). Fehler im Modell
+    halten den Lauf an und landen in `error`. Der Thread ist ein Daemon und
+    endet mit close().
+    """
+
+    def __init__(self, model, max_rate: Optional[float] = None):
+        self.model = model
+        self.max_rate = max_rate
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+        self._wake = threading.Event()   # gesetzt = es gibt etwas zu rechnen
+        self._free = threading.Event()   # gesetzt = kein hold() aktiv
+        self._free.set()
+        self._holds = 0
+        self._holds_lock = threading.Lock()
+        self._closed = False
+        self._target: Optional[int] = None  # Ziel-Step (jump), None = Dauerlauf
+        # gemessene Rate (Steps/s) über die letzten Sekunden
+        self._rate_steps = model.steps
+        self._rate_time = time.perf_counter()
+        self.rate = 0.0
+
+        self._thread = threading.Thread(target=self._loop, name="ant-invasion-runner", daemon=True)
+        self._thread.start()
+
+    # ----- Steuerung ----------------------------------------------
+
+    @property
+    def playing(self) -> bool:
+        return self._wake.is_set()
+
+    def play(self):
+        self._target = None
+        if self.model.running and self.error is None:
+            self._wake.set()
+
+    def pause(self):
+        self._wake.clear()
+
+    def jump(self, n: int):
+        """n Steps rechnen (so schnell wie möglich), danach anhalten."""
+        if n <= 0 or not self.model.running or self.error is not None:
+            return
+        with self.hold(), self.lock:
+            self._target = self.model.steps + n
+        self._wake.set()
+
+    @contextmanager
+    def hold(self):
+        """Keine neuen Steps beginnen, solange der Block läuft (ein laufender Step rechnet fertig)."""
+        with self._holds_lock:
+            self._holds += 1
+            self._free.clear()
+        try:
+            yield
+        finally:
+            with self._holds_lock:
+                self._holds -= 1
+                if self._holds == 0:
+                    self._free.set()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._free.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- Thread -------------------------------------------------
+
+    def _loop(self):
+        next_at = time.perf_counter()
+        while True:
+            self._wake.wait()
+            self._free.wait()
+            if self._closed:
+                return
+
+            with self.lock:
+                try:
+                    self.model.step()
+                except Exception as e:  # noqa: BLE001 (wird in der Seite angezeigt)
+                    self.error = e
+                    self._wake.clear()
+                    continue
+                done = not self.model.running or (
+                    self._target is not None and self.model.steps >= self._target
+                )
+            if done:
+                self._target = None
+                self._wake.clear()
+
+            # Drosselung nur im Dauerlauf, jump() rechnet immer mit voller Geschwindigkeit
+            if self.max_rate and self._target is None:
+                next_at = max(next_at + 1.0 / self.max_rate, time.perf_counter() - 1.0)
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                next_at = time.perf_counter()
+
+    # ----- Anzeige ------------------------------------------------
+
+    def snapshot(self, tail: Optional[int] = None, max_size: int = 400) -> dict:
+        """
+        Stand für die Anzeige: Step, Rasterbild (siehe raster_image), die
+        letzten `tail` Zeilen der Modelldaten (None = alle, ausgedünnt) und
+        die aktuelle Rate in Steps pro Sekunde.
+        """
+        with self.hold(), self.lock:
+            steps = self.model.steps
+            image = raster_image(self.model, max_size)
+            data = collector_tail(self.model.datacollector, tail)
+            running = self.model.running
+            stop_reason = getattr(self.model, "stop_reason", None)
+
+        now = time.perf_counter()
+        if now - self._rate_time >= 1.0:
+            self.rate = (steps - self._rate_steps) / (now - self._rate_time)
+            self._rate_steps, self._rate_time = steps, now
+        return {
+            "steps": steps,
+            "image": image,
+            "data": data,
+            "running": running,
+            "stop_reason": stop_reason,
+            "playing": self.playing,
+            "rate": self.rate,
+            "error": self.error,
+        }
+
+
+# -------------------------------------------------------
+# Solara-Seite
+# -------------------------------------------------------
+
+PLOTS = [
+    ["NativeAnts", "InvasiveAnts"],
+    ["TotalResources"],
+    ["HabitatQuality", "Warming"],
+    ["StoredFoodNative", "StoredFoodInvasive"],
+]
+
+
+def _raster_figure(snap: dict, width: int, height: int) -> Figure:
+    image = snap["image"]
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
+    ax.imshow(image.transpose(1, 0, 2), origin="lower", interpolation="nearest",
+              extent=(0, width, 0, height))
+    ax.set_title(f"Step {snap['steps']}", fontsize=9)
+    return fig
+
+
+def _plot_figure(data: pd.DataFrame) -> Figure:
+    # alle Verläufe in einer Figure (ein PNG pro Bild statt eines pro Plot),
+    # feste Ränder: layout="constrained" kostet pro Bild mehr als das Zeichnen
+    fig = Figure(figsize=(6, 2 * len(PLOTS)))
+    fig.subplots_adjust(left=0.12, right=0.97, top=0.98, bottom=0.06, hspace=0.12)
+    axes = fig.subplots(len(PLOTS), 1, sharex=True)
+    for ax, measures in zip(axes, PLOTS):
+        for measure in measures:
+            ax.plot(data.index, data[measure], label=measure)
+        ax.legend(loc="best", fontsize=8)
+    axes[-1].set_xlabel("Step")
+    return fig
+
+
+@solara.component
+def Dashboard():
+    generation = solara.use_reactive(0)         # Reset = neues Modell
+    runner, set_runner = solara.use_state(None)
+    fps = solara.use_reactive(DEFAULT_FPS)
+    max_rate = solara.use_reactive(0)           # 0 = unbegrenzt
+    jump_steps = solara.use_reactive(1000)
+    tail = solara.use_reactive(0)               # 0 = ganzer Verlauf
+    _frame, set_frame = solara.use_state(0)    # Zähler, löst das Neuzeichnen aus
+
+    def start():
+        r = BackgroundRunner(AntInvasionModel(**model_params))
+        set_runner(r)
+        return r.close   # beim Verlassen der Seite / neuem Runner aufräumen
+
+    solara.use_effect(start, [generation.value])
+
+    def ticker(cancel: threading.Event):
+        # feste Bildrate, unabhängig davon, wie schnell das Modell rechnet
+        while not cancel.wait(1.0 / max(fps.value, 0.1)):
+            if runner is None:
+                continue
+            # set_frame zeichnet die Seite in diesem Thread neu; solange pausiert
+            # das Modell. Sonst kämpfen Modell-Thread und Zeichnen ums GIL und
+            # ein Bild dauert (auf einem Kern) mehrere Sekunden.
+            with runner.hold():
+                set_frame(lambda f: f + 1)
+
+    # intrusive_cancel=False: sonst installiert solara einen Tracer im Thread und
+    # das Zeichnen (läuft in diesem Thread) wird ein Vielfaches langsamer
+    solara.use_thread(ticker, dependencies=[fps.value, runner], intrusive_cancel=False)
+
+    if runner is None:
+        solara.Text("Modell wird erstellt ...")
+        return
+    runner.max_rate = max_rate.value or None
+
+    snap = runner.snapshot(tail=tail.value or None)
+    model = runner.model
+
+    with solara.Sidebar():
+        with solara.Row():
+            if snap["playing"]:
+                solara.Button("Pause", on_click=runner.pause)
+            else:
+                solara.Button("Play", on_click=runner.play, disabled=not snap["running"])
+            solara.Button("Reset", on_click=lambda: generation.set(generation.value + 1))
+        solara.InputInt("Steps springen", value=jump_steps)
+        with solara.Row():
+            solara.Button("Springen", on_click=lambda: runner.jump(jump_steps.value))
+            solara.Button("1 Jahr", on_click=lambda: runner.jump(STEPS_PER_YEAR))
+        solara.SliderInt("Max. Steps/s (0 = unbegrenzt)", value=max_rate, min=0, max=2000, step=10)
+        solara.SliderInt("Bilder pro Sekunde", value=fps, min=1, max=10)
+        solara.SliderInt("Verlauf: letzte Steps (0 = alle)", value=tail, min=0, max=STEPS_PER_YEAR, step=1000)
+
+    status = ""
+    if not snap["running"]:
+        status = ", Modell beendet" + (f" ({snap['stop_reason']})" if snap["stop_reason"] else "")
+    solara.Markdown(
+        f"**Step {snap['steps']:,}** ({snap['steps'] / STEPS_PER_YEAR:.2f} Jahre), "
+        f"{snap['rate']:,.0f} Steps/s{status}"
+    )
+    if snap["error"] is not None:
+        solara.Error(f"Fehler im Modell: {snap['error']!r}")
+
+    # neu zeichnen nur, wenn sich etwas geändert hat (angehalten = kein Aufwand)
+    key = [runner, snap["steps"], tail.value]
+    with solara.Columns([1, 1]):
+        solara.FigureMatplotlib(_raster_figure(snap, model.width, model.height),
+                                format="png", dependencies=key)
+        if len(snap["data"]):
+            solara.FigureMatplotlib(_plot_figure(snap["data"]), format="png", dependencies=key)
+
+
+page = Dashboard
@@ -0,0 +1,351 @@
+# ant_invasion_ensemble.py
+# Ensemble-Lauf: dieselben Parameter mit M Seeds, parallel über alle Kerne.
+#
+# Ein einzelner Seed sagt wenig (Reihenfolge der Ameisen, attack_prob,
+# Zufallsbewegung). Statt alle Läufe zu speichern, wird jede Datenspalte
+# ("NativeAnts", "InvasiveAnts", "HabitatQuality", ...) pro Step laufend
+# zusammengefasst:
+#
+# - Mittelwert und Varianz (Welford), Minimum, Maximum
+# - Quantile (z.B. 5 %, 50 %, 95 %) mit dem P²-Verfahren (Jain & Chlamtac
+#   1985): fünf Marker pro Quantil und Step statt aller Werte
+#
+# Der Speicherbedarf wächst nur mit der Anzahl Steps (pro Step und Spalte rund
+# 35 Zahlen bei drei Quantilen), nicht mit der Anzahl Seeds. Mit --every k wird
+# nur jeder k-te Step ausgewertet (für sehr lange Läufe).
+#
+# Läufe, die eine Abbruchbedingung vorzeitig beendet (stop_when /
+# steady_window, siehe StopCheck), werden mit pad_stopped() auf --steps
+# aufgefüllt: ab dem Abbruch zählt der letzte Zustand weiter. So haben alle
+# Läufe gleich viele Zeilen und die Bänder zeigen z.B. den Anteil
+# ausgestorbener Läufe richtig an.
+#
+# Die Läufe werden in der Reihenfolge der Seeds eingerechnet: die P²-Quantile
+# hängen (leicht) von der Reihenfolge ab, so ist das Resultat reproduzierbar.
+#
+# Beispiel (aus dem Ordner LE3):
+#     python ant_invasion_ensemble.py --params params.json --seeds 100 --steps 2000 --out ensemble.csv
+#
+# ensemble.csv hat pro Step eine Zeile und pro Spalte <name>_mean, _std,
+# _min, _max und _q5, _q50, _q95 (siehe EnsembleStats.summary()). Die
+# Bänder lassen sich in ant_invasion_viz.py anzeigen (ENSEMBLE = "ensemble.csv",
+# make_band_component).
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ant_invasion_sweep import ENGINES, pad_stopped, require_parquet, run_model, write_frame
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+# -------------------------------------------------------
+# Laufende Quantile (P²)
+# -------------------------------------------------------
+
+class P2Quantiles:
+    """
+    Laufende Quantile nach dem P²-Verfahren, für viele Reihen gleichzeitig.
+
+    Jede add()-Beobachtung ist ein Array mit einem Wert pro Reihe (hier: pro
+    Step). Pro Quantil und Reihe werden fünf Marker (Höhe, Position)
+    nachgeführt; die mittlere Höhe ist die Schätzung des Quantils. Bis zu
+    fünf Beobachtungen sind die Quantile exakt (lineare Interpolation wie
+    np.quantile).
+    """
+
+    def __init__(self, quantiles, size: int):
+        self.p = np.asarray(quantiles, dtype=np.float64)
+        if np.any((self.p <= 0) | (self.p >= 1)):
+            raise ValueError("Quantile müssen zwischen 0 und 1 liegen (exklusive)")
+        self.count = 0
+        self._first = np.empty((size, 5))            # die ersten fünf Beobachtungen
+        self.heights: Optional[np.ndarray] = None    # (Quantil, Reihe, Marker)
+        self.positions: Optional[np.ndarray] = None  # (Quantil, Reihe, Marker), ab 1 gezählt
+
+        p = self.p[:, None]
+        # gewünschte Positionen (gleich für alle Reihen) und ihr Zuwachs pro Beobachtung
+        self.desired = np.hstack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, np.full_like(p, 5.0)])
+        self.increment = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])
+
+    def add(self, x: np.ndarray):
+        x = np.asarray(x, dtype=np.float64)
+        if self.count < 5:
+            self._first[:, self.count] = x
+            self.count += 1
+            return
+        if self.heights is None:
+            # Marker erst mit der sechsten Beobachtung, bis dahin bleiben die Quantile exakt
+            start = np.sort(self._first, axis=1)
+            self.heights = np.broadcast_to(start, (len(self.p),) + start.shape).copy()
+            self.positions = np.broadcast_to(np.arange(1.0, 6.0), self.heights.shape).copy()
+            self._first = None
+
+        q, n = self.heights, self.positions
+        # Zelle k der Beobachtung (q[k] <= x < q[k+1]), Randmarker mitziehen
+        k = (x[None, :, None] >= q[:, :, 1:4]).sum(axis=2)
+        np.minimum(q[:, :, 0], x, out=q[:, :, 0])
+        np.maximum(q[:, :, 4], x, out=q[:, :, 4])
+        n += np.arange(5) > k[:, :, None]
+        self.desired += self.increment
+        self.count += 1
+
+        # mittlere Marker Richtung gewünschte Position verschieben (parabolisch, sonst linear)
+        for i in (1, 2, 3):
+            d = self.desired[:, None, i] - n[:, :, i]
+            move = ((d >= 1) & (n[:, :, i + 1] - n[:, :, i] > 1)) | ((d <= -1) & (n[:, :, i - 1] - n[:, :, i] < -1))
+            if not move.any():
+                continue
+            d = np.where(move, np.sign(d), 0.0)
+            qi, ni = q[:, :, i], n[:, :, i]
+            q_lo, q_hi = q[:, :, i - 1], q[:, :, i + 1]
+            n_lo, n_hi = n[:, :, i - 1], n[:, :, i + 1]
+
+            parabolic = qi + d / (n_hi - n_lo) * (
+                (ni - n_lo + d) * (q_hi - qi) / (n_hi - ni)
+                + (n_hi - ni - d) * (qi - q_lo) / (ni - n_lo)
+            )
+            linear = np.where(
+                d > 0,
+                qi + (q_hi - qi) / (n_hi - ni),
+                qi - (q_lo - qi) / (n_lo - ni),
+            )
+            new = np.where((q_lo < parabolic) & (parabolic < q_hi), parabolic, linear)
+            q[:, :, i] = np.where(move, new, qi)
+            n[:, :, i] = ni + d
+
+    def values(self) -> np.ndarray:
+        """Aktuelle Schätzung, Form (Quantil, Reihe); NaN ohne Beobachtungen."""
+        if self.count == 0:
+            return np.full((len(self.p), self._first.shape[0]), np.nan)
+        if self.heights is None:
+            return np.quantile(self._first[:, : self.count], self.p, axis=1)
+        return self.heights[:, :, 2].copy()
+
+
+# -------------------------------------------------------
+# Statistik über ein Ensemble
+# -------------------------------------------------------
+
+class EnsembleStats:
+    """
+    Laufende Statistik über Läufe mit denselben Parametern: pro Datenspalte
+    und Step Mittelwert, Varianz (Welford), Minimum, Maximum und Quantile
+    (P2Quantiles). Die einzelnen Läufe werden nicht gespeichert.
+
+    quantiles = auszuwertende Quantile (0..1)
+    every     = nur jeden k-ten Step auswerten (Zeilen 0, k, 2k, ...)
+
+    add() nimmt die Modelldaten eines Laufs (DataFrame oder dict Spalte ->
+    Array, eine Zeile pro Step). Alle Läufe müssen gleich lang sein.
+    """
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES, every: int = 1):
+        if every < 1:
+            raise ValueError("every muss >= 1 sein")
+        self.quantiles = tuple(float(q) for q in quantiles)
+        self.every = every
+        self.n_runs = 0
+        self.errors: dict = {}                    # Seed -> Fehlermeldung (run_ensemble)
+        self.rows: Optional[np.ndarray] = None   # ausgewertete Zeilennummern
+        self.columns: list[str] = []
+        self._mean: dict[str, np.ndarray] = {}
+        self._m2: dict[str, np.ndarray] = {}
+        self._min: dict[str, np.ndarray] = {}
+        self._max: dict[str, np.ndarray] = {}
+        self._quantiles: dict[str, P2Quantiles] = {}
+
+    def thin(self, data) -> dict:
+        """Modelldaten eines Laufs auf die ausgewerteten Zeilen reduzieren (Spalte -> float-Array)."""
+        if isinstance(data, pd.DataFrame):
+            data = {name: data[name].to_numpy() for name in data.columns}
+        return {name: np.asarray(values, dtype=np.float64)[:: self.every] for name, values in data.items()}
+
+    def add(self, data):
+        self._add(self.thin(data))
+
+    def _add(self, data: dict):
+        # data = bereits ausgedünnte Spalten (siehe thin())
+        if self.rows is None:
+            self.columns = list(data)
+            size = len(next(iter(data.values()), []))
+            self.rows = np.arange(size) * self.every
+            for name in self.columns:
+                self._mean[name] = np.zeros(size)
+                self._m2[name] = np.zeros(size)
+                self._min[name] = np.full(size, np.inf)
+                self._max[name] = np.full(size, -np.inf)
+                self._quantiles[name] = P2Quantiles(self.quantiles, size)
+        elif list(data) != self.columns or any(len(v) != len(self.rows) for v in data.values()):
+            raise ValueError("Lauf passt nicht zum Ensemble (andere Spalten oder Anzahl Steps)")
+
+        self.n_runs += 1
+        for name, x in data.items():
+            mean = self._mean[name]
+            delta = x - mean
+            mean += delta / self.n_runs
+            self._m2[name] += delta * (x - mean)
+            np.minimum(self._min[name], x, out=self._min[name])
+            np.maximum(self._max[name], x, out=self._max[name])
+            self._quantiles[name].add(x)
+
+    # ----- Auswertung ---------------------------------------------
+
+    def mean(self, name: str) -> np.ndarray:
+        return self._mean[name].copy()
+
+    def var(self, name: str) -> np.ndarray:
+        """Stichprobenvarianz (ddof=1 wie pandas), NaN bei weniger als zwei Läufen."""
+        if self.n_runs < 2:
+            return np.full(len(self.rows), np.nan)
+        return self._m2[name] / (self.n_runs - 1)
+
+    def std(self, name: str) -> np.ndarray:
+        return np.sqrt(self.var(name))
+
+    def quantile(self, name: str) -> np.ndarray:
+        """Quantile der Spalte, Form (len(quantiles), Anzahl Zeilen)."""
+        return self._quantiles[name].values()
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Eine Zeile pro ausgewertetem Step (Index = Zeilennummer der Modelldaten),
+        pro Spalte <name>_mean, _std, _min, _max und _q<Prozent> (z.B. _q5, _q50).
+        """
+        if self.rows is None:
+            return pd.DataFrame()
+        out = {}
+        for name in self.columns:
+            out[f"{name}_mean"] = self.mean(name)
+            out[f"{name}_std"] = self.std(name)
+            out[f"{name}_min"] = self._min[name]
+            out[f"{name}_max"] = self._max[name]
+            for q, values in zip(self.quantiles, self.quantile(name)):
+                out[f"{name}_{quantile_label(q)}"] = values
+        return pd.DataFrame(out, index=pd.Index(self.rows, name="Step"))
+
+
+def quantile_label(q: float) -> str:
+    """0.05 -> "q5", 0.5 -> "q50", 0.025 -> "q2.5" """
+    return f"q{q * 100:g}"
+
+
+# -------------------------------------------------------
+# Ensemble-Lauf
+# -------------------------------------------------------
+
+def _run_columns(params: dict, seed: int, n_steps: int, engine: str, every: int) -> dict:
+    # läuft im Worker-Prozess: nur die ausgewerteten Zeilen zurückschicken
+    df = pad_stopped(run_model(params, seed, n_steps, engine), n_steps)
+    return EnsembleStats(every=every).thin(df)
+
+
+def run_ensemble(
+    params: dict,
+    seeds,
+    n_steps: int,
+    engine: str = "agents",
+    quantiles=DEFAULT_QUANTILES,
+    every: int = 1,
+    max_workers: Optional[int] = None,
+) -> EnsembleStats:
+    """
+    Rechnet params mit allen seeds (Anzahl 0..N-1 oder Liste) und fasst die
+    Modelldaten laufend in einem EnsembleStats zusammen.
+
+    Es sind höchstens 2 x max_workers Läufe gleichzeitig unterwegs, die
+    Resultate werden in der Reihenfolge der Seeds eingerechnet. Ein
+    fehlerhafter Lauf stoppt das Ensemble nicht, er fehlt in der Statistik
+    (Fehler in stats.errors, Seed -> Meldung).
+    """
+    if isinstance(seeds, int):
+        seeds = list(range(seeds))
+    max_workers = max_workers or os.cpu_count()
+
+    stats = EnsembleStats(quantiles, every)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        todo = iter(seeds)
+        for done in range(1, len(seeds) + 1):
+            # Fenster auffüllen, dann auf den ältesten Lauf warten
+            for seed in todo:
+                pending.append((seed, pool.submit(_run_columns, params, seed, n_steps, engine, every)))
+                if len(pending) >= 2 * max_workers:
+                    break
+            seed, future = pending.popleft()
+            try:
+                stats._add(future.result())
+            except Exception as exc:  # ein fehlerhafter Lauf soll das Ensemble nicht stoppen
+                stats.errors[seed] = repr(exc)
+            print(f"[{done}/{len(seeds)}] seed {seed} "
+                  f"{'FEHLER ' + stats.errors[seed] if seed in stats.errors else 'fertig'} "
+                  f"({time.perf_counter() - t0:.1f} s)", flush=True)
+    return stats
+
+
+# -------------------------------------------------------
+# Zusammenfassung laden
+# -------------------------------------------------------
+
+def load_summary(path) -> pd.DataFrame:
+    """Zusammenfassung laden, die mit --out geschrieben wurde (.csv oder .parquet)."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        require_parquet()
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col="Step")
+
+
+# -------------------------------------------------------
+# Kommandozeile
+# -------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ensemble über viele Seeds (Mittelwert, Varianz, Quantile pro Step)")
+    parser.add_argument("--params", help="JSON-Datei mit Modellparametern (wie model_params)")
+    parser.add_argument("--seeds", type=int, required=True, help="Anzahl Seeds (0..N-1)")
+    parser.add_argument("--steps", type=int, required=True)
+    parser.add_argument("--out", required=True, help="Ausgabedatei der Zusammenfassung (.csv oder .parquet)")
+    parser.add_argument("--quantiles", type=float, nargs="+", default=list(DEFAULT_QUANTILES))
+    parser.add_argument("--every", type=int, default=1, help="nur jeden k-ten Step auswerten")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="agents")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    out = Path(args.out)
+    if out.suffix == ".parquet":
+        require_parquet()  # vor den Läufen prüfen, nicht erst beim Schreiben
+
+    params = {}
+    if args.params:
+        with open(args.params) as fh:
+            params = json.load(fh)
+
+    stats = run_ensemble(
+        params,
+        seeds=args.seeds,
+        n_steps=args.steps,
+        engine=args.engine,
+        quantiles=args.quantiles,
+        every=args.every,
+        max_workers=args.workers,
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    write_frame(stats.summary(), out)
+    print(f"{stats.n_runs} Läufe ({len(stats.errors)} Fehler) -> {out}")
+
+
+if __name__ == "__main__":
+    main()
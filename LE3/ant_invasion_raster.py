@@ -0,0 +1,213 @@
+# ant_invasion_raster.py
+# Grid als ein Rasterbild statt einem Marker pro Agent (für grosse Grids).
+#
+# make_space_component(agent_portrayal) baut bei jedem Neuzeichnen ein
+# Marker-Dict pro Agent (auch pro ResourcePatch), ab etwa 100x100 Zellen und
+# ein paar tausend Ameisen wird die Seite unbedienbar. Hier entsteht pro Frame
+# ein einziges RGB-Array:
+#
+# - Ressourcen: Grün je nach Füllstand (Mittelwert über den Block)
+# - Ameisen: Blau (einheimisch) bzw. Rot (invasiv) je nach Dichte
+# - Hügel: dunkle Quadrate (Dunkelblau / Dunkelrot)
+#
+# Grids grösser als max_size Pixel werden blockweise verkleinert (ein Pixel =
+# factor x factor Zellen). Mit every=k wird das Bild nur alle k Steps neu
+# berechnet, dazwischen bleibt das letzte Bild stehen.
+#
+# Beispiel (siehe ant_invasion_viz.py):
+#
+#     Space = make_raster_component(every=5, max_size=400)
+#     page = SolaraViz(model=model, components=[Space, ...])
+#
+# raster_image() funktioniert auch ohne GUI, z.B. für Einzelbilder eines
+# langen Laufs: plt.imsave("frame.png", raster_image(model).transpose(1, 0, 2)[::-1])
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import solara
+from matplotlib.figure import Figure
+from mesa.visualization.utils import update_counter
+
+from ants_invasion_model import (
+    InvasiveAnt,
+    InvasiveAntHill,
+    NativeAnt,
+    NativeAntHill,
+    ResourcePatch,
+)
+
+
+# -------------------------------------------------------
+# Farben (RGB 0..1)
+# -------------------------------------------------------
+
+BACKGROUND = np.array([1.0, 1.0, 1.0])
+RESOURCE_COLOR = np.array([0.0, 0.4, 0.0])      # wie "#006600" im Agent-Portrayal
+NATIVE_COLOR = np.array([0.0, 0.0, 1.0])
+INVASIVE_COLOR = np.array([1.0, 0.0, 0.0])
+NATIVE_HILL_COLOR = np.array([0.0, 0.0, 0.35])
+INVASIVE_HILL_COLOR = np.array([0.35, 0.0, 0.0])
+
+RESOURCE_ALPHA = 0.8    # voller Patch
+ANT_ALPHA_MIN = 0.5     # eine einzelne Ameise bleibt sichtbar
+
+
+# -------------------------------------------------------
+# Ebenen aus dem Modell
+# -------------------------------------------------------
+
+def _block_sum(a: np.ndarray, factor: int) -> np.ndarray:
+    """Summe über factor x factor Zellen (Rand mit 0 aufgefüllt)."""
+    if factor == 1:
+        return a
+    w, h = a.shape
+    pw, ph = -w % factor, -h % factor
+    if pw or ph:
+        a = np.pad(a, ((0, pw), (0, ph)))
+    return a.reshape(a.shape[0] // factor, factor, a.shape[1] // factor, factor).sum(axis=(1, 3))
+
+
+def _counts(x, y, width: int, height: int) -> np.ndarray:
+    """Anzahl Ameisen pro Zelle (width x height)."""
+    x = np.asarray(x, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    return np.bincount(x * height + y, minlength=width * height).reshape(width, height)
+
+
+def _positions(model, agent_type):
+    agents = model.agents_by_type.get(agent_type, [])
+    return [a.pos[0] for a in agents], [a.pos[1] for a in agents]
+
+
+def raster_layers(model) -> dict:
+    """
+    Ebenen des Grids als Arrays (width x height):
+    resources (Füllstand 0..1), natives/invasives (Anzahl pro Zelle) und
+    native_hills/invasive_hills (Liste von Positionen).
+
+    Funktioniert für AntInvasionModel (mit und ohne resource_field) und
+    VectorizedAntInvasionModel.
+    """
+    width, height = model.width, model.height
+    if not hasattr(model, "grid"):
+        raise ValueError("raster_layers braucht ein Modell mit einem ganzen Grid (nicht den Kachel-Modus)")
+
+    if model.resources is not None:
+        max_amount = model.resources.max_amount
+        frac = np.divide(model.resources.current(), max_amount,
+                         out=np.zeros((width, height)), where=max_amount > 0)
+    else:
+        frac = np.zeros((width, height))
+        for patch in model.agents_by_type.get(ResourcePatch, []):
+            if patch.max_amount > 0:
+                frac[patch.pos] = patch.amount / patch.max_amount
+    frac = np.clip(frac, 0.0, 1.0)
+
+    if hasattr(model, "natives"):
+        # VectorizedAntInvasionModel: Positionen direkt aus den Arrays
+        natives = _counts(model.natives.x, model.natives.y, width, height)
+        invasives = _counts(model.invasives.x, model.invasives.y, width, height)
+    else:
+        natives = _counts(*_positions(model, NativeAnt), width, height)
+        invasives = _counts(*_positions(model, InvasiveAnt), width, height)
+
+    return {
+        "resources": frac,
+        "natives": natives,
+        "invasives": invasives,
+        "native_hills": [h.pos for h in model.agents_by_type.get(NativeAntHill, [])],
+        "invasive_hills": [h.pos for h in model.agents_by_type.get(InvasiveAntHill, [])],
+    }
+
+
+def raster_factor(width: int, height: int, max_size: int) -> int:
+    """Zellen pro Pixel (pro Achse), damit das Bild höchstens max_size Pixel breit/hoch ist."""
+    return max(1, math.ceil(max(width, height) / max_size))
+
+
+def raster_image(model, max_size: int = 400) -> np.ndarray:
+    """
+    RGB-Bild des Grids als Array (x, y, 3), Werte 0..1.
+
+    Für imshow: image.transpose(1, 0, 2) mit origin="lower" (x nach rechts,
+    y nach oben wie im Mesa-Grid).
+    """
+    layers = raster_layers(model)
+    factor = raster_factor(model.width, model.height, max_size)
+    cells = _block_sum(np.ones((model.width, model.height)), factor)
+
+    image = np.broadcast_to(BACKGROUND, cells.shape + (3,)).copy()
+
+    # Ressourcen: Füllstand gemittelt über den Block
+    alpha = RESOURCE_ALPHA * _block_sum(layers["resources"], factor) / cells
+    image += alpha[..., None] * (RESOURCE_COLOR - image)
+
+    # Ameisen: jede sichtbar, ab einer Ameise pro Zelle voll deckend
+    for name, color in (("natives", NATIVE_COLOR), ("invasives", INVASIVE_COLOR)):
+        count = _block_sum(layers[name], factor)
+        alpha = np.where(count > 0, ANT_ALPHA_MIN + (1.0 - ANT_ALPHA_MIN) * np.minimum(1.0, count / cells), 0.0)
+        image += alpha[..., None] * (color - image)
+
+    # Hügel: Quadrat von mindestens 3x3 Pixeln, damit sie auch verkleinert sichtbar bleiben
+    radius = 1 if factor > 1 or max(model.width, model.height) > 100 else 0
+    for name, color in (("native_hills", NATIVE_HILL_COLOR), ("invasive_hills", INVASIVE_HILL_COLOR)):
+        for x, y in layers[name]:
+            px, py = x // factor, y // factor
+            image[max(0, px - radius):px + radius + 1, max(0, py - radius):py + radius + 1] = color
+
+    return image
+
+
+# -------------------------------------------------------
+# Solara-Komponente
+# -------------------------------------------------------
+
+def _figure(model, max_size: int) -> Figure:
+    """Figure mit dem Rasterbild des aktuellen Steps."""
+    image = raster_image(model, max_size)
+    factor = raster_factor(model.width, model.height, max_size)
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
+    ax.imshow(image.transpose(1, 0, 2), origin="lower", interpolation="nearest",
+              extent=(0, image.shape[0] * factor, 0, image.shape[1] * factor))
+    ax.set_xlim(0, model.width)
+    ax.set_ylim(0, model.height)
+    title = f"Step {model.steps}"
+    if factor > 1:
+        title += f" ({factor}x{factor} Zellen pro Pixel)"
+    ax.set_title(title, fontsize=9)
+    return fig
+
+
+@solara.component
+def RasterSpace(model, every: int = 1, max_size: int = 400):
+    """
+    Grid als Rasterbild (siehe raster_image).
+
+    Das letzte Bild liegt im Zustand der Komponente (use_memo), also pro
+    Browser-Sitzung und Modell; zwischen den Neuberechnungen alle `every`
+    Steps wird es wiederverwendet.
+    """
+    update_counter.get()
+    key = [id(model), model.steps // every, max_size]
+    fig = solara.use_memo(lambda: _figure(model, max_size), dependencies=key)
+    solara.FigureMatplotlib(fig, format="png", bbox_inches="tight", dependencies=key)
+
+
+def make_raster_component(every: int = 1, max_size: int = 400, page: int = 0):
+    """
+    Raster-Gegenstück zu make_space_component für SolaraViz.
+
+    every    = Bild nur alle `every` Steps neu berechnen
+    max_size = maximale Bildgrösse in Pixeln pro Achse (grössere Grids werden verkleinert)
+    """
+    if every < 1 or max_size < 1:
+        raise ValueError("every und max_size müssen >= 1 sein")
+
+    def MakeRasterSpace(model):
+        return RasterSpace(model, every=every, max_size=max_size)
+
+    return (MakeRasterSpace, page)
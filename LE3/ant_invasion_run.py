@@ -0,0 +1,166 @@
+# ant_invasion_run.py
+# Kommandozeilen-Lauf für AntInvasionModel (ohne GUI).
+#
+# Die Modelldaten werden blockweise (--chunk Steps) an die Ausgabedatei
+# angehängt, der Speicherbedarf bleibt darum auch bei Millionen Steps konstant.
+# Eine Fortschrittszeile erscheint alle --progress Steps, am Ende werden
+# Gesamtzeit und Steps/s ausgegeben.
+#
+# Beispiel (aus dem Ordner LE3):
+#     python ant_invasion_run.py --params params.json --steps 1500000 --seed 1 --out run.csv
+#
+# params.json enthält die Modellparameter wie model_params in ant_invasion_viz.py:
+#     {"width": 51, "height": 51, "initial_native": 30, "resource_field": true}
+#
+# Mit Abbruchbedingungen in params.json (z.B. "stop_when": ["both_extinct"],
+# "steady_window": 20000) endet der Lauf vor --steps, sobald eine greift.
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+from ant_invasion_sweep import ENGINES, require_parquet
+
+
+# -------------------------------------------------------
+# Blockweise Ausgabe
+# -------------------------------------------------------
+
+class ChunkWriter:
+    """
+    Hängt DataFrames an eine CSV- oder Parquet-Datei an (Format aus der Endung).
+    Der Index (Step) läuft über alle Blöcke weiter.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = 0
+        self._parquet = None
+        if self.path.suffix not in (".csv", ".parquet"):
+            raise ValueError(f"Unbekanntes Ausgabeformat: {self.path.suffix} (.csv | .parquet)")
+        if self.path.suffix == ".parquet":
+            require_parquet()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, df):
+        if df.empty:
+            return
+        df.index = range(self.rows, self.rows + len(df))
+        df.index.name = "Step"
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+# -------------------------------------------------------
+# Lauf
+# -------------------------------------------------------
+
+def run(
+    params: dict,
+    n_steps: int,
+    out,
+    seed: Optional[int] = None,
+    engine: str = "agents",
+    chunk: int = 10_000,
+    progress: int = 10_000,
+) -> float:
+    """
+    Rechnet n_steps Steps und schreibt die Modelldaten blockweise nach out.
+
+    seed     = überschreibt "seed" aus params (falls angegeben)
+    chunk    = Anzahl Zeilen pro geschriebenem Block
+    progress = Fortschrittszeile alle `progress` Steps (0 = keine)
+
+    Gibt die Steps pro Sekunde zurück.
+    """
+    params = dict(params)
+    if seed is not None:
+        params["seed"] = seed
+    chunk = max(1, chunk)
+
+    # Ausgabeformat zuerst prüfen, damit ein Fehler nicht erst nach dem ersten Block auffällt
+    writer = ChunkWriter(out)
+    # n_steps = Blockgrösse: der ColumnarDataCollector wird nach jedem Block geleert
+    model = ENGINES[engine](**{**params, "n_steps": chunk})
+
+    t0 = time.perf_counter()
+    t = 0
+    try:
+        while t < n_steps and model.running:
+            t += 1
+            model.step()
+            if t % chunk == 0:
+                writer.write(model.datacollector.drain())
+            if progress and t % progress == 0:
+                elapsed = time.perf_counter() - t0
+                print(
+                    f"Step {t:>10d}/{n_steps} | "
+                    f"Native = {model.n_native:6d} | "
+                    f"Invasive = {model.n_invasive:6d} | "
+                    f"Habitat = {model.habitat_quality:5.3f} | "
+                    f"{t / elapsed:8.1f} Steps/s",
+                    flush=True,
+                )
+        writer.write(model.datacollector.drain())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - t0
+    rate = t / elapsed if elapsed > 0 else float("inf")
+    if model.stop_reason:
+        print(f"gestoppt bei Step {t} ({model.stop_reason})")
+    print(f"{t} Steps in {elapsed:.1f} s ({rate:.1f} Steps/s) -> {writer.path}")
+    return rate
+
+
+# -------------------------------------------------------
+# Kommandozeile
+# -------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AntInvasionModel ohne GUI rechnen")
+    parser.add_argument("--params", help="JSON-Datei mit Modellparametern (wie model_params)")
+    parser.add_argument("--steps", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=None, help="überschreibt seed aus --params")
+    parser.add_argument("--out", required=True, help="Ausgabedatei (.csv oder .parquet)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="agents")
+    parser.add_argument("--chunk", type=int, default=10_000, help="Zeilen pro geschriebenem Block")
+    parser.add_argument("--progress", type=int, default=10_000, help="Fortschritt alle N Steps (0 = aus)")
+    args = parser.parse_args(argv)
+
+    params = {}
+    if args.params:
+        with open(args.params) as fh:
+            params = json.load(fh)
+
+    run(
+        params,
+        n_steps=args.steps,
+        out=args.out,
+        seed=args.seed,
+        engine=args.engine,
+        chunk=args.chunk,
+        progress=args.progress,
+    )
+
+
+if __name__ == "__main__":
+    main()
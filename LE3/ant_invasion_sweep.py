@@ -0,0 +1,280 @@
+# ant_invasion_sweep.py
+# Parameter-Sweep für AntInvasionModel: Parameter-Grid x Seeds,
+# parallel über alle Kerne (ProcessPoolExecutor).
+#
+# Jeder Lauf schreibt seine Modelldaten direkt nach Abschluss als eigene Datei
+# (run_00000.csv / .parquet) in den Ausgabeordner. manifest.csv enthält pro
+# Lauf Parameter, Seed, Datei und Laufzeit und wird laufend ergänzt.
+#
+# Beispiel (aus dem Ordner LE3):
+#     python ant_invasion_sweep.py --grid grid.json --seeds 10 --steps 2000 --out sweep_out
+#
+# grid.json:
+#     {"attack_prob": [0.05, 0.1, 0.2], "warming_rate": [0.0, 1e-7]}
+#
+# Mit --cache DIR werden die Modelldaten jedes Laufs zusätzlich im
+# Ergebnis-Cache abgelegt (ant_invasion_cache.py). Ein späterer Sweep rechnet
+# nur noch die Kombinationen, die noch nicht im Cache sind.
+#
+# Mit Abbruchbedingungen in den Parametern (z.B. "stop_when": ["both_extinct"],
+# "steady_window": 5000, siehe StopCheck) endet ein Lauf, sobald sie greifen.
+# Die Datei enthält dann nur die gerechneten Steps, manifest.csv die Anzahl
+# Zeilen (rows) und den Grund (stop_reason). pad_stopped() füllt bei Bedarf
+# wieder auf die volle Länge auf.
+
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ant_invasion_cache import ResultCache, run_key
+from ants_invasion_model import AntInvasionModel
+from ants_invasion_tiled import TiledAntInvasionModel
+from ants_invasion_vectorized import VectorizedAntInvasionModel
+
+
+ENGINES = {
+    "agents": AntInvasionModel,
+    "vectorized": VectorizedAntInvasionModel,
+    "tiled": TiledAntInvasionModel,
+}
+
+MANIFEST_FIELDS = ["run_id", "seed", "params", "file", "seconds", "cached", "rows", "stop_reason", "error"]
+
+
+# -------------------------------------------------------
+# Hilfsfunktionen
+# -------------------------------------------------------
+
+def expand_grid(param_grid: dict) -> list[dict]:
+    """{"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]"""
+    keys = list(param_grid)
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in param_grid.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def require_parquet():
+    """Bricht mit klarer Meldung ab, wenn pyarrow für .parquet-Dateien fehlt."""
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            "Parquet-Ausgabe braucht pyarrow: pip install pyarrow "
+            "(oder das Extra 'parquet' aus pyproject.toml)"
+        )
+
+
+def write_frame(df, path: Path):
+    if path.suffix == ".parquet":
+        df.to_parquet(path)
+    else:
+        df.to_csv(path, index_label="Step")
+
+
+def run_model(params: dict, seed: int, n_steps: int, engine: str = "agents"):
+    """
+    Einen Lauf rechnen und die Modelldaten als DataFrame zurückgeben.
+
+    Greift eine Abbruchbedingung (model.running = False), endet der Lauf
+    dort; der DataFrame ist dann kürzer und df.attrs["stop_reason"] nennt den
+    Grund (sonst None).
+    """
+    model = ENGINES[engine](**{"n_steps": n_steps, **params, "seed": seed})
+    for _ in range(n_steps):
+        model.step()
+        if not model.running:
+            break
+    df = model.datacollector.get_model_vars_dataframe()
+    df.attrs["stop_reason"] = model.stop_reason
+    return df
+
+
+def pad_stopped(df, n_rows: int, trend=("Warming",)):
+    """
+    Vorzeitig beendeten Lauf auf n_rows Zeilen auffüllen: die neuen Zeilen
+    wiederholen die letzte Zeile, Spalten in `trend` laufen mit ihrer letzten
+    Änderung linear weiter (Warming steigt auch nach dem Abbruch).
+    Exakt ist das nur für Spalten, die sich nicht mehr ändern.
+    """
+    import pandas as pd
+
+    missing = n_rows - len(df)
+    if missing <= 0 or df.empty:
+        return df
+    tail = pd.DataFrame(
+        {name: [df[name].iloc[-1]] * missing for name in df.columns},
+        index=range(len(df), n_rows),
+    )
+    k = np.arange(1, missing + 1)
+    for name in trend:
+        if name in df.columns and len(df) > 1:
+            slope = df[name].iloc[-1] - df[name].iloc[-2]
+            tail[name] = df[name].iloc[-1] + slope * k
+    padded = pd.concat([df, tail.astype(df.dtypes.to_dict())])
+    padded.attrs = dict(df.attrs)
+    return padded
+
+
+def _run_and_store(run_id: int, params: dict, seed: int, n_steps: int,
+                   engine: str, out_dir: str, fmt: str,
+                   cache_dir: Optional[str] = None, cache_max_bytes: Optional[int] = None):
+    # läuft im Worker-Prozess: rechnen und direkt auf die Disk schreiben
+    t0 = time.perf_counter()
+    df = run_model(params, seed, n_steps, engine)
+    path = Path(out_dir) / f"run_{run_id:05d}.{fmt}"
+    write_frame(df, path)
+    if cache_dir is not None:
+        key = run_key(ENGINES[engine], engine, params, seed, n_steps)
+        ResultCache(cache_dir, cache_max_bytes).put(key, df)
+    return path.name, time.perf_counter() - t0, len(df), df.attrs.get("stop_reason")
+
+
+# -------------------------------------------------------
+# Sweep
+# -------------------------------------------------------
+
+def run_sweep(
+    param_grid: dict,
+    seeds,
+    n_steps: int,
+    out_dir,
+    base_params: Optional[dict] = None,
+    engine: str = "agents",
+    fmt: str = "csv",
+    max_workers: Optional[int] = None,
+    cache_dir=None,
+    cache_max_bytes: Optional[int] = None,
+) -> Path:
+    """
+    Rechnet alle Kombinationen aus param_grid für alle seeds.
+
+    base_params  = feste Parameter, die von param_grid überschrieben werden
+    seeds        = Anzahl Seeds (0..N-1) oder Liste von Seeds
+    max_workers  = Anzahl Prozesse (Standard: alle Kerne)
+    cache_dir    = Ergebnis-Cache; Läufe im Cache werden nicht neu gerechnet
+    cache_max_bytes = Grössenlimit des Caches (LRU), None = unbegrenzt
+
+    Gibt den Pfad der manifest.csv zurück.
+    """
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unbekanntes Format: {fmt} (csv | parquet)")
+    if fmt == "parquet":
+        require_parquet()  # sonst scheitert jeder einzelne Lauf erst beim Schreiben
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if isinstance(seeds, int):
+        seeds = list(range(seeds))
+
+    runs = []
+    for combo in expand_grid(param_grid):
+        params = {**(base_params or {}), **combo}
+        for seed in seeds:
+            runs.append((len(runs), params, seed))
+
+    cache = ResultCache(cache_dir, cache_max_bytes) if cache_dir is not None else None
+
+    manifest_path = out_dir / "manifest.csv"
+    with open(manifest_path, "w", newline="") as fh, \
+            ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        writer = csv.DictWriter(fh, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+
+        # Läufe aus dem Cache direkt übernehmen, nur die fehlenden rechnen
+        done = 0
+        missing = []
+        for run_id, params, seed in runs:
+            df = None
+            if cache is not None:
+                df = cache.get(run_key(ENGINES[engine], engine, params, seed, n_steps))
+            if df is None:
+                missing.append((run_id, params, seed))
+                continue
+            path = out_dir / f"run_{run_id:05d}.{fmt}"
+            row = {"run_id": run_id, "seed": seed, "params": json.dumps(params, sort_keys=True), "cached": 1}
+            try:
+                write_frame(df, path)
+                row.update(file=path.name, rows=len(df), stop_reason=df.attrs.get("stop_reason"))
+            except Exception as exc:  # wie bei den gerechneten Läufen: Sweep läuft weiter
+                row["error"] = repr(exc)
+                print(f"run {run_id} (seed {seed}) aus dem Cache: FEHLER {row['error']}")
+            writer.writerow(row)
+            done += 1
+        if cache is not None:
+            fh.flush()
+            print(f"{done}/{len(runs)} Läufe aus dem Cache, {len(missing)} zu rechnen")
+
+        futures = {
+            pool.submit(_run_and_store, run_id, params, seed, n_steps, engine, str(out_dir), fmt,
+                        None if cache is None else str(cache.cache_dir), cache_max_bytes):
+                (run_id, params, seed)
+            for run_id, params, seed in missing
+        }
+        for done, future in enumerate(as_completed(futures), start=done + 1):
+            run_id, params, seed = futures[future]
+            row = {"run_id": run_id, "seed": seed, "params": json.dumps(params, sort_keys=True), "cached": 0}
+            try:
+                row["file"], seconds, row["rows"], row["stop_reason"] = future.result()
+                row["seconds"] = f"{seconds:.3f}"
+            except Exception as exc:  # ein fehlerhafter Lauf soll den Sweep nicht stoppen
+                row["error"] = repr(exc)
+            writer.writerow(row)
+            fh.flush()
+            status = "FEHLER " + row["error"] if "error" in row else "fertig"
+            if row.get("stop_reason"):
+                status += f" (gestoppt nach {row['rows']} Steps: {row['stop_reason']})"
+            print(f"[{done}/{len(runs)}] run {run_id} (seed {seed}) {status}")
+
+    return manifest_path
+
+
+# -------------------------------------------------------
+# Kommandozeile
+# -------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parameter-Sweep für AntInvasionModel")
+    parser.add_argument("--grid", required=True, help="JSON-Datei: Parameter -> Liste von Werten")
+    parser.add_argument("--base", help="JSON-Datei mit festen Parametern (z.B. model_params)")
+    parser.add_argument("--seeds", type=int, default=1, help="Anzahl Seeds pro Kombination")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--out", required=True, help="Ausgabeordner")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="agents")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", help="Ordner des Ergebnis-Caches (optional)")
+    parser.add_argument("--cache-size", type=float, default=None, help="Grössenlimit des Caches in MB")
+    args = parser.parse_args(argv)
+
+    with open(args.grid) as fh:
+        param_grid = json.load(fh)
+    base_params = None
+    if args.base:
+        with open(args.base) as fh:
+            base_params = json.load(fh)
+
+    manifest = run_sweep(
+        param_grid,
+        seeds=args.seeds,
+        n_steps=args.steps,
+        out_dir=args.out,
+        base_params=base_params,
+        engine=args.engine,
+        fmt=args.format,
+        max_workers=args.workers,
+        cache_dir=args.cache,
+        cache_max_bytes=None if args.cache_size is None else int(args.cache_size * 1e6),
+    )
+    print(f"Manifest: {manifest}")
+
+
+if __name__ == "__main__":
+    main()
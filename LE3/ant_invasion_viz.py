@@ -1,8 +1,14 @@
 # ants_invasion_viz.py
 # Visualisierung für AntInvasionModel mit Mesa 3 + SolaraViz
 
+import solara
+from matplotlib.figure import Figure
 from mesa.visualization import SolaraViz, make_space_component, make_plot_component
+from mesa.visualization.components import PropertyLayerStyle
+from mesa.visualization.utils import update_counter
 
+from ant_invasion_ensemble import load_summary
+from ant_invasion_raster import make_raster_component
 from ants_invasion_model import (
     AntInvasionModel,
     NativeAnt,
@@ -10,6 +16,16 @@ from ants_invasion_model import (
     ResourcePatch,
 )
 
+# Grid als ein Rasterbild zeichnen (ant_invasion_raster.py) statt einem Marker
+# pro Agent. Für grosse Grids (ab ca. 100x100) und viele Ameisen nötig.
+RASTER = True
+RASTER_EVERY = 1        # Rasterbild nur alle k Steps neu berechnen
+RASTER_MAX_SIZE = 400   # grössere Grids werden verkleinert (Pixel pro Achse)
+
+# Zusammenfassung eines Ensembles (ant_invasion_ensemble.py --out ...): die
+# Plots zeigen dann hinter dem laufenden Modell das Band der Seeds.
+ENSEMBLE = None         # z.B. "ensemble.csv"
+
 
 # -------------------------------------------------------
 # Agent-Portrayal für das Grid
@@ -75,6 +91,66 @@ def agent_portrayal(agent):
     }
 
 
+def resource_portrayal(layer):
+    # Ressourcen-Feld (resource_field=True): ein Bild statt ein Quadrat pro Zelle
+    if layer.name == "resources":
+        return PropertyLayerStyle(
+            colormap="Greens",
+            vmin=0.0,
+            vmax=model_params["patch_max"],
+            alpha=0.8,
+            colorbar=False,
+        )
+    return None
+
+
+# -------------------------------------------------------
+# Ensemble-Bänder
+# -------------------------------------------------------
+
+def _band_columns(summary, measure):
+    # äusserste Quantile als Band, Median (sonst Mittelwert) als Linie
+    labels = [c[len(measure) + 1:] for c in summary.columns if c.startswith(measure + "_q")]
+    if not labels:
+        return None, None, f"{measure}_mean"
+    labels.sort(key=lambda label: float(label[1:]))
+    center = f"{measure}_q50" if "q50" in labels else f"{measure}_mean"
+    return f"{measure}_{labels[0]}", f"{measure}_{labels[-1]}", center
+
+
+@solara.component
+def EnsembleBands(model, summary, measures):
+    # Band des Ensembles, Median gestrichelt, das laufende Modell darüber
+    update_counter.get()
+    df = model.datacollector.get_model_vars_dataframe()
+
+    fig = Figure()
+    ax = fig.subplots()
+    for measure in measures:
+        low, high, center = _band_columns(summary, measure)
+        line, = ax.plot(summary.index, summary[center], linestyle="--", linewidth=1,
+                        label=f"{measure} (Ensemble)")
+        if low is not None:
+            ax.fill_between(summary.index, summary[low], summary[high],
+                            color=line.get_color(), alpha=0.2, linewidth=0)
+        ax.plot(df.index, df[measure], color=line.get_color(), label=measure)
+    ax.set_xlabel("Step")
+    ax.legend(loc="best", fontsize=8)
+    solara.FigureMatplotlib(fig, format="png", dependencies=[id(model), model.steps])
+
+
+def make_band_component(summary, measures, page=0):
+    # wie make_plot_component, mit den Bändern aus einer Ensemble-Zusammenfassung
+    missing = [m for m in measures if f"{m}_mean" not in summary.columns]
+    if missing:
+        raise ValueError(f"Nicht in der Ensemble-Zusammenfassung: {missing}")
+
+    def MakeEnsembleBands(model):
+        return EnsembleBands(model, summary, list(measures))
+
+    return (MakeEnsembleBands, page)
+
+
 # -------------------------------------------------------
 # Standard-Parameter für das Modell
 # -------------------------------------------------------
@@ -100,6 +176,7 @@ model_params = {
     "warming_rate": 0.02/((1*365*24*60)/7), # Berechnung Grad pro Step
     "invasive_habitat_impact": 0.000001,
     "seed": 42,
+    "resource_field": True,
 }
 
 # Modellinstanz
@@ -109,11 +186,24 @@ model = AntInvasionModel(**model_params)
 # Solara-Komponenten
 # -------------------------------------------------------
 
-Space = make_space_component(agent_portrayal)
-PopPlot = make_plot_component(["NativeAnts", "InvasiveAnts"])
-EnvPlot = make_plot_component(["TotalResources"])
-HabPlot = make_plot_component(["HabitatQuality", "Warming"])
-StoredPlot = make_plot_component(["StoredFoodNative", "StoredFoodInvasive"])
+if RASTER:
+    Space = make_raster_component(every=RASTER_EVERY, max_size=RASTER_MAX_SIZE)
+else:
+    Space = make_space_component(agent_portrayal, propertylayer_portrayal=resource_portrayal)
+
+ensemble_summary = load_summary(ENSEMBLE) if ENSEMBLE else None
+
+
+def make_plot(measures):
+    if ensemble_summary is not None:
+        return make_band_component(ensemble_summary, measures)
+    return make_plot_component(measures)
+
+
+PopPlot = make_plot(["NativeAnts", "InvasiveAnts"])
+EnvPlot = make_plot(["TotalResources"])
+HabPlot = make_plot(["HabitatQuality", "Warming"])
+StoredPlot = make_plot(["StoredFoodNative", "StoredFoodInvasive"])
 
 # -------------------------------------------------------
 # SolaraViz-Seite
@@ -0,0 +1,352 @@
+# ants_invasion_checkpoint.py
+# Checkpoint/Restore für AntInvasionModel.
+#
+# Ein Checkpoint ist eine komprimierte .npz-Datei (ohne Pickle) mit:
+# - Konstruktor-Argumenten und globalen Stocks (Habitat, Erwärmung, Zähler)
+# - allen Agenten in Registrierungsreihenfolge (Position, Energie, Modus,
+#   Hügelvorräte, Ressourcen-Patches) und der Reihenfolge in jeder Gridzelle
+# - dem Ressourcen-Feld (bei resource_field=True, mit lazy_regen=True auch
+#   dem Stand der verzögerten Regeneration)
+# - dem Zustand aller Zufallsströme (model.random, random_native,
+#   random_invasive, model.rng)
+# - den bisher gesammelten Modelldaten (und Hügeldaten bei collect_hills=True,
+#   Messzeilen des StepProfilers bei profile=True)
+# - dem Stand der Abbruchbedingungen (stop_reason, steady_window)
+#
+# Nach load_checkpoint() läuft das Modell bit-identisch weiter, als wäre es
+# nie unterbrochen worden: Reihenfolge der Agenten (shuffle_do), Reihenfolge
+# in den Zellen (Angriffe, erster Hügel) und Zufallszahlen sind dieselben.
+#
+# Beispiel: Burn-in einmal rechnen, danach mehrere "Was-wäre-wenn"-Äste
+#
+#     model = AntInvasionModel(width=100, height=100, resource_field=True)
+#     for _ in range(50_000):
+#         model.step()
+#     save_checkpoint(model, "burnin.npz")
+#
+#     for rate in (0.0, 1e-7, 2e-7):
+#         branch = load_checkpoint("burnin.npz", reseed=1)
+#         branch.warming_rate = rate
+#         ...
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import mesa
+import numpy as np
+
+from mesa import Agent
+
+from ants_invasion_model import (
+    AntInvasionModel,
+    ColumnarDataCollector,
+    InvasiveAnt,
+    InvasiveAntHill,
+    LazyResourceField,
+    NativeAnt,
+    NativeAntHill,
+    ResourcePatch,
+    make_stream,
+)
+
+
+CHECKPOINT_VERSION = 6
+
+# Agententypen mit den Attributen, die sich während eines Laufs ändern
+# können. Alles andere setzt der Konstruktor des Agenten.
+AGENT_FIELDS = {
+    ResourcePatch: ["amount", "max_amount", "regen_rate"],
+    NativeAntHill: ["stored_food_native", "max_new_ants_per_step", "spawned"],
+    InvasiveAntHill: ["stored_food_invasive", "max_new_ants_per_step", "spawned"],
+    NativeAnt: ["energy", "metabolism", "bite_size", "mode"],
+    InvasiveAnt: ["energy", "metabolism", "bite_size", "attack_prob", "mode"],
+}
+
+# Konstruktor-Aufruf pro Typ (Werte werden danach aus dem Checkpoint gesetzt)
+AGENT_FACTORIES = {
+    ResourcePatch: lambda m: ResourcePatch(m, amount=0.0, max_amount=0.0, regen_rate=0.0),
+    NativeAntHill: lambda m: NativeAntHill(m),
+    InvasiveAntHill: lambda m: InvasiveAntHill(m),
+    NativeAnt: lambda m: NativeAnt(m, energy=0.0, metabolism=0.0, bite_size=0.0),
+    InvasiveAnt: lambda m: InvasiveAnt(m, energy=0.0, metabolism=0.0, bite_size=0.0, attack_prob=0.0),
+}
+
+# Modellattribute, die der Konstruktor nicht wiederherstellt
+MODEL_STATE = [
+    "steps",
+    "running",
+    "habitat_quality",
+    "warming",
+    "warming_rate",
+    "invasive_habitat_impact",
+    "attack_prob",
+    "initial_total_resources",
+    "resource_total",
+    "n_native",
+    "n_invasive",
+    "total_stored_native",
+    "total_stored_invasive",
+    "stop_reason",
+]
+
+# random.Random-Ströme des Modells (siehe AntInvasionModel)
+RANDOM_STREAMS = ["random", "random_native", "random_invasive"]
+
+TYPE_NAMES = {agent_type: agent_type.__name__ for agent_type in AGENT_FIELDS}
+TYPES_BY_NAME = {name: agent_type for agent_type, name in TYPE_NAMES.items()}
+
+
+# Mesa-Version, mit der _id_counters() geprüft wurde
+MESA_CHECKED = "3.3.1"
+
+
+# -------------------------------------------------------
+# unique_id-Zähler
+# -------------------------------------------------------
+
+def _id_counters(model: AntInvasionModel) -> dict:
+    """
+    Mesas Zähler für unique_id (Agent._ids: Modell -> itertools.count).
+
+    Agent._ids ist kein öffentliches API von Mesa. Hat es eine andere Form,
+    wird abgebrochen, statt unique_ids nach dem Laden doppelt zu vergeben.
+    """
+    ids = getattr(Agent, "_ids", None)
+    if not isinstance(ids, dict) or not isinstance(ids.get(model, itertools.count()), itertools.count):
+        raise RuntimeError(
+            f"Checkpoints brauchen Mesas internen Zähler Agent._ids (Modell -> itertools.count, "
+            f"geprüft mit Mesa {MESA_CHECKED}); in Mesa {mesa.__version__} hat er eine andere Form"
+        )
+    return ids
+
+
+# -------------------------------------------------------
+# Speichern
+# -------------------------------------------------------
+
+def save_checkpoint(model: AntInvasionModel, path) -> Path:
+    """
+    Schreibt den kompletten Modellzustand nach path (.npz).
+
+    Die Datei wird zuerst unter path + ".tmp" geschrieben und dann umbenannt,
+    damit ein Abbruch während des Schreibens keinen halben Checkpoint hinterlässt.
+    """
+    path = Path(path)
+    arrays = {}
+
+    # Agenten in Registrierungsreihenfolge (= Reihenfolge in agents_by_type)
+    agents = list(model.agents)
+    ordinal = {agent: i for i, agent in enumerate(agents)}
+    type_codes = {agent_type: code for code, agent_type in enumerate(AGENT_FIELDS)}
+
+    arrays["agent_type"] = np.array([type_codes[type(a)] for a in agents], dtype=np.uint8)
+    arrays["agent_id"] = np.array([a.unique_id for a in agents], dtype=np.int64)
+    for agent_type, fields in AGENT_FIELDS.items():
+        members = [a for a in agents if type(a) is agent_type]
+        for field in fields:
+            arrays[f"{TYPE_NAMES[agent_type]}.{field}"] = np.array(
+                [getattr(a, field) for a in members]
+            )
+
+    # Grid: Zellen der Reihe nach, innerhalb einer Zelle in Listenreihenfolge.
+    # In dieser Reihenfolge platziert, entstehen dieselben Zelllisten.
+    placement, pos_x, pos_y = [], [], []
+    for cell_content, (x, y) in model.grid.coord_iter():
+        for agent in cell_content:
+            placement.append(ordinal[agent])
+            pos_x.append(x)
+            pos_y.append(y)
+    arrays["placement"] = np.array(placement, dtype=np.int64)
+    arrays["placement_x"] = np.array(pos_x, dtype=np.int64)
+    arrays["placement_y"] = np.array(pos_y, dtype=np.int64)
+
+    if model.resources is not None:
+        arrays["resources.amount"] = model.resources.amount
+        arrays["resources.max_amount"] = model.resources.max_amount
+        arrays["resources.regen_rate"] = model.resources.regen_rate
+    lazy_meta = None
+    if isinstance(model.resources, LazyResourceField):
+        lazy_meta = {}
+        for name, value in model.resources.state().items():
+            if isinstance(value, np.ndarray):
+                arrays[f"resources.{name}"] = value
+            else:
+                lazy_meta[name] = value
+
+    # Zufallszahlen (Modell-Strom und ein Strom pro Ameisentyp)
+    random_meta = {}
+    for name in RANDOM_STREAMS:
+        version, mt_state, gauss_next = getattr(model, name).getstate()
+        arrays[f"{name}_state"] = np.array(mt_state, dtype=np.uint32)
+        random_meta[name] = {"version": version, "gauss_next": gauss_next}
+
+    # Gesammelte Modelldaten
+    collector = model.datacollector
+    if isinstance(collector, ColumnarDataCollector):
+        for name, column in collector.columns.items():
+            arrays[f"data.{name}"] = column[: collector.n_rows]
+        collector_meta = {"kind": "columnar", "capacity": collector.capacity, "n_rows": collector.n_rows}
+    else:
+        for name, values in collector.model_vars.items():
+            arrays[f"data.{name}"] = np.array(values)
+        collector_meta = {"kind": "mesa"}
+    if model.hill_datacollector is not None:
+        for name, values in model.hill_datacollector.columns.items():
+            arrays[f"hills.{name}"] = np.array(values)
+    profile_columns = None
+    if model.profiler is not None:
+        profile_columns = list(model.profiler.rows[0]) if model.profiler.rows else []
+        for name in profile_columns:
+            arrays[f"profile.{name}"] = np.array([row[name] for row in model.profiler.rows])
+
+    # Mesa vergibt unique_id über einen Zähler pro Modell; nächsten Wert merken
+    ids = _id_counters(model)
+    next_id = next(ids[model])
+    ids[model] = itertools.count(next_id)
+
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "kwargs": model.init_kwargs,
+        "state": {name: getattr(model, name) for name in MODEL_STATE},
+        "random": random_meta,
+        "rng_state": model.rng.bit_generator.state,
+        "next_id": next_id,
+        "collector": collector_meta,
+        "profile": profile_columns,
+        "lazy_regen": lazy_meta,
+        "steady": model.stop_check.steady.state() if model.stop_check and model.stop_check.steady else None,
+        "fields": {TYPE_NAMES[t]: fields for t, fields in AGENT_FIELDS.items()},
+    }
+    arrays["meta"] = np.array(json.dumps(meta))
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.savez_compressed(fh, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+# -------------------------------------------------------
+# Laden
+# -------------------------------------------------------
+
+def load_checkpoint(path, reseed: Optional[int] = None) -> AntInvasionModel:
+    """
+    Stellt ein AntInvasionModel aus einem Checkpoint wieder her.
+
+    reseed = None  -> bit-identische Fortsetzung
+    reseed = Zahl  -> gleicher Zustand, aber neue Zufallszahlen ab hier
+                      (z.B. für mehrere Äste aus demselben Burn-in)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(str(arrays["meta"]))
+    if meta["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint-Version {meta['version']} wird nicht unterstützt")
+
+    model = AntInvasionModel(**meta["kwargs"])
+    ids = _id_counters(model)
+
+    # Vom Konstruktor erzeugte Agenten wieder entfernen
+    for agent in list(model.agents):
+        if agent.pos is not None:
+            model.grid.remove_agent(agent)
+        agent.remove()
+
+    # Agenten in der gespeicherten Reihenfolge neu erzeugen
+    types = list(AGENT_FIELDS)
+    values = {
+        agent_type: {
+            field: arrays[f"{TYPE_NAMES[agent_type]}.{field}"].tolist()
+            for field in meta["fields"][TYPE_NAMES[agent_type]]
+        }
+        for agent_type in types
+    }
+    seen = {agent_type: 0 for agent_type in types}
+    agents = []
+    for code, unique_id in zip(arrays["agent_type"].tolist(), arrays["agent_id"].tolist()):
+        agent_type = types[code]
+        agent = AGENT_FACTORIES[agent_type](model)
+        i = seen[agent_type]
+        for field, column in values[agent_type].items():
+            setattr(agent, field, column[i])
+        seen[agent_type] = i + 1
+        agent.unique_id = unique_id
+        agents.append(agent)
+    ids[model] = itertools.count(meta["next_id"])
+
+    for i, x, y in zip(
+        arrays["placement"].tolist(),
+        arrays["placement_x"].tolist(),
+        arrays["placement_y"].tolist(),
+    ):
+        model.grid.place_agent(agents[i], (x, y))
+    model.hill_index.invalidate()
+
+    if model.resources is not None:
+        model.resources.amount[:] = arrays["resources.amount"]
+        model.resources.max_amount[:] = arrays["resources.max_amount"]
+        model.resources.regen_rate[:] = arrays["resources.regen_rate"]
+    if meta.get("lazy_regen") is not None:
+        state = dict(meta["lazy_regen"])
+        for name in ("last", "full_at", "over"):
+            state[name] = arrays[f"resources.{name}"]
+        model.resources.restore(state)
+
+    if model.hill_queue is not None:
+        model.hill_queue.reset(a for a in agents if isinstance(a, (NativeAntHill, InvasiveAntHill)))
+
+    # Globale Stocks und laufende Zähler (überschreibt die Werte aus dem Neuaufbau)
+    for name, value in meta["state"].items():
+        setattr(model, name, value)
+
+    if model.death_queue is not None:
+        # Todeszeitpunkte aus der geladenen Energie (nach dem Zurücksetzen von steps)
+        model.death_queue.reset((a for a in agents if isinstance(a, (NativeAnt, InvasiveAnt))), model.steps)
+
+    if meta["steady"] is not None:
+        model.stop_check.steady.restore(meta["steady"])
+
+    # Gesammelte Modelldaten
+    collector = model.datacollector
+    names = list(collector.model_reporters)
+    if meta["collector"]["kind"] == "columnar":
+        if not isinstance(collector, ColumnarDataCollector):
+            raise ValueError("Checkpoint erwartet einen ColumnarDataCollector (n_steps)")
+        n_rows = meta["collector"]["n_rows"]
+        collector.capacity = max(meta["collector"]["capacity"], 1)
+        collector.columns = {}
+        for name in names:
+            if n_rows:
+                column = arrays[f"data.{name}"]
+                collector.columns[name] = np.empty(collector.capacity, dtype=column.dtype)
+                collector.columns[name][:n_rows] = column
+        collector.n_rows = n_rows
+    else:
+        for name in names:
+            collector.model_vars[name] = arrays[f"data.{name}"].tolist()
+    if model.hill_datacollector is not None:
+        for name in model.hill_datacollector.columns:
+            model.hill_datacollector.columns[name] = arrays[f"hills.{name}"].tolist()
+    if model.profiler is not None and meta["profile"]:
+        columns = {name: arrays[f"profile.{name}"].tolist() for name in meta["profile"]}
+        model.profiler.rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    # Zufallszahlen
+    for name, info in meta["random"].items():
+        getattr(model, name).setstate(
+            (info["version"], tuple(arrays[f"{name}_state"].tolist()), info["gauss_next"])
+        )
+    model.rng.bit_generator.state = meta["rng_state"]
+    if reseed is not None:
+        model.random.seed(reseed)
+        model.random_native = make_stream(reseed, "NativeAnt")
+        model.random_invasive = make_stream(reseed, "InvasiveAnt")
+        model.rng = np.random.default_rng(reseed)
+
+    return model
@@ -0,0 +1,169 @@
+# ants_invasion_kernels.py
+# Kompilierte Kernels (Numba) für VectorizedAntInvasionModel: Bewegung,
+# Fressen und Einlagern als Schleife über die Ameisen statt als
+# Array-Ausdrücke mit (n, 8)-Zwischenarrays und np.subtract.at/np.add.at.
+#
+# Die Zufallszahlen zieht weiterhin das Modell (gleiche Aufrufe von model.rng
+# in gleicher Reihenfolge), die Kernels rechnen dieselben Formeln in derselben
+# Reihenfolge. Mit und ohne Numba entstehen darum bit-identische Läufe.
+#
+# Numba ist optional (pip install numba). Ohne Numba ist HAVE_NUMBA False und
+# das Modell rechnet mit den NumPy-Ausdrücken (kernels="auto").
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+KERNEL_MODES = ("auto", "numba", "numpy")
+
+
+def _jit(func):
+    # ohne Numba bleibt die Funktion reines Python (wird dann nicht benutzt)
+    if HAVE_NUMBA:
+        return numba.njit(cache=True, nogil=True)(func)
+    return func
+
+
+def use_kernels(kernels: str) -> bool:
+    """
+    kernels = "auto"  -> Numba, falls installiert, sonst NumPy
+              "numba" -> Numba (ImportError, falls nicht installiert)
+              "numpy" -> immer NumPy
+    """
+    if kernels not in KERNEL_MODES:
+        raise ValueError(f"Unbekannter Kernel-Modus: {kernels!r} ({' | '.join(KERNEL_MODES)})")
+    if kernels == "numba" and not HAVE_NUMBA:
+        raise ImportError("kernels='numba' braucht Numba (pip install numba)")
+    return HAVE_NUMBA and kernels != "numpy"
+
+
+# -------------------------------------------------------
+# Bewegung
+# -------------------------------------------------------
+
+@_jit
+def _distance(x, y, hx, hy, width, height, torus):
+    # Manhattan-Distanz wie axis_distance (auf dem Torus mit Umlauf)
+    dx = abs(x - hx)
+    dy = abs(y - hy)
+    if torus:
+        dx = min(dx, width - dx)
+        dy = min(dy, height - dy)
+    return dx + dy
+
+
+@_jit
+def move_ants(x, y, walk, explore, u, cell, nearest_x, nearest_y, next_x, next_y,
+              offsets_x, offsets_y, width, height, torus):
+    """
+    Bewegung wie VectorizedAntInvasionModel._move (nach der Umkehr-Entscheidung).
+
+    walk    = Random Walk / Exploration, sonst Schritt Richtung Hügel (next_x/next_y)
+    explore = Exploration: nur Nachbarzellen weiter weg vom Hügel (Manhattan)
+    u       = eine Zufallszahl pro Ameise mit walk True (in Reihenfolge)
+    cell    = Zellindex der Ameise in den Hügel-Tabellen (leer ohne Hügel)
+    torus   = Ränder verbunden (Nachbarn und Distanzen mit Umlauf)
+    """
+    j = 0
+    for i in range(len(x)):
+        xi = x[i]
+        yi = y[i]
+        if not walk[i]:
+            x[i] = next_x[cell[i]]
+            y[i] = next_y[cell[i]]
+            continue
+
+        hx = 0
+        hy = 0
+        d_now = 0
+        if explore[i]:
+            hx = nearest_x[cell[i]]
+            hy = nearest_y[cell[i]]
+            d_now = _distance(xi, yi, hx, hy, width, height, torus)
+
+        n_valid = 0
+        n_farther = 0
+        for k in range(len(offsets_x)):
+            nx = xi + offsets_x[k]
+            ny = yi + offsets_y[k]
+            if torus:
+                nx %= width
+                ny %= height
+            if 0 <= nx < width and 0 <= ny < height:
+                n_valid += 1
+                if explore[i] and _distance(nx, ny, hx, hy, width, height, torus) > d_now:
+                    n_farther += 1
+
+        # r-te zulässige Nachbarzelle (wie _choose)
+        farther = n_farther > 0
+        r = int(u[j] * (n_farther if farther else n_valid))
+        j += 1
+        for k in range(len(offsets_x)):
+            nx = xi + offsets_x[k]
+            ny = yi + offsets_y[k]
+            if torus:
+                nx %= width
+                ny %= height
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            if farther and not _distance(nx, ny, hx, hy, width, height, torus) > d_now:
+                continue
+            if r == 0:
+                x[i] = nx
+                y[i] = ny
+                break
+            r -= 1
+
+
+# -------------------------------------------------------
+# Fressen und Einlagern
+# -------------------------------------------------------
+
+@_jit
+def eat_sorted(cells, bites, amount):
+    """
+    Fressen wie VectorizedAntInvasionModel._eat: Ameisen nach Zelle sortiert
+    (innerhalb einer Zelle in Fressreihenfolge). Zieht das Gefressene von
+    amount ab und gibt die Menge pro Ameise zurück.
+    """
+    n = len(cells)
+    take = np.empty(n)
+    total_bites = 0.0
+    before_start = 0.0
+    available = 0.0
+    for i in range(n):
+        c = cells[i]
+        # gleiche Rundung wie cumsum(bites) - bites, relativ zum Zellanfang
+        total_bites += bites[i]
+        before = total_bites - bites[i]
+        if i == 0 or c != cells[i - 1]:
+            before_start = before
+            available = amount[c]
+        t = min(max(available - (before - before_start), 0.0), bites[i])
+        take[i] = t
+        amount[c] -= t
+    return take
+
+
+@_jit
+def deposit_ants(cell, energy, mode, hill_of_cell, min_energy, stored, search_mode):
+    """
+    Einlagern wie VectorizedAntInvasionModel._deposit: Energie über min_energy
+    geht an den Hügel der Zelle (stored[Hügelindex]), die Ameise sucht wieder.
+    """
+    for i in range(len(cell)):
+        h = hill_of_cell[cell[i]]
+        if h < 0:
+            continue
+        available = max(0.0, energy[i] - min_energy)
+        if available > 0.0:
+            stored[h] += available
+            energy[i] -= available
+            mode[i] = search_mode
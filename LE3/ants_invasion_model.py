@@ -1,10 +1,17 @@
 from __future__ import annotations
 from typing import Optional
 
+import csv
+import heapq
+import itertools
+import math
 import random
+import time
+
+import numpy as np
 
 from mesa import Agent, Model
-from mesa.space import MultiGrid
+from mesa.space import MultiGrid, PropertyLayer
 from mesa.datacollection import DataCollector
 
 
@@ -12,6 +19,10 @@ from mesa.datacollection import DataCollector
 # Agenten
 # ==========================================================
 
+# Modus der Ameisen (als kleine Zahl statt String, auch in AntArrays.mode)
+SEARCH = 0
+RETURN = 1
+
 class ResourcePatch(Agent):
     """
     Ressourcen-Patch (Futter) für beide Ameisentypen.
@@ -21,6 +32,8 @@ class ResourcePatch(Agent):
     regen_rate = Regeneration pro Schritt (absolute Menge)
     """
 
+    __slots__ = ("amount", "max_amount", "regen_rate")
+
     def __init__(self, model: Model, amount: float, max_amount: float, regen_rate: float):
         super().__init__(model)
         self.amount = float(amount)
@@ -30,7 +43,9 @@ class ResourcePatch(Agent):
     def step(self):
         if self.regen_rate <= 0.0:
             return
-        self.amount = min(self.max_amount, self.amount + self.regen_rate)
+        new_amount = min(self.max_amount, self.amount + self.regen_rate)
+        self.model.resource_total += new_amount - self.amount
+        self.amount = new_amount
 
 
 class NativeAntHill(Agent):
@@ -50,7 +65,9 @@ class NativeAntHill(Agent):
     ):
         super().__init__(model)
         self.stored_food_native = float(stored_food_native)
+        self.model.total_stored_native += self.stored_food_native
         self.max_new_ants_per_step = int(max_new_ants_per_step)
+        self.spawned = 0  # insgesamt erzeugte Ameisen
 
     def receive_food(self, amount: float) -> float:
         """
@@ -61,8 +78,15 @@ class NativeAntHill(Agent):
             return 0.0
 
         self.stored_food_native += amount
+        self.model.total_stored_native += amount
+        self.schedule()
         return amount
 
+    def schedule(self):
+        # hill_events=True: mit Nahrung für eine neue Ameise in die HillQueue
+        if self.model.hill_queue is not None and self.stored_food_native >= 1.0:
+            self.model.hill_queue.wake(self)
+
     def step(self):
         """
         Königin-Logik: Wenn genug Nahrung gespeichert ist, erzeugt der Hügel neue Ameisen.
@@ -90,6 +114,11 @@ class NativeAntHill(Agent):
             self.model.grid.place_agent(ant, self.pos)
 
             self.stored_food_native -= 1.0  # einfache "Kosten" pro neuer Ameise
+            self.model.total_stored_native -= 1.0
+            self.spawned += 1
+
+        # Nahrung übrig -> im nächsten Step wieder dran
+        self.schedule()
 
 
 class NativeAnt(Agent):
@@ -101,6 +130,17 @@ class NativeAnt(Agent):
     - kann von invasiven Ameisen getötet/unterdrückt werden
     """
 
+    # Zustand pro Ameise; alles andere ist für alle Ameisen gleich (Klassenattribute)
+    __slots__ = ("energy", "metabolism", "bite_size", "mode", "due")
+
+    # Energiepuffer, damit die Ameise sich nicht komplett "leer" macht
+    min_energy = 6
+    max_energy = 208
+    # bleiben als Felder vorhanden, werden aber nicht benutzt
+    return_threshold = 6.0
+    min_food_to_move = 1.0
+    max_foraging_dist = 15
+
     def __init__(
         self,
         model: Model,
@@ -112,36 +152,32 @@ class NativeAnt(Agent):
         self.energy = float(energy)
         self.metabolism = float(metabolism)
         self.bite_size = float(bite_size)
-        # bleiben als Felder vorhanden, werden aber nicht benutzt (Arbeiterinnen reproduzieren nicht)
-        
-        # Energiepuffer, damit die Ameise sich nicht komplett "leer" macht
-        self.min_energy = 6
-        self.return_threshold = 6.0
-        self.min_food_to_move = 1.0
-        self.mode = "search"  # "search" | "return"
-        self.max_energy = 208
-        self.max_foraging_dist = 15
+        self.mode = SEARCH  # SEARCH | RETURN
+        self.due: Optional[int] = None  # frühester Hungertod (death_events=True, StarvationQueue)
+        if model.death_queue is not None:
+            model.death_queue.schedule(self, model.steps, self.energy)
+
+    @property
+    def random(self):
+        # eigener Zufallsstrom der einheimischen Ameisen (siehe AntInvasionModel)
+        return self.model.random_native
 
     # ---------- Verhalten ----------
 
     def move(self):
-        neighbors = self.model.grid.get_neighborhood(
-            self.pos, moore=True, include_center=False
-        )
-
         # --------------------------------------------------
         # 1) Suchmodus: probabilistische Umkehr bei Energiemangel
         # --------------------------------------------------
-        if self.mode == "search":
+        if self.mode == SEARCH:
             energy_frac = self.energy / self.max_energy  # 0..1
 
             if energy_frac > 0.5:
                 # steigt von 0 bis 0.5 zwischen 50% und 100% Energie
                 p_return = (energy_frac - 0.5) / 0.5 * 0.5
                 if self.random.random() < p_return:
-                    self.mode = "return"
+                    self.mode = RETURN
         
-        if self.mode == "search":
+        if self.mode == SEARCH:
             # je leerer, desto höher die Rückkehrwahrscheinlichkeit
             energy_frac = self.energy / self.max_energy  
 
@@ -149,37 +185,24 @@ class NativeAnt(Agent):
             if energy_frac > 0.5:
                 p_return = min(0.5, (0.5 - energy_frac))
                 if self.random.random() < p_return:
-                    self.mode = "return"
+                    self.mode = RETURN
 
         # --------------------------------------------------
         # 2) Rückkehrmodus: zielgerichtet zum Nest
         # --------------------------------------------------
-        if self.mode == "return":
-            target = self.nearest_hill_pos()
-            if target is not None:
-
-                def dist2(a, b):
-                    dx = a[0] - b[0]
-                    dy = a[1] - b[1]
-                    return dx * dx + dy * dy
-
-                best = min(neighbors, key=lambda n: dist2(n, target))
+        if self.mode == RETURN:
+            # Nachbarzelle mit kleinstem Abstand zum nächsten Hügel (vorberechnet)
+            best = self.model.hill_index.next_step(NativeAntHill, self.pos)
+            if best is not None:
                 self.model.grid.move_agent(self, best)
                 return
 
         # --------------------------------------------------
         # 3) Suchmodus: lokale Exploration
         # --------------------------------------------------
-        hill = self.nearest_hill_pos()
-        if hill is not None and self.random.random() < 0.4:
-            hx, hy = hill
-
-            farther = [
-                n for n in neighbors
-                if abs(n[0] - hx) + abs(n[1] - hy) >
-                abs(self.pos[0] - hx) + abs(self.pos[1] - hy)
-            ]
-
+        # Nachbarzellen weiter weg vom nächsten Hügel (vorberechnet, None ohne Hügel)
+        farther = self.model.hill_index.farther(NativeAntHill, self.pos)
+        if farther is not None and self.random.random() < 0.4:
             if farther:
                 self.model.grid.move_agent(self, self.random.choice(farther))
                 return
@@ -187,22 +210,19 @@ class NativeAnt(Agent):
         # --------------------------------------------------
         # 4) Fallback: reiner Random Walk
         # --------------------------------------------------
+        neighbors = self.model.neighbor_table.neighbors(self.pos)
         self.model.grid.move_agent(self, self.random.choice(neighbors))
 
 
 
     def eat(self):
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        patches = [a for a in cellmates if isinstance(a, ResourcePatch)]
-        if not patches:
-            return
-        patch = patches[0]
-        take = min(self.bite_size, patch.amount)
+        if self.model.profiler is not None:
+            self.model.profiler.counts["lookups_eat"] += 1
+        take = self.model.consume_resource(self.pos, self.bite_size)
         if take > 0:
-            patch.amount -= take
             self.energy += take
         if self.energy >= self.max_energy:
-            self.mode = "return"
+            self.mode = RETURN
 
 
     def deposit_food(self):
@@ -210,13 +230,12 @@ class NativeAnt(Agent):
         Wenn die Ameise sich auf einem Feld mit einem NativeAntHill befindet,
         lagert sie einen Teil ihrer Energie als Nahrung in den Hügel ein.
         """
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        hills = [a for a in cellmates if isinstance(a, NativeAntHill)]
-        if not hills:
+        if self.model.profiler is not None:
+            self.model.profiler.counts["lookups_deposit"] += 1
+        hill = self.model.cell_index.first(NativeAntHill, self.pos)
+        if hill is None:
             return
 
-        hill = hills[0]
-
         # Nur Energie oberhalb eines Mindestpuffers kann eingelagert werden
         available = max(0.0, self.energy - self.min_energy)
         if available <= 0.0:
@@ -224,7 +243,10 @@ class NativeAnt(Agent):
         accepted = hill.receive_food(available)
         if accepted > 0:
             self.energy -= accepted
-            self.mode = "search"
+            self.mode = SEARCH
+            if self.model.death_queue is not None:
+                # weniger Energie -> Hungertod früher als angemeldet
+                self.model.death_queue.schedule(self, self.model.steps, self.energy)
 
 
     def die(self):
@@ -242,34 +264,20 @@ class NativeAnt(Agent):
         self.eat()
         # keine Selbst-Reproduktion mehr
         self.deposit_food()
+
+    def live(self):
+        """step() ohne Prüfung auf Verhungern (death_events=True, siehe StarvationQueue)."""
+        self.energy -= self.metabolism
+        self.move()
+        self.eat()
+        self.deposit_food()
     
     def nearest_hill_pos(self):
         """
         Finde die Position des nächstgelegenen NativeAntHill (falls vorhanden).
         Berücksichtigt torus-Grid.
         """
-        from ants_invasion_model import NativeAntHill  # falls oben nicht importiert
-
-        hills = self.model.agents_by_type.get(NativeAntHill, [])
-        if not hills:
-            return None
-
-        x, y = self.pos
-        width, height = self.model.width, self.model.height
-
-        best_pos = None
-        best_d2 = None
-
-        for hill in hills:
-            hx, hy = hill.pos
-            dx = min(abs(hx - x), width - abs(hx - x))
-            dy = min(abs(hy - y), height - abs(hy - y))
-            d2 = dx * dx + dy * dy
-            if best_d2 is None or d2 < best_d2:
-                best_d2 = d2
-                best_pos = (hx, hy)
-
-        return best_pos
+        return self.model.hill_index.nearest(NativeAntHill, self.pos)
 
 class InvasiveAntHill(Agent):
     """
@@ -288,7 +296,9 @@ class InvasiveAntHill(Agent):
     ):
         super().__init__(model)
         self.stored_food_invasive = float(stored_food_invasive)
+        self.model.total_stored_invasive += self.stored_food_invasive
         self.max_new_ants_per_step = int(max_new_ants_per_step)
+        self.spawned = 0  # insgesamt erzeugte Ameisen
 
     def receive_food(self, amount: float) -> float:
         """
@@ -299,8 +309,15 @@ class InvasiveAntHill(Agent):
             return 0.0
 
         self.stored_food_invasive += amount
+        self.model.total_stored_invasive += amount
+        self.schedule()
         return amount
 
+    def schedule(self):
+        # hill_events=True: mit Nahrung für eine neue Ameise in die HillQueue
+        if self.model.hill_queue is not None and self.stored_food_invasive >= 1.0:
+            self.model.hill_queue.wake(self)
+
     def step(self):
         """
         Königin-Logik: Wenn genug Nahrung gespeichert ist, erzeugt der Hügel neue Ameisen.
@@ -325,6 +342,11 @@ class InvasiveAntHill(Agent):
             self.model.grid.place_agent(ant, self.pos)
 
             self.stored_food_invasive -= 1.0  # einfache "Kosten" pro neuer Ameise
+            self.model.total_stored_invasive -= 1.0
+            self.spawned += 1
+
+        # Nahrung übrig -> im nächsten Step wieder dran
+        self.schedule()
 
 class InvasiveAnt(Agent):
     """
@@ -335,6 +357,14 @@ class InvasiveAnt(Agent):
     - tötet einheimische Ameisen mit Wahrscheinlichkeit attack_prob
     """
 
+    # Zustand pro Ameise; alles andere ist für alle Ameisen gleich (Klassenattribute)
+    __slots__ = ("energy", "metabolism", "bite_size", "attack_prob", "mode", "due")
+
+    min_energy = 1.0
+    max_energy = 14.0   # invasiv = etwas höhere Kapazität
+    return_threshold = 6.0
+    min_food_to_move = 1.0
+
     def __init__(
         self,
         model: Model,
@@ -348,60 +378,46 @@ class InvasiveAnt(Agent):
         self.metabolism = float(metabolism)
         self.bite_size = float(bite_size)
         self.attack_prob = float(attack_prob)
-        self.min_energy = 1.0
-        self.return_threshold = 6.0
-        self.min_food_to_move = 1.0
-        self.mode = "search"
-        self.max_energy = 14.0   # invasiv = etwas höhere Kapazität
+        self.mode = SEARCH
+        self.due: Optional[int] = None  # frühester Hungertod (death_events=True, StarvationQueue)
+        if model.death_queue is not None:
+            model.death_queue.schedule(self, model.steps, self.energy)
 
+    @property
+    def random(self):
+        # eigener Zufallsstrom der invasiven Ameisen (siehe AntInvasionModel)
+        return self.model.random_invasive
 
     def move(self):
-        neighbors = self.model.grid.get_neighborhood(
-            self.pos, moore=True, include_center=False
-        )
-
         # --------------------------------------------------
         # 1) Suchmodus: energie-abhängige Rückkehr (später als bei NativeAnt)
         # --------------------------------------------------
-        if self.mode == "search":
+        if self.mode == SEARCH:
             energy_frac = self.energy / self.max_energy  # 0..1
 
             if energy_frac > 0.4:
                 # steigt von 0 bis 0.3 zwischen 40% und 100% Energie
                 p_return = (energy_frac - 0.4) / 0.6 * 0.3
                 if self.random.random() < p_return:
-                    self.mode = "return"
+                    self.mode = RETURN
 
 
         # --------------------------------------------------
         # 2) Rückkehrmodus: zielgerichtet zum invasiven Nest
         # --------------------------------------------------
-        if self.mode == "return":
-            target = self.nearest_hill_pos()
-            if target is not None:
-
-                def dist2(a, b):
-                    dx = a[0] - b[0]
-                    dy = a[1] - b[1]
-                    return dx * dx + dy * dy
-
-                best = min(neighbors, key=lambda n: dist2(n, target))
+        if self.mode == RETURN:
+            # Nachbarzelle mit kleinstem Abstand zum nächsten Hügel (vorberechnet)
+            best = self.model.hill_index.next_step(InvasiveAntHill, self.pos)
+            if best is not None:
                 self.model.grid.move_agent(self, best)
                 return
 
         # --------------------------------------------------
         # 3) Suchmodus: aggressivere Exploration
         # --------------------------------------------------
-        hill = self.nearest_hill_pos()
-        if hill is not None and self.random.random() < 0.6:
-            hx, hy = hill
-
-            farther = [
-                n for n in neighbors
-                if abs(n[0] - hx) + abs(n[1] - hy) >
-                abs(self.pos[0] - hx) + abs(self.pos[1] - hy)
-            ]
-
+        # Nachbarzellen weiter weg vom nächsten Hügel (vorberechnet, None ohne Hügel)
+        farther = self.model.hill_index.farther(InvasiveAntHill, self.pos)
+        if farther is not None and self.random.random() < 0.6:
             if farther:
                 self.model.grid.move_agent(self, self.random.choice(farther))
                 return
@@ -409,26 +425,27 @@ class InvasiveAnt(Agent):
         # --------------------------------------------------
         # 4) Fallback: Random Walk
         # --------------------------------------------------
+        neighbors = self.model.neighbor_table.neighbors(self.pos)
         self.model.grid.move_agent(self, self.random.choice(neighbors))
 
         
     def eat(self):
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        patches = [a for a in cellmates if isinstance(a, ResourcePatch)]
-        if not patches:
-            return
-        patch = patches[0]
-        take = min(self.bite_size, patch.amount)
+        if self.model.profiler is not None:
+            self.model.profiler.counts["lookups_eat"] += 1
+        take = self.model.consume_resource(self.pos, self.bite_size)
         if take > 0:
-            patch.amount -= take
             self.energy += take * 1.1
 
     def attack_natives(self):
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        natives = [a for a in cellmates if isinstance(a, NativeAnt)]
+        profiler = self.model.profiler
+        if profiler is not None:
+            profiler.counts["lookups_attack"] += 1
+        natives = self.model.cell_index.agents(NativeAnt, self.pos)
         for ant in natives:
             if self.random.random() < self.attack_prob:
                 ant.die()
+                if profiler is not None:
+                    profiler.counts["kills"] += 1
                 
     def die(self):
         self.model.grid.remove_agent(self)
@@ -439,13 +456,12 @@ class InvasiveAnt(Agent):
         Wenn die Ameise sich auf einem Feld mit einem InvaasiveAntHill befindet,
         lagert sie einen Teil ihrer Energie als Nahrung in den Hügel ein.
         """
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        hills = [a for a in cellmates if isinstance(a, InvasiveAntHill)]
-        if not hills:
+        if self.model.profiler is not None:
+            self.model.profiler.counts["lookups_deposit"] += 1
+        hill = self.model.cell_index.first(InvasiveAntHill, self.pos)
+        if hill is None:
             return
 
-        hill = hills[0]
-
         # Nur Energie oberhalb eines Mindestpuffers kann eingelagert werden
         available = max(0.0, self.energy - self.min_energy)
         if available <= 0.0:
@@ -453,7 +469,10 @@ class InvasiveAnt(Agent):
         accepted = hill.receive_food(available)
         if accepted > 0:
             self.energy -= accepted
-            self.mode = "search"
+            self.mode = SEARCH
+            if self.model.death_queue is not None:
+                # weniger Energie -> Hungertod früher als angemeldet
+                self.model.death_queue.schedule(self, self.model.steps, self.energy)
         
         
     def step(self):
@@ -467,86 +486,1065 @@ class InvasiveAnt(Agent):
         # keine Selbst-Reproduktion mehr
         self.deposit_food()
         self.attack_natives()
+
+    def live(self):
+        """step() ohne Prüfung auf Verhungern (death_events=True, siehe StarvationQueue)."""
+        self.energy -= self.metabolism
+        self.move()
+        self.eat()
+        self.deposit_food()
+        self.attack_natives()
         
     
 
     def nearest_hill_pos(self):
         """
-        Finde die Position des nächstgelegenen NativeAntHill (falls vorhanden).
+        Finde die Position des nächstgelegenen InvasiveAntHill (falls vorhanden).
         Berücksichtigt torus-Grid.
         """
-        from ants_invasion_model import InvasiveAntHill  # falls oben nicht importiert
+        return self.model.hill_index.nearest(InvasiveAntHill, self.pos)
+
+
+# ==========================================================
+# Ressourcen-Feld (NumPy statt ResourcePatch-Agenten)
+# ==========================================================
+
+class ResourceField:
+    """
+    Ressourcen für das ganze Grid als NumPy-Arrays (width x height).
+
+    amount     = aktuelle Nahrungsmenge pro Zelle
+    max_amount = maximale Kapazität pro Zelle
+    regen_rate = Regeneration pro Schritt (absolute Menge) pro Zelle
+
+    Ersetzt die ResourcePatch-Agenten: statt einem Agenten pro Zelle wird das
+    ganze Feld mit einem einzigen np.minimum regeneriert. `amount` ist
+    gleichzeitig die Datenmatrix des PropertyLayers "resources", damit die
+    Solara-Visualisierung das Feld direkt zeichnen kann.
+    """
+
+    def __init__(self, width: int, height: int, amount, max_amount, regen_rate):
+        self.layer = PropertyLayer("resources", width, height, 0.0, dtype=float)
+        self.layer.data[:] = amount
+        self.amount = self.layer.data
+        self.max_amount = np.broadcast_to(np.asarray(max_amount, dtype=float), (width, height)).copy()
+        # Regeneration <= 0 bedeutet "keine Regeneration" (wie ResourcePatch.step)
+        regen = np.broadcast_to(np.asarray(regen_rate, dtype=float), (width, height))
+        self.regen_rate = np.where(regen > 0.0, regen, 0.0)
+
+    def take(self, pos, bite: float) -> float:
+        """Entnimmt bis zu `bite` Nahrung an pos, gibt die entnommene Menge zurück."""
+        available = float(self.amount[pos])
+        take = min(bite, available)
+        if take > 0:
+            self.amount[pos] = available - take
+            return take
+        return 0.0
+
+    def regenerate(self) -> float:
+        """Regeneriert alle Zellen, gibt die gesamte Zunahme zurück."""
+        new_amount = np.minimum(self.max_amount, self.amount + self.regen_rate)
+        gained = float((new_amount - self.amount).sum())
+        self.amount[:] = new_amount
+        return gained
+
+    def total(self) -> float:
+        return float(self.amount.sum())
 
-        hills = self.model.agents_by_type.get(InvasiveAntHill, [])
-        if not hills:
+    # Bei sofortiger Regeneration ist amount immer aktuell (siehe LazyResourceField)
+
+    def current(self) -> np.ndarray:
+        """Aktuelle Werte aller Zellen (ohne den Zustand zu ändern)."""
+        return self.amount
+
+    def sync(self, cells=None):
+        """Zellen (flache Indizes, None = alle) auf den aktuellen Stand bringen."""
+
+    def touched(self, cells):
+        """Nach einer Entnahme an cells (flache Indizes) aufrufen."""
+
+
+# obere Schranke für den relativen Rundungsfehler einer Addition (2 * eps)
+_ROUNDING = 2 * np.finfo(float).eps
+
+
+class LazyResourceField(ResourceField):
+    """
+    ResourceField mit verzögerter Regeneration (lazy_regen=True).
+
+    regenerate() geht nicht mehr über alle Zellen, sondern zählt nur
+    now += 1 (Anzahl Regenerationen bisher) und führt die Summe nach:
+    Zunahme = Summe von regen_rate über alle wachsenden Zellen (growing_regen),
+    korrigiert um die Zellen, die in diesem Step voll werden (full_at).
+
+    Jede Zelle merkt sich, bei welchem Stand sie zuletzt aktualisiert wurde
+    (last). Nachgerechnet wird erst, wenn eine Ameise dort frisst (take, bzw.
+    sync/touched in der vektorisierten Engine) oder das ganze Feld gebraucht
+    wird (sync(), total()):
+
+        amount = min(max_amount, amount + regen_rate * (now - last))
+
+    Geschlossen gerechnet wird nur, wenn das exakt dasselbe ergibt wie die
+    schrittweise Regeneration (ganzzahlige Mengen, z.B. Milligramm, oder
+    Zellen, die trotz Rundungsfehlern sicher voll sind). Sonst wird Step für
+    Step addiert, bis die Zelle voll ist; so bleiben die
+    Mengen bit-identisch mit ResourceField und damit auch die Läufe. Nur die
+    Summe (TotalResources) kann sich in den letzten Stellen unterscheiden.
+
+    amount/layer zeigen den Stand der letzten Aktualisierung, für eine
+    Darstellung des ganzen Felds zuerst sync() aufrufen.
+    """
+
+    def __init__(self, width: int, height: int, amount, max_amount, regen_rate):
+        super().__init__(width, height, amount, max_amount, regen_rate)
+        self.height = height
+        self.now = 0
+        self.last = np.zeros((width, height), dtype=np.int64)
+        self.full_at = np.full((width, height), -1, dtype=np.int64)
+        self.growing_regen = 0.0
+        self._due = {}  # Step -> Zellen (flache Indizes), die dann voll werden
+        self.touched(np.arange(width * height))
+        # Zellen über max_amount kappt die erste Regeneration (wie np.minimum)
+        self._over = np.flatnonzero(self.amount > self.max_amount)
+
+    def _flat(self, name: str) -> np.ndarray:
+        return getattr(self, name).reshape(-1)
+
+    # ----- Nachrechnen --------------------------------------------
+
+    @staticmethod
+    def _grow(a, m, r, k):
+        """Wert nach k Regenerationen (Arrays), wie k-mal np.minimum(m, a + r)."""
+        out = a.copy()
+        # ganze Zahlen (bzw. r = 0): geschlossen gerechnet exakt
+        grown = a + r * k
+        exact = (r == 0.0) | ((a == np.floor(a)) & (r == np.floor(r)) & (grown < 2.0**53))
+        # sicher voll: auch mit den Rundungsfehlern von k Additionen über max_amount
+        exact |= grown - _ROUNDING * (k + 2) * grown >= m
+        closed = exact & (k > 0)
+        out[closed] = np.minimum(m[closed], a[closed] + r[closed] * k[closed])
+
+        idx = np.flatnonzero(~exact & (k > 0))
+        v, m, r, k = a[idx], m[idx], r[idx], k[idx]
+        while len(idx):
+            v = np.minimum(m, v + r)
+            k = k - 1
+            done = (k == 0) | (v >= m)
+            out[idx[done]] = v[done]
+            idx, v, m, r, k = idx[~done], v[~done], m[~done], r[~done], k[~done]
+        return out
+
+    @staticmethod
+    def _grow_one(a: float, m: float, r: float, k: int) -> float:
+        """Wie _grow für eine einzelne Zelle."""
+        if k <= 0:
+            return a
+        grown = a + r * k
+        if r == 0.0 or (a.is_integer() and r.is_integer() and grown < 2.0**53):
+            return min(m, grown)
+        if grown - _ROUNDING * (k + 2) * grown >= m:
+            return m
+        while k > 0:
+            a = min(m, a + r)
+            k -= 1
+            if a >= m:
+                break
+        return a
+
+    @staticmethod
+    def _steps_to_full(a, m, r):
+        # erster Step k >= 1 mit a + r * k >= m (Arrays, nur wachsende Zellen)
+        k = np.maximum(np.ceil((m - a) / r), 1.0)
+        k = np.where(a + r * k < m, k + 1, k)
+        return np.where((k > 1) & (a + r * (k - 1) >= m), k - 1, k).astype(np.int64)
+
+    @staticmethod
+    def _steps_to_full_one(a: float, m: float, r: float) -> int:
+        # wie _steps_to_full für eine einzelne Zelle
+        k = max(math.ceil((m - a) / r), 1)
+        if a + r * k < m:
+            k += 1
+        elif k > 1 and a + r * (k - 1) >= m:
+            k -= 1
+        return k
+
+    def current(self) -> np.ndarray:
+        """Aktuelle Werte aller Zellen (ohne den Zustand zu ändern)."""
+        k = (self.now - self.last).reshape(-1)
+        grown = self._grow(self._flat("amount"), self._flat("max_amount"), self._flat("regen_rate"), k)
+        return grown.reshape(self.amount.shape)
+
+    def sync(self, cells=None):
+        if cells is None:
+            self.amount[:] = self.current()
+            self.last[:] = self.now
+            self.touched(np.arange(self.amount.size))
+            return
+        cells = np.unique(cells)
+        amount, last = self._flat("amount"), self._flat("last")
+        k = self.now - last[cells]
+        amount[cells] = self._grow(amount[cells], self._flat("max_amount")[cells],
+                                   self._flat("regen_rate")[cells], k)
+        last[cells] = self.now
+
+    def touched(self, cells):
+        # neu festlegen, ob und wann die Zellen voll werden (amount ist aktuell)
+        cells = np.unique(cells)
+        a = self._flat("amount")[cells]
+        m = self._flat("max_amount")[cells]
+        r = self._flat("regen_rate")[cells]
+        full_at = self._flat("full_at")
+        was = full_at[cells] > self.now
+        grow = (a < m) & (r > 0.0)
+        self.growing_regen += float(r[grow & ~was].sum()) - float(r[was & ~grow].sum())
+
+        full_at[cells[~grow]] = -1
+        cells = cells[grow]
+        due = self.now + self._steps_to_full(a[grow], m[grow], r[grow])
+        full_at[cells] = due
+        if len(cells):
+            order = np.argsort(due, kind="stable")
+            due, cells = due[order], cells[order]
+            steps, starts = np.unique(due, return_index=True)
+            for step, group in zip(steps.tolist(), np.split(cells, starts[1:])):
+                self._due.setdefault(step, []).extend(group.tolist())
+
+    def take(self, pos, bite: float) -> float:
+        # eine Zelle: wie sync + ResourceField.take + touched, ohne NumPy-Overhead
+        x, y = pos
+        cell = x * self.height + y
+        m = float(self.max_amount[x, y])
+        r = float(self.regen_rate[x, y])
+        available = self._grow_one(float(self.amount[x, y]), m, r, self.now - int(self.last[x, y]))
+        self.last[x, y] = self.now
+        take = min(bite, available)
+        if take > 0:
+            available -= take
+        else:
+            take = 0.0
+        self.amount[x, y] = available
+
+        was = int(self.full_at[x, y]) > self.now
+        grow = available < m and r > 0.0
+        if grow != was:
+            self.growing_regen += r if grow else -r
+        if grow:
+            due = self.now + self._steps_to_full_one(available, m, r)
+            self.full_at[x, y] = due
+            self._due.setdefault(due, []).append(cell)
+        else:
+            self.full_at[x, y] = -1
+        return take
+
+    def regenerate(self) -> float:
+        self.now += 1
+        gained = self.growing_regen
+        if self.now == 1 and len(self._over):
+            over = self._over[self._flat("amount")[self._over] > self._flat("max_amount")[self._over]]
+            gained += float((self._flat("max_amount")[over] - self._flat("amount")[over]).sum())
+
+        due = self._due.pop(self.now, None)
+        if due is not None:
+            cells = np.unique(np.array(due, dtype=np.int64))
+            full_at = self._flat("full_at")
+            cells = cells[full_at[cells] == self.now]  # veraltete Einträge überspringen
+            if len(cells):
+                r = self._flat("regen_rate")[cells]
+                before = self._flat("amount")[cells] + r * (self.now - 1 - self._flat("last")[cells])
+                # im letzten Step nur bis max_amount gewachsen
+                gained -= float((r - (self._flat("max_amount")[cells] - before)).sum())
+                self.growing_regen -= float(r.sum())
+                full_at[cells] = -1
+        return gained
+
+    def total(self) -> float:
+        return float(self.current().sum())
+
+    def state(self) -> dict:
+        """Zustand der verzögerten Regeneration (für ants_invasion_checkpoint)."""
+        return {
+            "now": self.now,
+            "growing_regen": self.growing_regen,
+            "last": self.last,
+            "full_at": self.full_at,
+            "over": self._over,
+        }
+
+    def restore(self, state: dict):
+        """Gegenstück zu state(); amount muss bereits gesetzt sein."""
+        self.now = int(state["now"])
+        self.growing_regen = float(state["growing_regen"])
+        self.last[:] = state["last"]
+        self.full_at[:] = state["full_at"]
+        self._over = np.asarray(state["over"], dtype=np.int64)
+        self._due = {}
+        cells = np.flatnonzero(self._flat("full_at") > self.now)
+        for cell, step in zip(cells.tolist(), self._flat("full_at")[cells].tolist()):
+            self._due.setdefault(step, []).append(cell)
+
+
+# ==========================================================
+# Hügel-Platzierung
+# ==========================================================
+
+HILL_PLACEMENTS = ("center", "random", "grid")
+
+
+def hill_positions(placement: str, n: int, width: int, height: int, rng) -> list[tuple[int, int]]:
+    """
+    Positionen für n Hügel einer Art.
+
+    placement = "center" -> alle in der Gridmitte (width // 2, height // 2)
+                "random" -> jeder Hügel auf einer zufälligen Zelle (rng = model.random)
+                "grid"   -> gleichmässig auf einem Raster über das ganze Grid verteilt
+                sonst    -> Pfad zu einer CSV-Datei mit Spalten x,y; eine Zeile
+                            pro Hügel (n wird dann ignoriert)
+    """
+    if placement == "center":
+        positions = [(width // 2, height // 2)] * n
+    elif placement == "random":
+        positions = [(rng.randrange(width), rng.randrange(height)) for _ in range(n)]
+    elif placement == "grid":
+        cols = math.ceil(math.sqrt(n)) if n > 0 else 0
+        rows = math.ceil(n / cols) if n > 0 else 0
+        positions = [
+            (int((i % cols + 0.5) * width / cols), int((i // cols + 0.5) * height / rows))
+            for i in range(n)
+        ]
+    else:
+        with open(placement, newline="") as fh:
+            positions = [(int(row["x"]), int(row["y"])) for row in csv.DictReader(fh)]
+
+    for x, y in positions:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"Hügel-Position ({x}, {y}) liegt ausserhalb des Grids {width}x{height}")
+    return positions
+
+
+# ==========================================================
+# Nachbarschaft und Hügel-Index (vorberechnet pro Zelle)
+# ==========================================================
+
+# Moore-Nachbarschaft in derselben Reihenfolge wie MultiGrid.get_neighborhood
+MOORE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+
+
+def axis_distance(a, b, size: int, torus: bool):
+    """Abstand entlang einer Achse (auf dem Torus der kürzere Weg)."""
+    d = np.abs(np.asarray(a) - np.asarray(b))
+    return np.minimum(d, size - d) if torus else d
+
+
+class NeighborTable:
+    """
+    Moore-Nachbarschaft (ohne Zentrum) jeder Zelle, einmal beim Aufbau des
+    Modells berechnet (Grid-Grösse und Torus ändern sich nicht).
+
+    cells = int-Array (width * height, 8): flacher Index x * height + y der
+            Nachbarzellen in der Reihenfolge von MultiGrid.get_neighborhood,
+            -1 = keine Nachbarzelle (Rand ohne Torus)
+
+    neighbors(pos) liefert dieselben Positionen wie
+    grid.get_neighborhood(pos, moore=True, include_center=False). Die Tupel
+    pro Zelle entstehen beim ersten Zugriff aus cells.
+    """
+
+    def __init__(self, width: int, height: int, torus: bool):
+        self.width = width
+        self.height = height
+        self.torus = torus
+
+        xs, ys = np.divmod(np.arange(width * height), height)
+        cells = np.full((width * height, len(MOORE_OFFSETS)), -1, dtype=np.int64)
+        for k, (dx, dy) in enumerate(MOORE_OFFSETS):
+            nx = xs + dx
+            ny = ys + dy
+            if torus:
+                nx %= width
+                ny %= height
+            valid = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            cells[valid, k] = nx[valid] * height + ny[valid]
+
+        # Torus schmaler als 3 Zellen: Nachbarn fallen zusammen oder aufs
+        # Zentrum; wie get_neighborhood jede Zelle nur einmal, ohne Zentrum
+        if torus and (width < 3 or height < 3):
+            for cell, row in enumerate(cells):
+                seen = {cell}
+                for k, n in enumerate(row.tolist()):
+                    if n in seen:
+                        row[k] = -1
+                    seen.add(n)
+
+        self.cells = cells
+        self._neighbors = [None] * (width * height)
+
+    def neighbors(self, pos) -> tuple:
+        cell = pos[0] * self.height + pos[1]
+        result = self._neighbors[cell]
+        if result is None:
+            result = tuple(divmod(n, self.height) for n in self.cells[cell].tolist() if n >= 0)
+            self._neighbors[cell] = result
+        return result
+
+
+class HillIndex:
+    """
+    Räumlicher Index der Ameisenhügel, getrennt nach Hügeltyp.
+
+    Für jede Zelle wird einmal vorberechnet:
+    - nearest   = Position des nächstgelegenen Hügels (auf dem Torus mit
+                  Torus-Distanz, sonst euklidisch)
+    - next_step = Nachbarzelle, die eine Ameise im Rückkehrmodus ansteuert
+                  (kleinster quadratischer Abstand zum nächsten Hügel,
+                  bei Gleichstand die erste Zelle der Nachbarschaft)
+    - farther   = Nachbarzellen (model.neighbor_table), die weiter vom
+                  nächsten Hügel weg liegen (Manhattan-Distanz, auf dem Torus
+                  mit Umlauf), für die Exploration
+
+    Die Tabellen werden nur neu gebaut, wenn Hügel hinzukommen oder entfernt
+    werden (invalidate). Ein Zugriff aus dem Agenten ist danach ein einziger
+    Listen-Lookup. Die Listen für die Agenten entstehen erst beim ersten
+    Zugriff (die vektorisierte Engine braucht nur die NumPy-Arrays).
+    """
+
+    def __init__(self, model: Model):
+        self.model = model
+        self._tables = {}  # Hügeltyp -> dict mit NumPy-Arrays
+        self._lists = {}   # Hügeltyp -> dict mit flachen Listen für die Agenten
+
+    def invalidate(self, hill_type=None):
+        if hill_type is None:
+            self._tables.clear()
+            self._lists.clear()
+        else:
+            self._tables.pop(hill_type, None)
+            self._lists.pop(hill_type, None)
+
+    def nearest(self, hill_type, pos):
+        lists = self.lists(hill_type)
+        if lists is None:
             return None
+        return lists["nearest"][pos[0] * self.model.height + pos[1]]
 
-        x, y = self.pos
-        width, height = self.model.width, self.model.height
+    def next_step(self, hill_type, pos):
+        lists = self.lists(hill_type)
+        if lists is None:
+            return None
+        return lists["next_step"][pos[0] * self.model.height + pos[1]]
+
+    def farther(self, hill_type, pos):
+        """Nachbarzellen weiter weg vom nächsten Hügel (Tupel, evtl. leer; None ohne Hügel)."""
+        lists = self.lists(hill_type)
+        if lists is None:
+            return None
+        return lists["farther"][pos[0] * self.model.height + pos[1]]
+
+    def table(self, hill_type):
+        """Tabellen für hill_type (None, wenn es keinen solchen Hügel gibt)."""
+        if hill_type not in self._tables:
+            self._tables[hill_type] = self._build(hill_type)
+        return self._tables[hill_type]
+
+    def lists(self, hill_type):
+        """Tabellen als flache Listen (Index x * height + y) für den Zugriff aus den Agenten."""
+        if hill_type not in self._lists:
+            table = self.table(hill_type)
+            self._lists[hill_type] = None if table is None else self._build_lists(table)
+        return self._lists[hill_type]
+
+    def _build(self, hill_type):
+        hills = self.model.agents_by_type.get(hill_type, [])
+        positions = [hill.pos for hill in hills if hill.pos is not None]
+        if not positions:
+            return None
+        return hill_tables(positions, self.model.width, self.model.height, self.model.grid.torus)
+
+    def _build_lists(self, table) -> dict:
+        width, height, torus = self.model.width, self.model.height, self.model.grid.torus
+        hx = table["nearest_x"].ravel()
+        hy = table["nearest_y"].ravel()
+
+        # Exploration: Nachbarzellen mit grösserer Manhattan-Distanz zum nächsten Hügel
+        cells = self.model.neighbor_table.cells
+        valid = cells >= 0
+        nx, ny = np.divmod(np.where(valid, cells, 0), height)
+        xs, ys = np.divmod(np.arange(width * height), height)
+        d_now = axis_distance(xs, hx, width, torus) + axis_distance(ys, hy, height, torus)
+        d_next = axis_distance(nx, hx[:, None], width, torus) + axis_distance(ny, hy[:, None], height, torus)
+        farther = valid & (d_next > d_now[:, None])
+        farther_lists = [
+            tuple(divmod(n, height) for n, f in zip(row, mask) if f)
+            for row, mask in zip(cells.tolist(), farther.tolist())
+        ]
+
+        return {
+            "nearest": list(zip(hx.tolist(), hy.tolist())),
+            "next_step": list(zip(table["next_x"].ravel().tolist(), table["next_y"].ravel().tolist())),
+            "farther": farther_lists,
+        }
+
+
+# max. Anzahl Zelle x Hügel-Distanzen pro Block in hill_tables
+HILL_BLOCK_CELLS = 2_000_000
+
+
+def hill_tables(positions, width: int, height: int, torus: bool, region=None) -> dict:
+    """
+    nearest_x/nearest_y/next_x/next_y (siehe HillIndex) als NumPy-Arrays.
 
-        best_pos = None
-        best_d2 = None
+    region = (x0, x1, y0, y1): nur die Zellen x0 <= x < x1, y0 <= y < y1
+             berechnen (z.B. eine Kachel), berücksichtigt aber alle Hügel.
+    """
+    x0, x1, y0, y1 = region if region is not None else (0, width, 0, height)
+    xs, ys = np.meshgrid(np.arange(x0, x1), np.arange(y0, y1), indexing="ij")
+    shape = xs.shape
+
+    # 1) nächster Hügel (bei Gleichstand der erste Hügel).
+    # Mehrere Hügel auf einmal (Block), damit auch hunderte Hügel schnell gehen.
+    hill_x = np.array([p[0] for p in positions], dtype=np.int64)
+    hill_y = np.array([p[1] for p in positions], dtype=np.int64)
+    # quadrierte Abstände getrennt nach Achse: Spalte x bzw. Zeile y -> Hügel
+    dx2 = axis_distance(np.arange(x0, x1)[:, None], hill_x, width, torus) ** 2
+    dy2 = axis_distance(np.arange(y0, y1)[:, None], hill_y, height, torus) ** 2
+
+    block = max(1, HILL_BLOCK_CELLS // xs.size)
+    best_d2 = np.full(shape, np.iinfo(np.int64).max)
+    near_x = np.zeros(shape, dtype=np.int64)
+    near_y = np.zeros(shape, dtype=np.int64)
+    for start in range(0, len(positions), block):
+        hx = hill_x[start:start + block]
+        hy = hill_y[start:start + block]
+        d2 = dx2[:, None, start:start + block] + dy2[None, :, start:start + block]
+        first = d2.argmin(axis=2)  # bei Gleichstand der erste Hügel im Block
+        d2 = np.take_along_axis(d2, first[..., None], axis=2)[..., 0]
+        closer = d2 < best_d2
+        best_d2[closer] = d2[closer]
+        near_x[closer] = hx[first[closer]]
+        near_y[closer] = hy[first[closer]]
+
+    # 2) bester Nachbarschritt Richtung nächster Hügel
+    step_d2 = np.full(shape, np.inf)
+    step_x = xs.copy()
+    step_y = ys.copy()
+    for dx, dy in MOORE_OFFSETS:
+        cx = xs + dx
+        cy = ys + dy
+        if torus:
+            cx %= width
+            cy %= height
+            valid = np.ones(shape, dtype=bool)
+        else:
+            valid = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+        d2 = ((cx - near_x) ** 2 + (cy - near_y) ** 2).astype(float)
+        d2[~valid] = np.inf
+        better = d2 < step_d2
+        step_d2[better] = d2[better]
+        step_x[better] = cx[better]
+        step_y[better] = cy[better]
+
+    return {
+        "nearest_x": near_x,
+        "nearest_y": near_y,
+        "next_x": step_x,
+        "next_y": step_y,
+    }
 
-        for hill in hills:
-            hx, hy = hill.pos
-            dx = min(abs(hx - x), width - abs(hx - x))
-            dy = min(abs(hy - y), height - abs(hy - y))
-            d2 = dx * dx + dy * dy
-            if best_d2 is None or d2 < best_d2:
-                best_d2 = d2
-                best_pos = (hx, hy)
-
-            return best_pos
-        # 💡 Wenn genug Energie: versuche, in Richtung nächster Ameisenhügel zu laufen
-        if self.energy >= self.return_threshold:
-            target = self.nearest_hill_pos()
-            if target is not None:
-                tx, ty = target
-                width, height = self.model.width, self.model.height
-
-                def torus_dist2(a, b):
-                    (x1, y1) = a
-                    (x2, y2) = b
-                    dx = min(abs(x1 - x2), width - abs(x1 - x2))
-                    dy = min(abs(y1 - y2), height - abs(y1 - y2))
-                    return dx * dx + dy * dy
-
-                # Wähle die Nachbarzelle, die den Abstand zum Ziel minimiert
-                best_cells = []
-                best_d2 = None
-                for n in neighbors:
-                    d2 = torus_dist2(n, target)
-                    if best_d2 is None or d2 < best_d2:
-                        best_d2 = d2
-                        best_cells = [n]
-                    elif d2 == best_d2:
-                        best_cells.append(n)
-
-                new_pos = self.random.choice(best_cells)
-                self.model.grid.move_agent(self, new_pos)
-                return
 
-        good_patches = [a for a in neighbor_agents if isinstance(a, ResourcePatch) and a.amount >= self.model.min_food_to_move ]
+# ==========================================================
+# Zellindex (typisierter Zellinhalt)
+# ==========================================================
+
+class CellIndex:
+    """
+    Zellinhalt getrennt nach Agententyp: pro Typ und Zelle die Agenten in
+    Einfügereihenfolge (gleiche Reihenfolge wie die Zellliste im MultiGrid).
+
+    Ersetzt get_cell_list_contents + isinstance-Filter in eat/deposit_food/
+    attack_natives durch O(1)-Lookups. Nur die beim Erzeugen angegebenen
+    Typen werden indexiert.
+    """
+
+    def __init__(self, agent_types):
+        self._cells = {agent_type: {} for agent_type in agent_types}
 
-        if good_patches:
-            patch = self.random.choice(good_patches)
-            new_pos = patch.pos
-            self.model.grid.move_agent(self,new_pos)
+    def add(self, agent: Agent, pos):
+        cells = self._cells.get(type(agent))
+        if cells is None:
             return
+        cells.setdefault(pos, {})[agent] = None
 
-        # sonst: normales zufälliges Umherwandern
-        new_pos = self.random.choice(neighbors)
-        self.model.grid.move_agent(self, new_pos)
+    def remove(self, agent: Agent, pos):
+        cells = self._cells.get(type(agent))
+        if cells is None:
+            return
+        cell = cells[pos]
+        del cell[agent]
+        if not cell:
+            del cells[pos]
+
+    def first(self, agent_type, pos):
+        """Erster Agent vom Typ agent_type auf pos (oder None)."""
+        cell = self._cells[agent_type].get(pos)
+        if not cell:
+            return None
+        return next(iter(cell))
 
-        self.move()
-        self.eat()
-        self.attack_natives()
+    def agents(self, agent_type, pos) -> list:
+        """Alle Agenten vom Typ agent_type auf pos (Kopie, darf verändert werden)."""
+        cell = self._cells[agent_type].get(pos)
+        if not cell:
+            return []
+        return list(cell)
+
+
+class IndexedMultiGrid(MultiGrid):
+    """MultiGrid, das bei jedem place/remove/move den CellIndex mitführt."""
+
+    def __init__(self, width: int, height: int, torus: bool, index: CellIndex):
+        super().__init__(width, height, torus)
+        self.index = index
+
+    def place_agent(self, agent: Agent, pos) -> None:
+        super().place_agent(agent, pos)
+        self.index.add(agent, agent.pos)
+
+    def remove_agent(self, agent: Agent) -> None:
+        pos = agent.pos
+        super().remove_agent(agent)
+        self.index.remove(agent, pos)
+
+
+# ==========================================================
+# Hügel-Warteschlange (hill_events=True)
+# ==========================================================
+
+class HillQueue:
+    """
+    Hügel, die im nächsten Hügel-Schritt eine Ameise erzeugen können.
+
+    Ohne Warteschlange fragt das Modell jeden Hügel in jedem Step, auch wenn
+    stored_food < 1 ist. Mit hill_events=True meldet sich ein Hügel selbst an
+    (schedule), sobald er genug Nahrung hat: beim Einlagern und nach dem
+    Erzeugen, falls noch Nahrung übrig ist. Hügel ohne Vorrat kosten dann
+    nichts mehr pro Step.
+
+    Das Gegenstück für Ameisen ist die StarvationQueue (death_events=True).
+
+    Die angemeldeten Hügel kommen nach unique_id sortiert dran, also in
+    derselben Reihenfolge wie bei agents_by_type[...].do("step"). Die Läufe
+    sind darum identisch mit und ohne Warteschlange.
+    """
+
+    def __init__(self):
+        self._heaps = {NativeAntHill: [], InvasiveAntHill: []}
+        self._queued = set()
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def wake(self, hill):
+        if hill not in self._queued:
+            self._queued.add(hill)
+            heapq.heappush(self._heaps[type(hill)], (hill.unique_id, hill))
+
+    def pop_all(self, hill_type) -> list:
+        """Alle angemeldeten Hügel eines Typs abmelden, in Registrierungsreihenfolge."""
+        heap = self._heaps[hill_type]
+        hills = [heapq.heappop(heap)[1] for _ in range(len(heap))]
+        self._queued.difference_update(hills)
+        return hills
+
+    def reset(self, hills):
+        """Neu aufbauen (z.B. nach load_checkpoint): alle Hügel mit Nahrung >= 1 anmelden."""
+        for heap in self._heaps.values():
+            heap.clear()
+        self._queued.clear()
+        for hill in hills:
+            hill.schedule()
+
+
+class StarvationQueue:
+    """
+    Verhungern als Ereignis (death_events=True): pro Ameisenart ein Heap mit
+    dem frühesten Step, in dem eine Ameise verhungern kann.
+
+    Ohne Futter verliert eine Ameise pro Step genau metabolism, der Hungertod
+    liegt also energy / metabolism Steps in der Zukunft. Angemeldet wird eine
+    untere Schranke (ein Step Reserve gegen Rundung), beim Fälligwerden wird
+    mit derselben Rechnung wie in step() geprüft: ist die Ameise verhungert,
+    wird sie entfernt, sonst mit ihrer aktuellen Energie neu angemeldet.
+
+    Fressen verschiebt den Hungertod nur nach hinten, der alte Eintrag bleibt
+    eine gültige Schranke und kostet nichts. Nur Einlagern (weniger Energie)
+    meldet früher an; der ältere Eintrag ist dann veraltet (Eintrag != due)
+    und wird beim Herausnehmen übersprungen, ebenso Einträge getöteter Ameisen.
+
+    Die Energie selbst wird weiter jeden Step abgezogen, weil move() sie für
+    die Rückkehr braucht. Eine lineare Formel energy - metabolism * (t - t0)
+    rundet anders als das schrittweise Abziehen und würde Todes-Steps und
+    Rückkehrentscheide verschieben; so sind die Läufe identisch mit und ohne
+    Warteschlange.
+    """
+
+    def __init__(self):
+        self._heaps = {NativeAnt: [], InvasiveAnt: []}
+        self._counter = itertools.count()  # Reihenfolge bei gleichem Step, Ameisen sind nicht vergleichbar
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def schedule(self, ant, step: int, energy: float):
+        """
+        Ameise mit `energy` am Ende von `step` anmelden, falls ihr Hungertod
+        damit früher kommt als bisher angemeldet.
+        """
+        if ant.metabolism <= 0.0:
+            return  # verhungert nie
+        due = step + max(1, int(energy // ant.metabolism) - 1)
+        if ant.due is None or due < ant.due:
+            ant.due = due
+            heapq.heappush(self._heaps[type(ant)], (due, next(self._counter), ant))
+
+    def starve(self, ant_type, step: int):
+        """Alle Ameisen eines Typs entfernen, die in `step` verhungern (vor ihrem live())."""
+        heap = self._heaps[ant_type]
+        while heap and heap[0][0] <= step:
+            due, _, ant = heapq.heappop(heap)
+            if ant.pos is None or ant.due != due:
+                continue  # schon tot oder veralteter Eintrag
+            ant.due = None
+            energy = ant.energy - ant.metabolism  # wie in step()
+            if energy <= 0:
+                ant.die()
+            else:
+                self.schedule(ant, step, energy)
+
+    def reset(self, ants, step: int):
+        """Neu aufbauen (z.B. nach load_checkpoint) mit der Energie am Ende von `step`."""
+        for heap in self._heaps.values():
+            heap.clear()
+        for ant in ants:
+            ant.due = None
+            self.schedule(ant, step, ant.energy)
+
+
+# ==========================================================
+# Zufallszahlen
+# ==========================================================
+
+def make_stream(seed, name: str) -> random.Random:
+    """
+    Eigener Zufallszahlen-Strom für einen Zweck (z.B. einen Ameisentyp),
+    abgeleitet aus dem Modell-Seed. random.Random hasht String-Seeds mit
+    SHA-512, der Strom ist darum in jedem Prozess derselbe (unabhängig von
+    PYTHONHASHSEED und vom Modul-random).
+    """
+    return random.Random(f"{seed}/{name}")
+
+
+# ==========================================================
+# Abbruchbedingungen (stop_when / steady_window)
+# ==========================================================
+
+# Die Bedingungen melden nur Zustände, aus denen das Modell nicht mehr
+# herauskommt. Sie brauchen nur die laufenden Zähler, gelten also für alle
+# Engines (agentenbasiert, vektorisiert, Kacheln).
+
+def habitat_lost(model) -> bool:
+    """habitat_quality = 0 und kann nicht mehr steigen (Erwärmung und Einfluss der Invasiven >= 0)."""
+    return (
+        model.habitat_quality <= 0.0
+        and model.warming >= 0.0
+        and model.warming_rate >= 0.0
+        and model.invasive_habitat_impact >= 0.0
+    )
+
+
+def _hills_can_spawn(model, hill_type, food_attr: str, total: float) -> bool:
+    # Hügel als Agenten: jeden prüfen; Kachel-Modus: nur die Summe ist bekannt
+    hills = model.agents_by_type.get(hill_type)
+    if hills is not None:
+        return any(getattr(hill, food_attr) >= 1.0 for hill in hills)
+    return total >= 1.0
+
+
+def natives_extinct(model) -> bool:
+    """Keine einheimischen Ameisen mehr, und kein Hügel kann noch welche erzeugen."""
+    if model.n_native > 0:
+        return False
+    return habitat_lost(model) or not _hills_can_spawn(
+        model, NativeAntHill, "stored_food_native", model.total_stored_native
+    )
+
+
+def invasives_extinct(model) -> bool:
+    """Keine invasiven Ameisen mehr, und kein Hügel kann noch welche erzeugen."""
+    if model.n_invasive > 0:
+        return False
+    return not _hills_can_spawn(model, InvasiveAntHill, "stored_food_invasive", model.total_stored_invasive)
+
+
+def both_extinct(model) -> bool:
+    return natives_extinct(model) and invasives_extinct(model)
+
+
+# Namen für stop_when (z.B. in params.json: "stop_when": ["both_extinct"])
+STOP_CONDITIONS = {
+    "natives_extinct": natives_extinct,
+    "invasives_extinct": invasives_extinct,
+    "both_extinct": both_extinct,
+    "habitat_lost": habitat_lost,
+}
+
+# Spalten für die Erkennung des stationären Zustands. Warming steigt linear
+# weiter (exogen) und würde nie stationär.
+STEADY_COLUMNS = [
+    "NativeAnts", "InvasiveAnts", "TotalResources", "HabitatQuality",
+    "StoredFoodNative", "StoredFoodInvasive",
+]
+
+
+class SteadyState:
+    """
+    Erkennt, wann sich die Modelldaten nicht mehr ändern: alle Spalten aus
+    STEADY_COLUMNS liegen seit mindestens `window` Steps in einem Band der
+    Breite tol * (grösster Betrag im Band); tol = 0 heisst exakt konstant.
+
+    Pro Spalte werden nur Beginn, Minimum und Maximum des aktuellen ruhigen
+    Abschnitts geführt (O(1) pro Step). Verlässt ein Wert das Band, beginnt
+    mit ihm ein neuer Abschnitt.
+    """
+
+    def __init__(self, window: int, tol: float = 0.0):
+        if window < 1 or tol < 0:
+            raise ValueError("steady_window muss >= 1 und steady_tol >= 0 sein")
+        self.window = int(window)
+        self.tol = float(tol)
+        self.start: Optional[list] = None
+        self.lo: Optional[list] = None
+        self.hi: Optional[list] = None
+
+    def update(self, model) -> bool:
+        """Werte des aktuellen Steps eintragen; True = stationär."""
+        step = model.steps
+        values = [float(MODEL_REPORTERS[name](model)) for name in STEADY_COLUMNS]
+        if self.start is None:
+            self.start = [step] * len(values)
+            self.lo, self.hi = list(values), list(values)
+            return False
+        for i, v in enumerate(values):
+            lo, hi = min(self.lo[i], v), max(self.hi[i], v)
+            if hi - lo > self.tol * max(abs(lo), abs(hi)):
+                self.start[i], lo, hi = step, v, v
+            self.lo[i], self.hi[i] = lo, hi
+        return step - max(self.start) >= self.window
+
+    def state(self) -> dict:
+        return {"start": self.start, "lo": self.lo, "hi": self.hi}
+
+    def restore(self, state: dict):
+        self.start, self.lo, self.hi = state["start"], state["lo"], state["hi"]
+
+
+class StopCheck:
+    """
+    Abbruchbedingungen eines Laufs (Modell-Argumente stop_when, steady_window,
+    steady_tol), geprüft am Ende jedes Steps nach dem Datensammeln.
+
+    stop_when     = Namen aus STOP_CONDITIONS (Liste oder ein Name)
+    steady_window = stationär, wenn sich die Modelldaten so viele Steps nicht
+                    mehr ändern (0 = aus), siehe SteadyState
+
+    check() gibt den Grund zurück ("both_extinct", "steady_state", ...) oder
+    None. Das Modell setzt dann running = False und stop_reason; Läufe ohne
+    GUI hören dort auf (ant_invasion_sweep.run_model, ant_invasion_run.py),
+    SolaraViz hält an.
+    """
+
+    def __init__(self, stop_when=None, steady_window: int = 0, steady_tol: float = 0.0):
+        names = [stop_when] if isinstance(stop_when, str) else list(stop_when or [])
+        unknown = [name for name in names if name not in STOP_CONDITIONS]
+        if unknown:
+            raise ValueError(f"Unbekannte Abbruchbedingung(en): {unknown} (erlaubt: {sorted(STOP_CONDITIONS)})")
+        self.conditions = names
+        self.steady = SteadyState(steady_window, steady_tol) if steady_window else None
+
+    @classmethod
+    def from_kwargs(cls, stop_when, steady_window: int, steady_tol: float) -> Optional["StopCheck"]:
+        """None, wenn keine Bedingung gesetzt ist (dann kostet die Prüfung nichts)."""
+        if not stop_when and not steady_window:
+            return None
+        return cls(stop_when, steady_window, steady_tol)
+
+    def check(self, model) -> Optional[str]:
+        for name in self.conditions:
+            if STOP_CONDITIONS[name](model):
+                return name
+        if self.steady is not None and self.steady.update(model):
+            return "steady_state"
+        return None
 
 
 # ==========================================================
 # Model
 # ==========================================================
 
+# Spalten der Modelldaten (auch von VectorizedAntInvasionModel verwendet).
+# Alle Werte sind laufende Zähler/Summen des Modells, damit das Sammeln
+# unabhängig von Grid-Grösse und Anzahl Agenten O(1) bleibt.
+MODEL_REPORTERS = {
+    "NativeAnts": lambda m: m.n_native,
+    "InvasiveAnts": lambda m: m.n_invasive,
+    "TotalResources": lambda m: float(m.resource_total),
+    "HabitatQuality": lambda m: float(m.habitat_quality),
+    "Warming": lambda m: float(m.warming),
+    "StoredFoodNative": lambda m: float(m.total_stored_native),
+    "StoredFoodInvasive": lambda m: float(m.total_stored_invasive),
+}
+
+
+class ColumnarDataCollector:
+    """
+    Ersatz für den Mesa-DataCollector (nur Modellvariablen) mit vorab
+    allozierten NumPy-Spalten statt Python-Listen.
+
+    n_steps = erwartete Anzahl collect()-Aufrufe; reicht das nicht, werden
+    die Spalten verdoppelt. Der Datentyp einer Spalte (int/float) ergibt sich
+    aus dem ersten gesammelten Wert.
+
+    get_model_vars_dataframe() liefert denselben DataFrame wie
+    DataCollector.get_model_vars_dataframe().
+    """
+
+    def __init__(self, model_reporters: dict, n_steps: int):
+        self.model_reporters = dict(model_reporters)
+        self.capacity = max(1, int(n_steps))
+        self.columns: dict[str, np.ndarray] = {}
+        self.n_rows = 0
+
+    def collect(self, model: Model):
+        row = [(name, reporter(model)) for name, reporter in self.model_reporters.items()]
+        if not self.columns:
+            for name, value in row:
+                dtype = np.int64 if isinstance(value, (int, np.integer)) else np.float64
+                self.columns[name] = np.empty(self.capacity, dtype=dtype)
+        elif self.n_rows == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = np.empty(self.capacity, dtype=column.dtype)
+                grown[: self.n_rows] = column
+                self.columns[name] = grown
+
+        for name, value in row:
+            self.columns[name][self.n_rows] = value
+        self.n_rows += 1
+
+    def get_model_vars_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: column[: self.n_rows] for name, column in self.columns.items()},
+            columns=list(self.model_reporters),
+        )
+
+    def drain(self):
+        """
+        Gesammelte Zeilen als DataFrame zurückgeben und den Puffer leeren
+        (für Ausgabe in Blöcken bei sehr langen Läufen).
+        """
+        df = self.get_model_vars_dataframe()
+        self.n_rows = 0
+        return df
+
+
+class StepProfiler:
+    """
+    Opt-in Messung pro Step (AntInvasionModel(profile=True)).
+
+    Pro Step eine Zeile mit:
+    - <phase>_s      = Laufzeit jeder Phase in Sekunden
+    - <phase>_agents = Anzahl Agenten zu Beginn der Phase (Ameisen, Hügel,
+                       Ressourcen-Patches bzw. Zellen des Ressourcen-Felds)
+    - born_*/died_*  = neue bzw. entfernte Ameisen (died_native inkl. kills)
+    - kills          = von invasiven Ameisen getötete einheimische Ameisen
+    - lookups_*      = Zell-Lookups in eat, deposit_food und attack_natives
+
+    Ohne profile=True ist model.profiler None und step() misst nichts.
+    """
+
+    COUNTERS = [
+        "born_native", "born_invasive", "died_native", "died_invasive", "kills",
+        "lookups_eat", "lookups_deposit", "lookups_attack",
+    ]
+
+    def __init__(self):
+        self.rows: list[dict] = []
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+
+    def _agents_in_phase(self, model, name: str) -> Optional[int]:
+        agent_type = {
+            "native": NativeAnt,
+            "invasive": InvasiveAnt,
+            "hills_native": NativeAntHill,
+            "hills_invasive": InvasiveAntHill,
+            "regen": ResourcePatch,
+        }.get(name)
+        if agent_type is None:
+            return None
+        if agent_type is ResourcePatch and model.resources is not None:
+            return model.resources.amount.size
+        return len(model.agents_by_type.get(agent_type, ()))
+
+    def profile_step(self, model):
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        row = {"Step": model.steps}
+        for name, phase in model.step_phases:
+            n_agents = self._agents_in_phase(model, name)
+            if n_agents is not None:
+                row[f"{name}_agents"] = n_agents
+            t0 = time.perf_counter()
+            phase()
+            row[f"{name}_s"] = time.perf_counter() - t0
+        row.update(self.counts)
+        self.rows.append(row)
+
+    def get_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.rows).set_index("Step")
+
+
+class HillDataCollector:
+    """
+    Pro Step eine Zeile pro Hügel (AntInvasionModel(collect_hills=True)):
+    Step, HillId, Type, x, y, StoredFood, Spawned (bisher erzeugte Ameisen).
+    """
+
+    COLUMNS = ["Step", "HillId", "Type", "x", "y", "StoredFood", "Spawned"]
+    HILL_FOOD = {NativeAntHill: "stored_food_native", InvasiveAntHill: "stored_food_invasive"}
+
+    def __init__(self):
+        self.columns = {name: [] for name in self.COLUMNS}
+
+    def collect(self, model: Model):
+        step = model.steps
+        cols = self.columns
+        for hill_type, food_attr in self.HILL_FOOD.items():
+            for hill in model.agents_by_type.get(hill_type, []):
+                cols["Step"].append(step)
+                cols["HillId"].append(hill.unique_id)
+                cols["Type"].append(hill_type.__name__)
+                cols["x"].append(hill.pos[0])
+                cols["y"].append(hill.pos[1])
+                cols["StoredFood"].append(getattr(hill, food_attr))
+                cols["Spawned"].append(hill.spawned)
+
+    def get_hill_vars_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=self.COLUMNS)
+
+
 class AntInvasionModel(Model):
     """
     Agentenbasiertes Modell passend zu deinem Kausaldiagramm.
@@ -554,8 +1552,18 @@ class AntInvasionModel(Model):
     - NativeAnt  ~ "Ameisen"
     - InvasiveAnt ~ "Invasive Arten"
     - ResourcePatch ~ "Ressourcen für invasive Art"
+      (bzw. ResourceField bei resource_field=True)
     - habitat_quality (0..1) ~ "Habitatsqualität"
     - warming (°C) ~ "Erderwärmung exogen"
+
+    Reproduzierbarkeit: Gleiche Parameter + gleicher Seed + gleicher Code
+    ergeben in jedem Prozess exakt denselben Lauf. Alle Zufallszahlen kommen
+    aus Strömen des Modells, nie aus dem Modul-random:
+    - self.random           Aufbau (Ressourcen, Startposition) und Reihenfolge (shuffle_do)
+    - self.random_native    Entscheidungen der NativeAnts (Umkehr, Bewegung)
+    - self.random_invasive  Entscheidungen der InvasiveAnts (Umkehr, Bewegung, Angriff)
+    Bei seed=None wird ein Seed gezogen und in self.seed bzw. init_kwargs
+    gemerkt, damit auch dieser Lauf wiederholt werden kann.
     """
 
     def __init__(
@@ -584,13 +1592,51 @@ class AntInvasionModel(Model):
         n_invasive_hills: int = 1,
         seed: Optional[int] = 42,
         min_food_to_move: float =  1.0,
+        resource_field: bool = False,           # True = Ressourcen als NumPy-Feld statt Patch-Agenten
+        n_steps: Optional[int] = None,          # bekannte Laufzeit -> ColumnarDataCollector
+        debug_counters: bool = False,           # Zähler jeden Schritt gegen Neuberechnung prüfen
+        profile: bool = False,                  # Laufzeit/Zähler pro Phase messen (StepProfiler)
+        native_hill_placement: str = "center",  # "center" | "random" | "grid" | CSV-Datei (x,y)
+        invasive_hill_placement: str = "random",
+        collect_hills: bool = False,            # Daten pro Hügel sammeln (HillDataCollector)
+        torus: bool = False,                    # Grid-Ränder verbunden (Nachbarschaft und Distanzen)
+        lazy_regen: bool = False,               # Regeneration erst beim Zugriff (LazyResourceField)
+        hill_events: bool = False,              # nur Hügel mit Nahrung >= 1 ausführen (HillQueue)
+        death_events: bool = False,             # Verhungern über Todeszeitpunkte statt Prüfung jeden Step (StarvationQueue)
+        stop_when=None,                         # Abbruchbedingungen, z.B. ["both_extinct"] (StopCheck)
+        steady_window: int = 0,                 # stationär nach so vielen Steps ohne Änderung (0 = aus)
+        steady_tol: float = 0.0,                # relative Toleranz für steady_window
 
     ):
+        if lazy_regen and not resource_field:
+            raise ValueError("lazy_regen=True braucht resource_field=True (Ressourcen-Feld statt Patch-Agenten)")
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        # Konstruktor-Argumente merken (für Checkpoints, siehe ants_invasion_checkpoint.py)
+        self.init_kwargs = {k: v for k, v in locals().items() if k not in ("self", "__class__")}
         super().__init__(seed=seed)
+        self.seed = seed
+        self.random_native = make_stream(seed, "NativeAnt")
+        self.random_invasive = make_stream(seed, "InvasiveAnt")
+
+        # Laufende Zähler/Summen für die Datensammlung
+        self.n_native = 0
+        self.n_invasive = 0
+        self.total_stored_native = 0.0
+        self.total_stored_invasive = 0.0
+        self.debug_counters = debug_counters
+        self.profiler: Optional[StepProfiler] = StepProfiler() if profile else None
 
         self.width = width
         self.height = height
-        self.grid = MultiGrid(width, height, torus=False)
+        self.cell_index = CellIndex([ResourcePatch, NativeAntHill, InvasiveAntHill, NativeAnt])
+        self.grid = IndexedMultiGrid(width, height, torus=torus, index=self.cell_index)
+        self.neighbor_table = NeighborTable(width, height, torus)
+        self.hill_index = HillIndex(self)
+        self.hill_queue: Optional[HillQueue] = HillQueue() if hill_events else None
+        self.death_queue: Optional[StarvationQueue] = StarvationQueue() if death_events else None
+        self.stop_check = StopCheck.from_kwargs(stop_when, steady_window, steady_tol)
+        self.stop_reason: Optional[str] = None
 
         # Globale Stocks
         self.habitat_quality = habitat_quality_start
@@ -609,15 +1655,26 @@ class AntInvasionModel(Model):
         self.metabolism_invasive = metabolism_invasive
         self.bite_native = bite_native
         self.bite_invasive = bite_invasive
-        x_invasive_start_position = random.randrange(width)
-        y_invasive_start_position = random.randrange(height)
-        
-        # Ressourcen-Patches
+
+        # Hügel-Positionen (Ameisen starten verteilt auf die Hügel ihrer Art;
+        # ohne Hügel an einer Position nach derselben Strategie)
+        invasive_hill_xy = hill_positions(invasive_hill_placement, n_invasive_hills, width, height, self.random)
+        invasive_start = invasive_hill_xy or hill_positions(invasive_hill_placement, 1, width, height, self.random)
+        native_hill_xy = hill_positions(native_hill_placement, n_native_hills, width, height, self.random)
+        native_start = native_hill_xy or hill_positions(native_hill_placement, 1, width, height, self.random)
+
+        # Ressourcen-Patches (bzw. Ressourcen-Feld)
+        self.resources: Optional[ResourceField] = None
         self.initial_total_resources = 0.0
+        initial_amounts = np.zeros((width, height)) if resource_field else None
         for x in range(width):
             for y in range(height):
                 has_res = self.random.random() < resource_density
                 amount = patch_max * patch_initial_share if has_res else 0.0
+                self.initial_total_resources += amount
+                if resource_field:
+                    initial_amounts[x, y] = amount
+                    continue
                 patch = ResourcePatch(
                     model=self,
                     amount=amount,
@@ -625,44 +1682,48 @@ class AntInvasionModel(Model):
                     regen_rate=patch_regen,
                 )
                 self.grid.place_agent(patch, (x, y))
-                self.initial_total_resources += amount
+
+        if resource_field:
+            field_cls = LazyResourceField if lazy_regen else ResourceField
+            self.resources = field_cls(
+                width, height,
+                amount=initial_amounts,
+                max_amount=patch_max,
+                regen_rate=patch_regen,
+            )
+            self.grid.add_property_layer(self.resources.layer)
+        self.resource_total = self.initial_total_resources
 
         # Ameisenhügel für die NativeAnts
-        for _ in range(n_native_hills):
+        for pos in native_hill_xy:
             hill = NativeAntHill(
                 model=self,
                 stored_food_native=0.0,
                 max_new_ants_per_step=2,
             )
-            x = 25
-            y = 25
-            self.grid.place_agent(hill, (x, y))
+            self.place_hill(hill, pos)
 
         # Einheimische Ameisen (Arbeiterinnen, reproduzieren nicht selbst)
-        for _ in range(initial_native):
+        for i in range(initial_native):
             ant = NativeAnt(
                 model=self,
                 energy=native_energy,
                 metabolism=metabolism_native,
                 bite_size=bite_native,
             )
-            x = 25 # self.random.randrange(width)
-            y = 25 # self.random.randrange(height)
-            self.grid.place_agent(ant, (x, y))
+            self.grid.place_agent(ant, native_start[i % len(native_start)])
 
         # Ameisenhügel für die InvasiveAnts
-        for _ in range(n_invasive_hills):
+        for pos in invasive_hill_xy:
             hill = InvasiveAntHill(
                 model=self,
                 stored_food_invasive=0.0,
                 max_new_ants_per_step=3,
             )
-            x = x_invasive_start_position
-            y = y_invasive_start_position
-            self.grid.place_agent(hill, (x, y))
+            self.place_hill(hill, pos)
 
         # Invasive Ameisen
-        for _ in range(initial_invasive):
+        for i in range(initial_invasive):
             ant = InvasiveAnt(
                 model=self,
                 energy=invasive_energy,
@@ -670,49 +1731,143 @@ class AntInvasionModel(Model):
                 bite_size=bite_invasive,
                 attack_prob=attack_prob,
             )
-            x = x_invasive_start_position
-            y = y_invasive_start_position
-            self.grid.place_agent(ant, (x, y))
+            self.grid.place_agent(ant, invasive_start[i % len(invasive_start)])
 
         # DataCollector
-        self.datacollector = DataCollector(
-            model_reporters={
-                "NativeAnts": lambda m: m.count_native(),
-                "InvasiveAnts": lambda m: m.count_invasive(),
-                "TotalResources": lambda m: m.total_resources(),
-                "HabitatQuality": lambda m: float(m.habitat_quality),
-                "Warming": lambda m: float(m.warming),
-                "StoredFoodNative": lambda m: sum(
-                    hill.stored_food_native for hill in m.agents_by_type.get(NativeAntHill, [])
-                ),
-                "StoredFoodInvasive": lambda m: sum(
-                    hill.stored_food_invasive for hill in m.agents_by_type.get(InvasiveAntHill, [])
-                ),
-            }
+        if n_steps is None:
+            self.datacollector = DataCollector(model_reporters=MODEL_REPORTERS)
+        else:
+            self.datacollector = ColumnarDataCollector(MODEL_REPORTERS, n_steps)
+        self.hill_datacollector: Optional[HillDataCollector] = (
+            HillDataCollector() if collect_hills else None
         )
 
+        # Phasen eines Steps in Ausführungsreihenfolge (auch für StepProfiler/Benchmarks)
+        self.step_phases = [
+            ("native", self.step_natives),
+            ("invasive", self.step_invasives),
+            ("hills_native", self.step_native_hills),
+            ("hills_invasive", self.step_invasive_hills),
+            ("regen", self.regenerate_resources),
+            ("environment", self.step_environment),
+            ("collect", self.collect_data),
+        ]
+        if self.stop_check is not None:
+            self.step_phases.append(("stop", self.check_stop))
+
     # ----- Auswertungsfunktionen ----------------------------------
 
+    # count_native/count_invasive/total_resources lesen die laufenden Zähler
+    # (O(1)); recount() rechnet dieselben Werte komplett neu aus.
+
     def count_native(self) -> int:
-        if NativeAnt not in self.agents_by_type:
-            return 0
-        return len(self.agents_by_type[NativeAnt])
+        return self.n_native
 
     def count_invasive(self) -> int:
-        if InvasiveAnt not in self.agents_by_type:
-            return 0
-        return len(self.agents_by_type[InvasiveAnt])
+        return self.n_invasive
 
     def total_resources(self) -> float:
-        if ResourcePatch not in self.agents_by_type:
-            return 0.0
-        return sum(p.amount for p in self.agents_by_type[ResourcePatch])
+        return self.resource_total
+
+    def recount(self) -> dict:
+        """Alle laufenden Zähler aus den Agenten bzw. dem Ressourcen-Feld neu berechnen."""
+        if self.resources is not None:
+            resources = self.resources.total()
+        else:
+            resources = sum(p.amount for p in self.agents_by_type.get(ResourcePatch, []))
+        return {
+            "n_native": len(self.agents_by_type.get(NativeAnt, [])),
+            "n_invasive": len(self.agents_by_type.get(InvasiveAnt, [])),
+            "resource_total": resources,
+            "total_stored_native": sum(
+                hill.stored_food_native for hill in self.agents_by_type.get(NativeAntHill, [])
+            ),
+            "total_stored_invasive": sum(
+                hill.stored_food_invasive for hill in self.agents_by_type.get(InvasiveAntHill, [])
+            ),
+        }
+
+    def check_counters(self):
+        """
+        Debug: laufende Zähler gegen recount() prüfen.
+        Anzahlen müssen exakt stimmen, Summen bis auf Rundungsfehler.
+        """
+        for name, expected in self.recount().items():
+            actual = getattr(self, name)
+            if isinstance(expected, int):
+                ok = actual == expected
+            else:
+                ok = math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-6)
+            if not ok:
+                raise RuntimeError(
+                    f"Zähler {name} weicht ab (Step {self.steps}): "
+                    f"laufend {actual}, neu berechnet {expected}"
+                )
 
     def resource_fraction(self) -> float:
         if self.initial_total_resources <= 0:
             return 0.0
         return max(0.0, min(1.0, self.total_resources() / self.initial_total_resources))
 
+    # ----- Hügelverwaltung ----------------------------------------
+
+    def place_hill(self, hill: Agent, pos):
+        """Hügel aufs Grid setzen und den Hügel-Index für diesen Typ verwerfen."""
+        self.grid.place_agent(hill, pos)
+        self.hill_index.invalidate(type(hill))
+
+    # ----- Agentenverwaltung (Zähler, Hügel-Index) -----------------
+
+    def register_agent(self, agent: Agent):
+        super().register_agent(agent)
+        if type(agent) is NativeAnt:
+            self.n_native += 1
+            if self.profiler is not None:
+                self.profiler.counts["born_native"] += 1
+        elif type(agent) is InvasiveAnt:
+            self.n_invasive += 1
+            if self.profiler is not None:
+                self.profiler.counts["born_invasive"] += 1
+
+    def deregister_agent(self, agent: Agent):
+        super().deregister_agent(agent)
+        if type(agent) is NativeAnt:
+            self.n_native -= 1
+            if self.profiler is not None:
+                self.profiler.counts["died_native"] += 1
+        elif type(agent) is InvasiveAnt:
+            self.n_invasive -= 1
+            if self.profiler is not None:
+                self.profiler.counts["died_invasive"] += 1
+        elif type(agent) is NativeAntHill:
+            self.total_stored_native -= agent.stored_food_native
+            self.hill_index.invalidate(NativeAntHill)
+        elif type(agent) is InvasiveAntHill:
+            self.total_stored_invasive -= agent.stored_food_invasive
+            self.hill_index.invalidate(InvasiveAntHill)
+
+    # ----- Ressourcenzugriff --------------------------------------
+
+    def consume_resource(self, pos, bite: float) -> float:
+        """
+        Ameisen fressen an Position pos bis zu `bite` Nahrung.
+        Gibt die tatsächlich entnommene Menge zurück (0.0, falls dort nichts liegt).
+        """
+        if self.resources is not None:
+            take = self.resources.take(pos, bite)
+            self.resource_total -= take
+            return take
+
+        patch = self.cell_index.first(ResourcePatch, pos)
+        if patch is None:
+            return 0.0
+        take = min(bite, patch.amount)
+        if take > 0:
+            patch.amount -= take
+            self.resource_total -= take
+            return take
+        return 0.0
+
     # ----- Umweltupdate -------------------------------------------
 
     def update_environment(self):
@@ -727,32 +1882,87 @@ class AntInvasionModel(Model):
 
     # ----- Simulationsschritt -------------------------------------
 
-    def step(self):
+    def step_natives(self):
         # 1) Einheimische Ameisen
         if NativeAnt in self.agents_by_type:
-            self.agents_by_type[NativeAnt].shuffle_do("step")
+            if self.death_queue is None:
+                self.agents_by_type[NativeAnt].shuffle_do("step")
+            else:
+                self._step_ants_events(NativeAnt)
 
+    def step_invasives(self):
         # 2) Invasive Ameisen
         if InvasiveAnt in self.agents_by_type:
-            self.agents_by_type[InvasiveAnt].shuffle_do("step")
+            if self.death_queue is None:
+                self.agents_by_type[InvasiveAnt].shuffle_do("step")
+            else:
+                self._step_ants_events(InvasiveAnt)
 
+    def _step_ants_events(self, ant_type):
+        """
+        shuffle_do("step") mit death_events: erst mischen (gleiche Zufallszahlen
+        und Reihenfolge wie shuffle_do), dann die fälligen Hungertode, dann
+        live() für alle übrigen.
+        """
+        agents = self.agents_by_type[ant_type]
+        order = list(agents)
+        agents.random.shuffle(order)
+        self.death_queue.starve(ant_type, self.steps)
+        for ant in order:
+            if ant.pos is not None:
+                ant.live()
+
+    def step_native_hills(self):
         # 3) Ameisenhügel (Königin / Reproduktion)
-        if NativeAntHill in self.agents_by_type:
+        if self.hill_queue is not None:
+            # bei habitat_quality <= 0 erzeugt kein Hügel Ameisen, sie bleiben angemeldet
+            if self.habitat_quality > 0.0:
+                for hill in self.hill_queue.pop_all(NativeAntHill):
+                    hill.step()
+        elif NativeAntHill in self.agents_by_type:
             self.agents_by_type[NativeAntHill].do("step")
-            
+
+    def step_invasive_hills(self):
         # 4) Ameisenhügel (Königin / Reproduktion)
-        if InvasiveAntHill in self.agents_by_type:
+        if self.hill_queue is not None:
+            for hill in self.hill_queue.pop_all(InvasiveAntHill):
+                hill.step()
+        elif InvasiveAntHill in self.agents_by_type:
             self.agents_by_type[InvasiveAntHill].do("step")
 
+    def regenerate_resources(self):
         # 5) Ressourcen regenerieren
-        if ResourcePatch in self.agents_by_type:
+        if self.resources is not None:
+            self.resource_total += self.resources.regenerate()
+        elif ResourcePatch in self.agents_by_type:
             self.agents_by_type[ResourcePatch].do("step")
 
+    def step_environment(self):
         # 6) Globale Stocks (Habitat, Erderwärmung) updaten
         self.update_environment()
 
+        if self.debug_counters:
+            self.check_counters()
+
+    def collect_data(self):
         # 7) Daten sammeln
         self.datacollector.collect(self)
+        if self.hill_datacollector is not None:
+            self.hill_datacollector.collect(self)
+
+    def check_stop(self):
+        # 8) Abbruchbedingungen (nur mit stop_when / steady_window)
+        reason = self.stop_check.check(self)
+        if reason is not None:
+            self.running = False
+            self.stop_reason = reason
+
+    def step(self):
+        if self.profiler is not None:
+            self.profiler.profile_step(self)
+            return
+        for _, phase in self.step_phases:
+            phase()
 
 
 # ==========================================================
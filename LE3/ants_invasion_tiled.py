@@ -0,0 +1,521 @@
+# ants_invasion_tiled.py
+# Kachel-Modus für VectorizedAntInvasionModel: eine grosse Landschaft, auf
+# mehrere Prozesse verteilt (räumliche Domänenzerlegung).
+#
+# Das Grid wird in tiles = (tx, ty) Rechtecke zerlegt. Jede Kachel ist ein
+# eigenes TileModel in einem eigenen Worker-Prozess und hält nur ihren Teil:
+# Ressourcen-Feld, Hügel und Ameisen auf ihren Zellen. Ein Step läuft in drei
+# Runden, nach jeder Runde wartet der Koordinator auf alle Kacheln:
+#
+#   A) Einheimische: Grundumsatz, Bewegung             -> Auswanderer
+#   B) Einwanderer aufnehmen, Fressen, Einlagern;
+#      Invasive: Grundumsatz, Bewegung                 -> Auswanderer
+#   C) Einwanderer aufnehmen, Fressen, Einlagern, Angriff,
+#      Reproduktion, Regeneration                      -> Zähler der Kachel
+#
+# Eine Ameise bewegt sich pro Step höchstens eine Zelle weit. Die Randzellen
+# der Nachbarkacheln (Ghost-Zellen) braucht eine Kachel darum nur als Ziel der
+# Bewegung: wer darauf tritt, wandert samt Zustand (Energie, Modus, ...) zur
+# Nachbarkachel und frisst erst dort. Die Hügel-Tabellen (nächster Hügel,
+# Rückweg) rechnet jede Kachel für ihre Zellen über alle Hügel der Landschaft.
+#
+# Der Koordinator summiert die Zähler aller Kacheln und führt die globalen
+# Stocks (habitat_quality, warming) wie AntInvasionModel.update_environment;
+# die Habitatqualität geht mit Runde A an alle Kacheln.
+#
+# Jede Kachel zieht eigene Zufallszahlen (SeedSequence aus seed und Nummer der
+# Kachel). Gleicher seed und gleiche Kachelung ergeben denselben Lauf, mit oder
+# ohne Prozesse (processes=False rechnet alle Kacheln im eigenen Prozess).
+# Die Resultate sind statistisch gleich wie VectorizedAntInvasionModel, aber
+# nicht Zahl für Zahl identisch.
+#
+# Beispiel (aus dem Ordner LE3):
+#     model = TiledAntInvasionModel(width=5000, height=5000, initial_native=2_000_000,
+#                                   n_native_hills=400, native_hill_placement="grid",
+#                                   tiles=(8, 8))
+#     for _ in range(1000):
+#         model.step()
+#     model.close()
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+import traceback
+import weakref
+from typing import Optional
+
+import numpy as np
+
+from mesa import Model
+from mesa.datacollection import DataCollector
+
+from ants_invasion_model import (
+    AntInvasionModel,
+    ColumnarDataCollector,
+    HillQueue,
+    InvasiveAntHill,
+    LazyResourceField,
+    NativeAntHill,
+    ResourceField,
+    MODEL_REPORTERS,
+    StopCheck,
+    hill_positions,
+    hill_tables,
+)
+from ants_invasion_kernels import use_kernels
+from ants_invasion_vectorized import AntArrays, VectorizedAntInvasionModel
+
+
+# Zähler, die jede Kachel nach einem Step meldet (Summe = Modellwert)
+TILE_COUNTS = ["n_native", "n_invasive", "resource_total", "total_stored_native", "total_stored_invasive"]
+
+
+# ==========================================================
+# Kachel
+# ==========================================================
+
+class RegionHillIndex:
+    """HillIndex einer Kachel: Tabellen nur für die eigenen Zellen, über alle Hügel."""
+
+    def __init__(self, positions: dict, width: int, height: int, torus: bool, region):
+        self._tables = {
+            hill_type: hill_tables(pos, width, height, torus, region) if pos else None
+            for hill_type, pos in positions.items()
+        }
+
+    def table(self, hill_type):
+        return self._tables.get(hill_type)
+
+
+class TileModel(VectorizedAntInvasionModel):
+    """
+    Eine Kachel x0 <= x < x1, y0 <= y < y1 der Landschaft.
+
+    Positionen bleiben global (x, y im ganzen Grid), nur Ressourcen-Feld und
+    Hügel-Tabellen sind lokal (siehe _cell). Die Phasen sind dieselben wie in
+    VectorizedAntInvasionModel; handle() führt eine Runde eines Steps aus.
+    """
+
+    def __init__(self, spec: dict):
+        # VectorizedAntInvasionModel.__init__ baut das ganze Grid, darum nur Model
+        Model.__init__(self, seed=spec["seed"])
+        params = spec["params"]
+
+        self.width = spec["width"]
+        self.height = spec["height"]
+        self.torus = spec["torus"]
+        self.x0, self.x1, self.y0, self.y1 = spec["region"]
+        self.x_edges = np.asarray(spec["x_edges"])
+        self.y_edges = np.asarray(spec["y_edges"])
+
+        self.total_stored_native = 0.0
+        self.total_stored_invasive = 0.0
+        self.habitat_quality = params["habitat_quality_start"]
+        self.attack_prob = params["attack_prob"]
+        self.native_energy = params["native_energy"]
+        self.invasive_energy = params["invasive_energy"]
+        self.metabolism_native = params["metabolism_native"]
+        self.metabolism_invasive = params["metabolism_invasive"]
+        self.bite_native = params["bite_native"]
+        self.bite_invasive = params["bite_invasive"]
+        self.kernels = use_kernels(params["kernels"])
+        self.hill_queue = HillQueue() if params["hill_events"] else None
+
+        # Ressourcen der Kachel
+        shape = (self.x1 - self.x0, self.y1 - self.y0)
+        has_res = self.rng.random(shape) < params["resource_density"]
+        initial_amounts = np.where(has_res, params["patch_max"] * params["patch_initial_share"], 0.0)
+        field_cls = LazyResourceField if params["lazy_regen"] else ResourceField
+        self.resources = field_cls(
+            shape[0], shape[1],
+            amount=initial_amounts,
+            max_amount=params["patch_max"],
+            regen_rate=params["patch_regen"],
+        )
+        self.resource_total = self.resources.total()
+
+        # Hügel der Kachel (ohne Grid, nur Position)
+        self._hill_cells = {}
+        for pos in spec["native_hills"]:
+            if self.owns(pos):
+                hill = NativeAntHill(model=self, stored_food_native=0.0, max_new_ants_per_step=2)
+                hill.pos = pos
+        for pos in spec["invasive_hills"]:
+            if self.owns(pos):
+                hill = InvasiveAntHill(model=self, stored_food_invasive=0.0, max_new_ants_per_step=3)
+                hill.pos = pos
+        self.hill_index = RegionHillIndex(
+            {NativeAntHill: spec["native_hills"], InvasiveAntHill: spec["invasive_hills"]},
+            self.width, self.height, self.torus, spec["region"],
+        )
+
+        # Start-Ameisen (Anzahl pro Startposition in dieser Kachel)
+        self.natives = AntArrays()
+        for pos, count in spec["native_start"]:
+            self.natives.add(count, pos, self.native_energy, self.metabolism_native, self.bite_native)
+        self.invasives = AntArrays()
+        for pos, count in spec["invasive_start"]:
+            self.invasives.add(count, pos, self.invasive_energy, self.metabolism_invasive, self.bite_invasive)
+
+    def owns(self, pos) -> bool:
+        return self.x0 <= pos[0] < self.x1 and self.y0 <= pos[1] < self.y1
+
+    def _cell(self, x, y):
+        return (x - self.x0) * (self.y1 - self.y0) + (y - self.y0)
+
+    # ----- Migration ----------------------------------------------
+
+    def _emigrants(self, ants: AntArrays) -> dict:
+        """Ameisen ausserhalb der Kachel herauslösen: Nummer der Zielkachel -> Ameisen."""
+        outside = (ants.x < self.x0) | (ants.x >= self.x1) | (ants.y < self.y0) | (ants.y >= self.y1)
+        if not outside.any():
+            return {}
+        moved = ants.take(outside)
+        tx = np.searchsorted(self.x_edges, moved["x"], side="right") - 1
+        ty = np.searchsorted(self.y_edges, moved["y"], side="right") - 1
+        dest = tx * (len(self.y_edges) - 1) + ty
+        return {
+            int(d): {name: column[dest == d] for name, column in moved.items()}
+            for d in np.unique(dest)
+        }
+
+    @staticmethod
+    def _immigrate(ants: AntArrays, arrivals: list):
+        for group in arrivals:
+            ants.extend(group)
+
+    def counts(self) -> dict:
+        return {
+            "n_native": len(self.natives),
+            "n_invasive": len(self.invasives),
+            "resource_total": self.resource_total,
+            "total_stored_native": self.total_stored_native,
+            "total_stored_invasive": self.total_stored_invasive,
+        }
+
+    # ----- Runden eines Steps -------------------------------------
+
+    def handle(self, command: str, payload):
+        if command == "move_natives":          # A (payload = habitat_quality)
+            self.habitat_quality = payload
+            self._move_natives()
+            return self._emigrants(self.natives)
+        if command == "move_invasives":        # B (payload = eingewanderte Einheimische)
+            self._immigrate(self.natives, payload)
+            self._settle_natives()
+            self._move_invasives()
+            return self._emigrants(self.invasives)
+        if command == "settle":                # C (payload = eingewanderte Invasive)
+            self._immigrate(self.invasives, payload)
+            self._settle_invasives()
+            self._reproduce()
+            self.resource_total += self.resources.regenerate()
+            return self.counts()
+        if command == "counts":
+            return self.counts()
+        raise ValueError(f"Unbekannter Befehl: {command}")
+
+
+# ==========================================================
+# Kacheln im eigenen Prozess oder im Worker-Prozess
+# ==========================================================
+
+def _tile_worker(conn, spec: dict):
+    # läuft im Worker-Prozess: Befehle bis "close" abarbeiten
+    try:
+        tile = TileModel(spec)
+        while True:
+            command, payload = conn.recv()
+            if command == "close":
+                break
+            conn.send(("ok", tile.handle(command, payload)))
+    except EOFError:  # Koordinator beendet
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class _InlineTile:
+    def __init__(self, spec: dict):
+        self.tile = TileModel(spec)
+        self._result = None
+
+    def send(self, command: str, payload):
+        self._result = self.tile.handle(command, payload)
+
+    def recv(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class _ProcessTile:
+    def __init__(self, spec: dict):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_tile_worker, args=(child, spec), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, command: str, payload):
+        self.conn.send((command, payload))
+
+    def recv(self):
+        try:
+            status, value = self.conn.recv()
+        except (EOFError, ConnectionResetError):
+            raise RuntimeError("Kachel-Prozess unerwartet beendet") from None
+        if status == "error":
+            raise RuntimeError(f"Fehler in der Kachel:\n{value}")
+        return value
+
+    def close(self):
+        try:
+            self.conn.send(("close", None))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+def _close_tiles(tiles: list):
+    for tile in tiles:
+        tile.close()
+
+
+# ==========================================================
+# Koordinator
+# ==========================================================
+
+class TiledAntInvasionModel(Model):
+    """
+    VectorizedAntInvasionModel mit zerlegter Landschaft (siehe oben):
+    gleiche Parameter und DataCollector-Spalten, dazu
+
+    tiles     = (tx, ty) Anzahl Kacheln in x- und y-Richtung
+    processes = True: ein Worker-Prozess pro Kachel; False: alle Kacheln im
+                eigenen Prozess (gleiche Resultate, zum Testen)
+
+    Die Worker-Prozesse laufen, bis close() aufgerufen oder das Modell
+    aufgeräumt wird.
+    """
+
+    def __init__(
+        self,
+        width: int = 20,
+        height: int = 20,
+        initial_native: int = 40,
+        initial_invasive: int = 5,
+        resource_density: float = 0.7,
+        patch_max: float = 10.0,
+        patch_initial_share: float = 0.7,
+        patch_regen: float = 0.05,
+        native_energy: float = 5.0,
+        invasive_energy: float = 5.0,
+        metabolism_native: float = 0.2,
+        metabolism_invasive: float = 0.25,
+        bite_native: float = 0.8,
+        bite_invasive: float = 1.0,
+        attack_prob: float = 0.4,
+        # Umwelt / Stocks
+        habitat_quality_start: float = 1.0,
+        warming_start: float = 0.0,
+        warming_rate: float = 0.02,
+        invasive_habitat_impact: float = 0.001,
+        n_native_hills: int = 1,
+        n_invasive_hills: int = 1,
+        seed: Optional[int] = 42,
+        min_food_to_move: float = 1.0,
+        resource_field: bool = True,            # immer True, nur für gleiche Signatur
+        n_steps: Optional[int] = None,
+        debug_counters: bool = False,
+        native_hill_placement: str = "center",
+        invasive_hill_placement: str = "random",
+        collect_hills: bool = False,
+        kernels: str = "auto",
+        torus: bool = False,
+        lazy_regen: bool = False,
+        hill_events: bool = False,
+        tiles: tuple = (2, 2),
+        processes: bool = True,
+        stop_when=None,
+        steady_window: int = 0,
+        steady_tol: float = 0.0,
+    ):
+        if debug_counters or collect_hills:
+            raise ValueError("debug_counters und collect_hills gibt es im Kachel-Modus nicht")
+        tx, ty = tiles
+        if not (1 <= tx <= width and 1 <= ty <= height):
+            raise ValueError(f"tiles={tiles} passt nicht auf ein {width}x{height} Grid")
+
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        super().__init__(seed=seed)
+        self.seed = seed
+
+        self.width = width
+        self.height = height
+        self.tiles = (tx, ty)
+        self.stop_check = StopCheck.from_kwargs(stop_when, steady_window, steady_tol)
+        self.stop_reason: Optional[str] = None
+
+        # Globale Stocks (nur hier, die Kacheln erhalten habitat_quality pro Step)
+        self.habitat_quality = habitat_quality_start
+        self.warming = warming_start
+        self.warming_rate = warming_rate
+        self.invasive_habitat_impact = invasive_habitat_impact
+
+        # Hügel-Positionen (gleiche Zufallsziehung wie AntInvasionModel)
+        invasive_hill_xy = hill_positions(invasive_hill_placement, n_invasive_hills, width, height, self.random)
+        invasive_start = invasive_hill_xy or hill_positions(invasive_hill_placement, 1, width, height, self.random)
+        native_hill_xy = hill_positions(native_hill_placement, n_native_hills, width, height, self.random)
+        native_start = native_hill_xy or hill_positions(native_hill_placement, 1, width, height, self.random)
+
+        # Kachelgrenzen: Kachel (i, j) = x_edges[i] <= x < x_edges[i + 1], analog y
+        self.x_edges = np.linspace(0, width, tx + 1).round().astype(np.int64)
+        self.y_edges = np.linspace(0, height, ty + 1).round().astype(np.int64)
+
+        params = {
+            "resource_density": resource_density,
+            "patch_max": patch_max,
+            "patch_initial_share": patch_initial_share,
+            "patch_regen": patch_regen,
+            "native_energy": native_energy,
+            "invasive_energy": invasive_energy,
+            "metabolism_native": metabolism_native,
+            "metabolism_invasive": metabolism_invasive,
+            "bite_native": bite_native,
+            "bite_invasive": bite_invasive,
+            "attack_prob": attack_prob,
+            "habitat_quality_start": habitat_quality_start,
+            "kernels": kernels,
+            "lazy_regen": lazy_regen,
+            "hill_events": hill_events,
+        }
+        # Start-Ameisen reihum auf die Hügel ihrer Art (wie AntInvasionModel)
+        native_counts = [len(range(i, initial_native, len(native_start))) for i in range(len(native_start))]
+        invasive_counts = [len(range(i, initial_invasive, len(invasive_start))) for i in range(len(invasive_start))]
+        tile_seeds = np.random.SeedSequence(seed).spawn(tx * ty)
+
+        specs = []
+        for i in range(tx):
+            for j in range(ty):
+                region = (int(self.x_edges[i]), int(self.x_edges[i + 1]),
+                          int(self.y_edges[j]), int(self.y_edges[j + 1]))
+                inside = lambda pos: region[0] <= pos[0] < region[1] and region[2] <= pos[1] < region[3]  # noqa: E731
+                specs.append({
+                    "seed": int(tile_seeds[i * ty + j].generate_state(1)[0]),
+                    "params": params,
+                    "width": width,
+                    "height": height,
+                    "torus": torus,
+                    "region": region,
+                    "x_edges": self.x_edges.tolist(),
+                    "y_edges": self.y_edges.tolist(),
+                    "native_hills": native_hill_xy,
+                    "invasive_hills": invasive_hill_xy,
+                    "native_start": [(p, n) for p, n in zip(native_start, native_counts) if inside(p)],
+                    "invasive_start": [(p, n) for p, n in zip(invasive_start, invasive_counts) if inside(p)],
+                })
+
+        tile_cls = _ProcessTile if processes else _InlineTile
+        self._tiles = []
+        self._finalizer = weakref.finalize(self, _close_tiles, self._tiles)
+        for spec in specs:
+            self._tiles.append(tile_cls(spec))
+
+        self._reduce(self._round("counts", [None] * len(self._tiles)))
+        self.initial_total_resources = self.resource_total
+
+        if n_steps is None:
+            self.datacollector = DataCollector(model_reporters=MODEL_REPORTERS)
+        else:
+            self.datacollector = ColumnarDataCollector(MODEL_REPORTERS, n_steps)
+        self.hill_datacollector = None
+
+    # ----- Auswertungsfunktionen ----------------------------------
+
+    def count_native(self) -> int:
+        return self.n_native
+
+    def count_invasive(self) -> int:
+        return self.n_invasive
+
+    def total_resources(self) -> float:
+        return self.resource_total
+
+    # gleiche Berechnung wie im agentenbasierten Modell
+    resource_fraction = AntInvasionModel.resource_fraction
+    update_environment = AntInvasionModel.update_environment
+    check_stop = AntInvasionModel.check_stop
+
+    # ----- Kommunikation mit den Kacheln --------------------------
+
+    def _round(self, command: str, payloads: list) -> list:
+        """Befehl an alle Kacheln schicken, danach alle Antworten abholen."""
+        for tile, payload in zip(self._tiles, payloads):
+            tile.send(command, payload)
+        return [tile.recv() for tile in self._tiles]
+
+    def _exchange(self, command: str, payloads: list) -> list:
+        """Runde mit Auswanderern; gibt pro Kachel die Liste ihrer Einwanderer zurück."""
+        inbox = [[] for _ in self._tiles]
+        for emigrants in self._round(command, payloads):
+            for dest, ants in emigrants.items():
+                inbox[dest].append(ants)
+        return inbox
+
+    def _reduce(self, counts: list):
+        for name in TILE_COUNTS:
+            setattr(self, name, sum(c[name] for c in counts))
+
+    def close(self):
+        """Worker-Prozesse beenden."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- Simulationsschritt -------------------------------------
+
+    def step(self):
+        # 1) + 2) Ameisen beider Arten, Migration zwischen den Runden
+        natives_in = self._exchange("move_natives", [self.habitat_quality] * len(self._tiles))
+        invasives_in = self._exchange("move_invasives", natives_in)
+
+        # 3) - 5) Angriff, Reproduktion, Regeneration; Zähler summieren
+        self._reduce(self._round("settle", invasives_in))
+
+        # 6) Globale Stocks (Habitat, Erderwärmung) updaten
+        self.update_environment()
+
+        # 7) Daten sammeln
+        self.datacollector.collect(self)
+
+        # 8) Abbruchbedingungen
+        if self.stop_check is not None:
+            self.check_stop()
+
+
+# ==========================================================
+# Einfacher Lauf über die Konsole (ohne GUI)
+# ==========================================================
+
+if __name__ == "__main__":
+    with TiledAntInvasionModel(width=201, height=201, initial_native=4000, initial_invasive=500,
+                               n_native_hills=16, native_hill_placement="grid",
+                               n_invasive_hills=4, tiles=(2, 2)) as model:
+        for t in range(50):
+            model.step()
+
+        df = model.datacollector.get_model_vars_dataframe()
+        print("Letzte 5 Zeilen der gesammelten Daten:")
+        print(df.tail())
@@ -0,0 +1,626 @@
+from __future__ import annotations
+from typing import Optional
+
+import random
+
+import numpy as np
+
+from mesa import Model
+from mesa.space import MultiGrid
+from mesa.datacollection import DataCollector
+
+from ants_invasion_model import (
+    AntInvasionModel,
+    ColumnarDataCollector,
+    NativeAnt,
+    NativeAntHill,
+    InvasiveAnt,
+    InvasiveAntHill,
+    LazyResourceField,
+    ResourceField,
+    HillIndex,
+    HillDataCollector,
+    HillQueue,
+    StopCheck,
+    hill_positions,
+    MODEL_REPORTERS,
+    MOORE_OFFSETS,
+    RETURN,
+    SEARCH,
+    axis_distance,
+)
+from ants_invasion_kernels import deposit_ants, eat_sorted, move_ants, use_kernels
+
+
+# ==========================================================
+# Konstanten (identisch zu NativeAnt / InvasiveAnt)
+# ==========================================================
+
+NATIVE_MAX_ENERGY = float(NativeAnt.max_energy)
+NATIVE_MIN_ENERGY = float(NativeAnt.min_energy)
+NATIVE_EXPLORE_PROB = 0.4       # "weiter weg vom Hügel" in 40 % der Fälle
+
+INVASIVE_MAX_ENERGY = float(InvasiveAnt.max_energy)
+INVASIVE_MIN_ENERGY = float(InvasiveAnt.min_energy)
+INVASIVE_EXPLORE_PROB = 0.6     # "weiter weg vom Hügel" in 60 % der Fälle
+INVASIVE_FOOD_GAIN = 1.1        # invasive Ameisen verwerten Nahrung besser
+
+OFFSETS_X = np.array([dx for dx, _ in MOORE_OFFSETS])
+OFFSETS_Y = np.array([dy for _, dy in MOORE_OFFSETS])
+
+
+# ==========================================================
+# Ameisen als Struct-of-Arrays
+# ==========================================================
+
+class AntArrays:
+    """
+    Zustand aller Ameisen einer Art als NumPy-Arrays (ein Eintrag pro Ameise).
+
+    x, y       = Position
+    energy     = aktuelle Energie
+    mode       = SEARCH | RETURN
+    metabolism = Grundumsatz pro Schritt
+    bite_size  = maximale Bissgrösse pro Schritt
+    """
+
+    FIELDS = ("x", "y", "energy", "mode", "metabolism", "bite_size")
+
+    def __init__(self):
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.energy = np.zeros(0)
+        self.mode = np.zeros(0, dtype=np.int8)
+        self.metabolism = np.zeros(0)
+        self.bite_size = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def add(self, count: int, pos, energy: float, metabolism: float, bite_size: float):
+        """
+        count neue Ameisen im Suchmodus anhängen. pos ist eine Position (x, y)
+        für alle oder ein Array (count, 2) mit einer Position pro Ameise.
+        """
+        if count <= 0:
+            return
+        pos = np.asarray(pos, dtype=np.int64)
+        if pos.ndim == 1:
+            pos = np.broadcast_to(pos, (count, 2))
+        new = {
+            "x": pos[:, 0].copy(),
+            "y": pos[:, 1].copy(),
+            "energy": np.full(count, float(energy)),
+            "mode": np.full(count, SEARCH, dtype=np.int8),
+            "metabolism": np.full(count, float(metabolism)),
+            "bite_size": np.full(count, float(bite_size)),
+        }
+        for name in self.FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), new[name]]))
+
+    def keep(self, mask: np.ndarray):
+        """Nur die Ameisen behalten, bei denen mask True ist."""
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name)[mask])
+
+    def take(self, mask: np.ndarray) -> dict:
+        """Ameisen mit mask True herauslösen, als dict Feld -> Array."""
+        taken = {name: getattr(self, name)[mask] for name in self.FIELDS}
+        self.keep(~mask)
+        return taken
+
+    def extend(self, ants: dict):
+        """Mit take() herausgelöste Ameisen anhängen."""
+        for name in self.FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), ants[name]]))
+
+
+# ==========================================================
+# Model
+# ==========================================================
+
+class VectorizedAntInvasionModel(Model):
+    """
+    Alternative Engine für AntInvasionModel: gleiche Parameter, gleiche Regeln,
+    gleiche DataCollector-Spalten, aber alle Ameisen als Arrays (AntArrays)
+    statt als Mesa-Agenten.
+
+    Ein Schritt läuft in denselben Phasen wie AntInvasionModel.step, jede Phase
+    als Array-Operation über alle Ameisen einer Art:
+
+    1) einheimische Ameisen: Grundumsatz/Tod, Bewegung, Fressen, Einlagern
+    2) invasive Ameisen: dasselbe plus Angriff auf einheimische Ameisen
+    3) Hügel erzeugen neue Ameisen
+    4) Ressourcen regenerieren, Umwelt updaten, Daten sammeln
+
+    Die Reihenfolge beim Fressen entspricht shuffle_do: pro Zelle fressen die
+    Ameisen in zufälliger Reihenfolge, bis die Zelle leer ist. Ein Angriff
+    tötet eine einheimische Ameise mit 1 - (1 - attack_prob)^k, wenn k invasive
+    Ameisen auf ihrer Zelle stehen (wie k unabhängige Angriffe nacheinander).
+    Die Resultate sind statistisch gleich, aber nicht Zahl für Zahl identisch
+    mit AntInvasionModel, da die Zufallszahlen anders gezogen werden.
+
+    Hügel bleiben Mesa-Agenten (wenige Objekte), Ressourcen sind immer ein
+    ResourceField.
+    """
+
+    def __init__(
+        self,
+        width: int = 20,
+        height: int = 20,
+        initial_native: int = 40,
+        initial_invasive: int = 5,
+        resource_density: float = 0.7,
+        patch_max: float = 10.0,
+        patch_initial_share: float = 0.7,
+        patch_regen: float = 0.05,
+        native_energy: float = 5.0,
+        invasive_energy: float = 5.0,
+        metabolism_native: float = 0.2,
+        metabolism_invasive: float = 0.25,
+        bite_native: float = 0.8,
+        bite_invasive: float = 1.0,
+        attack_prob: float = 0.4,
+        # Umwelt / Stocks
+        habitat_quality_start: float = 1.0,
+        warming_start: float = 0.0,
+        warming_rate: float = 0.02,
+        invasive_habitat_impact: float = 0.001,
+        n_native_hills: int = 1,
+        n_invasive_hills: int = 1,
+        seed: Optional[int] = 42,
+        min_food_to_move: float = 1.0,
+        resource_field: bool = True,            # immer True, nur für gleiche Signatur
+        n_steps: Optional[int] = None,
+        debug_counters: bool = False,
+        native_hill_placement: str = "center",
+        invasive_hill_placement: str = "random",
+        collect_hills: bool = False,
+        kernels: str = "auto",
+        torus: bool = False,
+        lazy_regen: bool = False,               # Regeneration erst beim Zugriff (LazyResourceField)
+        hill_events: bool = False,              # nur Hügel mit Nahrung >= 1 ausführen (HillQueue)
+        stop_when=None,                         # Abbruchbedingungen (StopCheck)
+        steady_window: int = 0,
+        steady_tol: float = 0.0,
+    ):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        super().__init__(seed=seed)
+        self.seed = seed
+
+        # Laufende Summen für die Datensammlung (Anzahl Ameisen = Länge der Arrays)
+        self.total_stored_native = 0.0
+        self.total_stored_invasive = 0.0
+        self.debug_counters = debug_counters
+        # kompilierte Kernels (ants_invasion_kernels.py), gleiche Resultate wie NumPy
+        self.kernels = use_kernels(kernels)
+
+        self.width = width
+        self.height = height
+        self.torus = torus
+        self.grid = MultiGrid(width, height, torus=torus)  # nur für die Hügel
+        self.hill_index = HillIndex(self)
+        self.hill_queue = HillQueue() if hill_events else None
+        self.stop_check = StopCheck.from_kwargs(stop_when, steady_window, steady_tol)
+        self.stop_reason: Optional[str] = None
+
+        # Globale Stocks
+        self.habitat_quality = habitat_quality_start
+        self.warming = warming_start
+        self.warming_rate = warming_rate
+        self.invasive_habitat_impact = invasive_habitat_impact
+
+        self.min_food_to_move = min_food_to_move
+
+        self.attack_prob = attack_prob
+        self.native_energy = native_energy
+        self.invasive_energy = invasive_energy
+        self.metabolism_native = metabolism_native
+        self.metabolism_invasive = metabolism_invasive
+        self.bite_native = bite_native
+        self.bite_invasive = bite_invasive
+
+        # Hügel-Positionen (gleiche Zufallsziehung wie AntInvasionModel)
+        invasive_hill_xy = hill_positions(invasive_hill_placement, n_invasive_hills, width, height, self.random)
+        invasive_start = invasive_hill_xy or hill_positions(invasive_hill_placement, 1, width, height, self.random)
+        native_hill_xy = hill_positions(native_hill_placement, n_native_hills, width, height, self.random)
+        native_start = native_hill_xy or hill_positions(native_hill_placement, 1, width, height, self.random)
+
+        # Ressourcen (gleiche Zufallsziehung wie AntInvasionModel)
+        self.initial_total_resources = 0.0
+        initial_amounts = np.zeros((width, height))
+        for x in range(width):
+            for y in range(height):
+                has_res = self.random.random() < resource_density
+                amount = patch_max * patch_initial_share if has_res else 0.0
+                self.initial_total_resources += amount
+                initial_amounts[x, y] = amount
+        field_cls = LazyResourceField if lazy_regen else ResourceField
+        self.resources = field_cls(
+            width, height,
+            amount=initial_amounts,
+            max_amount=patch_max,
+            regen_rate=patch_regen,
+        )
+        self.grid.add_property_layer(self.resources.layer)
+        self.resource_total = self.initial_total_resources
+
+        # Hügel
+        self._hill_cells = {}
+        for pos in native_hill_xy:
+            hill = NativeAntHill(model=self, stored_food_native=0.0, max_new_ants_per_step=2)
+            self.place_hill(hill, pos)
+        for pos in invasive_hill_xy:
+            hill = InvasiveAntHill(model=self, stored_food_invasive=0.0, max_new_ants_per_step=3)
+            self.place_hill(hill, pos)
+
+        # Ameisen (reihum auf die Hügel ihrer Art verteilt, wie AntInvasionModel)
+        self.natives = AntArrays()
+        for i, pos in enumerate(native_start):
+            count = len(range(i, initial_native, len(native_start)))
+            self.natives.add(count, pos, native_energy, metabolism_native, bite_native)
+        self.invasives = AntArrays()
+        for i, pos in enumerate(invasive_start):
+            count = len(range(i, initial_invasive, len(invasive_start)))
+            self.invasives.add(count, pos, invasive_energy, metabolism_invasive, bite_invasive)
+
+        if n_steps is None:
+            self.datacollector = DataCollector(model_reporters=MODEL_REPORTERS)
+        else:
+            self.datacollector = ColumnarDataCollector(MODEL_REPORTERS, n_steps)
+        self.hill_datacollector: Optional[HillDataCollector] = (
+            HillDataCollector() if collect_hills else None
+        )
+
+    # ----- Auswertungsfunktionen ----------------------------------
+
+    @property
+    def n_native(self) -> int:
+        return len(self.natives)
+
+    @property
+    def n_invasive(self) -> int:
+        return len(self.invasives)
+
+    def count_native(self) -> int:
+        return len(self.natives)
+
+    def count_invasive(self) -> int:
+        return len(self.invasives)
+
+    def total_resources(self) -> float:
+        return self.resource_total
+
+    def recount(self) -> dict:
+        """Laufende Summen neu berechnen (Anzahlen sind hier immer exakt)."""
+        return {
+            "n_native": len(self.natives),
+            "n_invasive": len(self.invasives),
+            "resource_total": self.resources.total(),
+            "total_stored_native": sum(h.stored_food_native for h in self.hills(NativeAntHill)),
+            "total_stored_invasive": sum(h.stored_food_invasive for h in self.hills(InvasiveAntHill)),
+        }
+
+    # gleiche Berechnung wie im agentenbasierten Modell
+    resource_fraction = AntInvasionModel.resource_fraction
+    update_environment = AntInvasionModel.update_environment
+    check_stop = AntInvasionModel.check_stop
+    check_counters = AntInvasionModel.check_counters
+
+    # ----- Hügelverwaltung ----------------------------------------
+
+    def place_hill(self, hill, pos):
+        self.grid.place_agent(hill, pos)
+        self.hill_index.invalidate(type(hill))
+        self._hill_cells = {}
+
+    def hills(self, hill_type) -> list:
+        return list(self.agents_by_type.get(hill_type, []))
+
+    def hill_cells(self, hill_type) -> np.ndarray:
+        """Flaches Array (Zellindex, siehe _cell) -> Index des ersten Hügels auf der Zelle, sonst -1."""
+        if hill_type not in self._hill_cells:
+            cells = np.full(self.resources.amount.size, -1, dtype=np.int64)
+            for i, hill in reversed(list(enumerate(self.hills(hill_type)))):
+                cells[self._cell(*hill.pos)] = i
+            self._hill_cells[hill_type] = cells
+        return self._hill_cells[hill_type]
+
+    # ----- Phasen -------------------------------------------------
+
+    def _cell(self, x, y):
+        """Flacher Zellindex in Ressourcen-Feld und Hügel-Tabellen."""
+        return x * self.height + y
+
+    def _distance(self, x, y, hx, hy):
+        """Manhattan-Distanz (auf dem Torus mit Umlauf)."""
+        return axis_distance(x, hx, self.width, self.torus) + axis_distance(y, hy, self.height, self.torus)
+
+    def _metabolism(self, ants: AntArrays):
+        """Grundumsatz abziehen, verhungerte Ameisen entfernen."""
+        ants.energy -= ants.metabolism
+        alive = ants.energy > 0
+        if not alive.all():
+            ants.keep(alive)
+
+    def _choose(self, mask: np.ndarray) -> np.ndarray:
+        """Pro Zeile einen zufälligen Spaltenindex unter den True-Einträgen."""
+        counts = mask.sum(axis=1)
+        r = (self.rng.random(len(mask)) * counts).astype(np.int64)
+        return np.argmax(np.cumsum(mask, axis=1) > r[:, None], axis=1)
+
+    def _move(self, ants: AntArrays, hill_type, max_energy: float,
+              return_from: float, return_span: float, return_max: float,
+              explore_prob: float):
+        n = len(ants)
+        if n == 0:
+            return
+
+        # 1) Suchmodus: probabilistische Umkehr, steigt linear ab return_from
+        frac = ants.energy / max_energy
+        p_return = np.where(frac > return_from, (frac - return_from) / return_span * return_max, 0.0)
+        turn = (ants.mode == SEARCH) & (self.rng.random(n) < p_return)
+        ants.mode[turn] = RETURN
+
+        if self.kernels:
+            self._move_kernel(ants, hill_type, explore_prob)
+            return
+
+        # Nachbarzellen (Moore, ohne Zentrum) und gültige Zellen am Rand
+        nx = ants.x[:, None] + OFFSETS_X
+        ny = ants.y[:, None] + OFFSETS_Y
+        if self.torus:
+            nx %= self.width
+            ny %= self.height
+        valid = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+
+        table = self.hill_index.table(hill_type)
+        if table is None:
+            # ohne Hügel: reiner Random Walk für alle
+            walk = np.ones(n, dtype=bool)
+            choice_mask = valid
+        else:
+            cell = self._cell(ants.x, ants.y)
+
+            # 2) Rückkehrmodus: vorberechneter Schritt Richtung Hügel
+            back = ants.mode == RETURN
+            back_cell = cell[back]
+            walk = ~back
+
+            # 3) Exploration: Nachbarzellen weiter weg vom Hügel (Manhattan)
+            hx = table["nearest_x"].ravel()[cell]
+            hy = table["nearest_y"].ravel()[cell]
+            d_now = self._distance(ants.x, ants.y, hx, hy)
+            d_next = self._distance(nx, ny, hx[:, None], hy[:, None])
+            explore = walk & (self.rng.random(n) < explore_prob)
+            farther = valid & (d_next > d_now[:, None]) & explore[:, None]
+
+            # 4) Fallback: Random Walk, wenn keine Zelle weiter weg liegt
+            choice_mask = np.where(farther.any(axis=1)[:, None], farther, valid)
+
+            ants.x[back] = table["next_x"].ravel()[back_cell]
+            ants.y[back] = table["next_y"].ravel()[back_cell]
+
+        idx = np.flatnonzero(walk)
+        if len(idx):
+            k = self._choose(choice_mask[idx])
+            ants.x[idx] = nx[idx, k]
+            ants.y[idx] = ny[idx, k]
+
+    def _move_kernel(self, ants: AntArrays, hill_type, explore_prob: float):
+        # gleiche Zufallszahlen wie _move / _choose, Bewegung im Kernel
+        n = len(ants)
+        table = self.hill_index.table(hill_type)
+        if table is None:
+            walk = np.ones(n, dtype=bool)
+            explore = np.zeros(n, dtype=bool)
+            cell = np.zeros(0, dtype=np.int64)
+            nearest_x = nearest_y = next_x = next_y = cell
+        else:
+            walk = ants.mode != RETURN
+            explore = walk & (self.rng.random(n) < explore_prob)
+            cell = self._cell(ants.x, ants.y)
+            nearest_x = table["nearest_x"].ravel()
+            nearest_y = table["nearest_y"].ravel()
+            next_x = table["next_x"].ravel()
+            next_y = table["next_y"].ravel()
+        n_walk = int(walk.sum())
+        u = self.rng.random(n_walk) if n_walk else np.zeros(0)
+        move_ants(ants.x, ants.y, walk, explore, u, cell, nearest_x, nearest_y, next_x, next_y,
+                  OFFSETS_X, OFFSETS_Y, self.width, self.height, self.torus)
+
+    def _eat(self, ants: AntArrays, gain: float):
+        """Pro Zelle fressen die Ameisen in zufälliger Reihenfolge, bis nichts mehr da ist."""
+        n = len(ants)
+        if n == 0:
+            return
+        cell = self._cell(ants.x, ants.y)
+        order = self.rng.permutation(n)
+        order = order[np.argsort(cell[order], kind="stable")]
+        cells = cell[order]
+        bites = ants.bite_size[order]
+        # lazy_regen: Zellen vor dem Fressen nachrechnen
+        self.resources.sync(cells)
+        amount = self.resources.amount.reshape(-1)
+
+        if self.kernels:
+            take = eat_sorted(cells, bites, amount)
+        else:
+            # bereits gefressene Menge der Vorgänger auf derselben Zelle
+            eaten_before = np.cumsum(bites) - bites
+            first = np.ones(n, dtype=bool)
+            first[1:] = cells[1:] != cells[:-1]
+            eaten_before -= eaten_before[first][np.cumsum(first) - 1]
+
+            take = np.clip(amount[cells] - eaten_before, 0.0, bites)
+            np.subtract.at(amount, cells, take)
+        self.resources.touched(cells)
+        self.resource_total -= float(take.sum())
+        ants.energy[order] += take * gain
+
+    def _deposit(self, ants: AntArrays, hill_type, min_energy: float):
+        """Ameisen auf einem eigenen Hügel lagern Energie über min_energy ein."""
+        if len(ants) == 0:
+            return
+        if self.kernels:
+            hills = self.hills(hill_type)
+            stored = np.zeros(len(hills))
+            deposit_ants(self._cell(ants.x, ants.y), ants.energy, ants.mode,
+                         self.hill_cells(hill_type), min_energy, stored, SEARCH)
+            for i in np.flatnonzero(stored > 0.0).tolist():
+                hills[i].receive_food(float(stored[i]))
+            return
+        hill_of = self.hill_cells(hill_type)[self._cell(ants.x, ants.y)]
+        available = np.maximum(0.0, ants.energy - min_energy)
+        deposit = (hill_of >= 0) & (available > 0.0)
+        if not deposit.any():
+            return
+
+        hills = self.hills(hill_type)
+        stored = np.zeros(len(hills))
+        np.add.at(stored, hill_of[deposit], available[deposit])
+        for i in np.flatnonzero(stored > 0.0).tolist():
+            hills[i].receive_food(float(stored[i]))
+
+        ants.energy[deposit] -= available[deposit]
+        ants.mode[deposit] = SEARCH
+
+    def _attack(self):
+        """Jede invasive Ameise greift die einheimischen Ameisen auf ihrer Zelle an."""
+        if len(self.natives) == 0 or len(self.invasives) == 0 or self.attack_prob <= 0.0:
+            return
+        invasive_cells = self._cell(self.invasives.x, self.invasives.y)
+        attackers = np.bincount(invasive_cells, minlength=self.resources.amount.size)
+        k = attackers[self._cell(self.natives.x, self.natives.y)]
+        p_kill = 1.0 - (1.0 - self.attack_prob) ** k
+        survive = self.rng.random(len(self.natives)) >= p_kill
+        if not survive.all():
+            self.natives.keep(survive)
+
+    def _spawning(self, hill_type) -> list:
+        """Hügel, die Ameisen erzeugen können (mit hill_events nur die angemeldeten)."""
+        if self.hill_queue is None:
+            return self.hills(hill_type)
+        return self.hill_queue.pop_all(hill_type)
+
+    @staticmethod
+    def _births(births: list) -> np.ndarray:
+        """(Anzahl, Position) pro Hügel -> eine Position pro neuer Ameise, in Hügelreihenfolge."""
+        if not births:
+            return np.zeros((0, 2), dtype=np.int64)
+        counts, positions = zip(*births)
+        return np.repeat(np.array(positions, dtype=np.int64), counts, axis=0)
+
+    def _reproduce(self):
+        """
+        Königin-Logik der Hügel (wie NativeAntHill.step / InvasiveAntHill.step).
+
+        Die neuen Ameisen aller Hügel werden zuerst gesammelt und pro Art in
+        einem einzigen add() angehängt; ein add() pro Hügel würde bei vielen
+        Hügeln die Arrays aller Ameisen jedes Mal neu kopieren.
+        """
+        h = max(0.0, min(1.0, self.habitat_quality))
+        births = []
+        if h > 0.0:
+            for hill in self._spawning(NativeAntHill):
+                born = 0
+                while born < hill.max_new_ants_per_step and hill.stored_food_native >= 1.0:
+                    hill.stored_food_native -= 1.0
+                    self.total_stored_native -= 1.0
+                    born += 1
+                hill.spawned += born
+                if born:
+                    births.append((born, hill.pos))
+                hill.schedule()
+        pos = self._births(births)
+        self.natives.add(len(pos), pos, self.native_energy, self.metabolism_native, self.bite_native)
+
+        births = []
+        for hill in self._spawning(InvasiveAntHill):
+            born = 0
+            while born < hill.max_new_ants_per_step and hill.stored_food_invasive >= 1.0:
+                hill.stored_food_invasive -= 1.0
+                self.total_stored_invasive -= 1.0
+                born += 1
+            hill.spawned += born
+            if born:
+                births.append((born, hill.pos))
+            hill.schedule()
+        pos = self._births(births)
+        self.invasives.add(len(pos), pos, self.invasive_energy, self.metabolism_invasive, self.bite_invasive)
+
+    # ----- Simulationsschritt -------------------------------------
+
+    # Jede Ameisenart in zwei Hälften: Bewegung, danach alles auf der neuen
+    # Zelle. Dazwischen wandern im Kachel-Modus (ants_invasion_tiled.py) die
+    # Ameisen, die ihre Kachel verlassen haben, zur Nachbarkachel.
+
+    def _move_natives(self):
+        self._metabolism(self.natives)
+        self._move(self.natives, NativeAntHill, NATIVE_MAX_ENERGY,
+                   return_from=0.5, return_span=0.5, return_max=0.5,
+                   explore_prob=NATIVE_EXPLORE_PROB)
+
+    def _settle_natives(self):
+        self._eat(self.natives, gain=1.0)
+        full = self.natives.energy >= NATIVE_MAX_ENERGY
+        self.natives.mode[full] = RETURN
+        self._deposit(self.natives, NativeAntHill, NATIVE_MIN_ENERGY)
+
+    def _move_invasives(self):
+        self._metabolism(self.invasives)
+        self._move(self.invasives, InvasiveAntHill, INVASIVE_MAX_ENERGY,
+                   return_from=0.4, return_span=0.6, return_max=0.3,
+                   explore_prob=INVASIVE_EXPLORE_PROB)
+
+    def _settle_invasives(self):
+        self._eat(self.invasives, gain=INVASIVE_FOOD_GAIN)
+        self._deposit(self.invasives, InvasiveAntHill, INVASIVE_MIN_ENERGY)
+        self._attack()
+
+    def step(self):
+        # 1) Einheimische Ameisen
+        self._move_natives()
+        self._settle_natives()
+
+        # 2) Invasive Ameisen
+        self._move_invasives()
+        self._settle_invasives()
+
+        # 3) + 4) Ameisenhügel (Königin / Reproduktion)
+        self._reproduce()
+
+        # 5) Ressourcen regenerieren
+        self.resource_total += self.resources.regenerate()
+
+        # 6) Globale Stocks (Habitat, Erderwärmung) updaten
+        self.update_environment()
+
+        if self.debug_counters:
+            self.check_counters()
+
+        # 7) Daten sammeln
+        self.datacollector.collect(self)
+        if self.hill_datacollector is not None:
+            self.hill_datacollector.collect(self)
+
+        # 8) Abbruchbedingungen
+        if self.stop_check is not None:
+            self.check_stop()
+
+
+# ==========================================================
+# Einfacher Lauf über die Konsole (ohne GUI)
+# ==========================================================
+
+if __name__ == "__main__":
+    model = VectorizedAntInvasionModel(width=51, height=51)
+
+    n_steps = 50
+    for t in range(n_steps):
+        model.step()
+
+    df = model.datacollector.get_model_vars_dataframe()
+    print("Letzte 5 Zeilen der gesammelten Daten:")
+    print(df.tail())
@@ -0,0 +1,102 @@
+# bench_cell_lookup.py
+# Micro-Benchmark: Zell-Lookups in eat/deposit_food/attack_natives
+# vorher (get_cell_list_contents + isinstance) vs. nachher (CellIndex).
+#
+# Ausführen (aus dem Ordner LE3):
+#     python benchmarks/bench_cell_lookup.py --ants 10000
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ants_invasion_model import (  # noqa: E402
+    AntInvasionModel,
+    NativeAnt,
+    InvasiveAnt,
+    NativeAntHill,
+    InvasiveAntHill,
+    ResourcePatch,
+)
+
+
+def build_model(n_ants: int, size: int, seed: int) -> AntInvasionModel:
+    """Modell mit n_ants Ameisen (halb/halb), zufällig über das Grid verteilt."""
+    model = AntInvasionModel(
+        width=size,
+        height=size,
+        initial_native=n_ants // 2,
+        initial_invasive=n_ants - n_ants // 2,
+        resource_density=1.0,
+        seed=seed,
+    )
+    for agent_type in (NativeAnt, InvasiveAnt):
+        for ant in model.agents_by_type[agent_type]:
+            model.grid.move_agent(
+                ant, (model.random.randrange(size), model.random.randrange(size))
+            )
+    return model
+
+
+def lookups_scan(model: AntInvasionModel):
+    """Alte Variante: eine Zellliste pro Lookup scannen und filtern."""
+    grid = model.grid
+    for ant in model.agents_by_type[NativeAnt]:
+        cellmates = grid.get_cell_list_contents([ant.pos])
+        [a for a in cellmates if isinstance(a, ResourcePatch)]
+        cellmates = grid.get_cell_list_contents([ant.pos])
+        [a for a in cellmates if isinstance(a, NativeAntHill)]
+    for ant in model.agents_by_type[InvasiveAnt]:
+        cellmates = grid.get_cell_list_contents([ant.pos])
+        [a for a in cellmates if isinstance(a, ResourcePatch)]
+        cellmates = grid.get_cell_list_contents([ant.pos])
+        [a for a in cellmates if isinstance(a, InvasiveAntHill)]
+        cellmates = grid.get_cell_list_contents([ant.pos])
+        [a for a in cellmates if isinstance(a, NativeAnt)]
+
+
+def lookups_index(model: AntInvasionModel):
+    """Neue Variante: typisierte O(1)-Lookups im CellIndex."""
+    index = model.cell_index
+    for ant in model.agents_by_type[NativeAnt]:
+        index.first(ResourcePatch, ant.pos)
+        index.first(NativeAntHill, ant.pos)
+    for ant in model.agents_by_type[InvasiveAnt]:
+        index.first(ResourcePatch, ant.pos)
+        index.first(InvasiveAntHill, ant.pos)
+        index.agents(NativeAnt, ant.pos)
+
+
+def best_of(func, model, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func(model)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-Benchmark der Zell-Lookups (Scan vs. CellIndex)")
+    parser.add_argument("--ants", type=int, default=10_000)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    model = build_model(args.ants, args.size, args.seed)
+    t_scan = best_of(lookups_scan, model, args.repeats)
+    t_index = best_of(lookups_index, model, args.repeats)
+
+    print(f"Ameisen: {args.ants}  Grid: {args.size}x{args.size}")
+    print(f"Zell-Lookups pro Step, Scan  : {t_scan * 1000:8.2f} ms")
+    print(f"Zell-Lookups pro Step, Index : {t_index * 1000:8.2f} ms")
+    print(f"Faktor                       : {t_scan / t_index:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# bench_memory.py
+# Speicher pro Ameise (Bytes, gemessen mit tracemalloc):
+# vorher (Konstanten und Modus-String pro Instanz) vs. nachher (__slots__,
+# Klassenattribute, Modus als Zahl), dazu der Anteil von Mesa selbst
+# (Registrierung im Modell) und AntArrays der vektorisierten Engine.
+#
+# Ausführen (aus dem Ordner LE3):
+#     python benchmarks/bench_memory.py --ants 100000
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mesa import Agent  # noqa: E402
+
+from ants_invasion_model import AntInvasionModel, InvasiveAnt, NativeAnt  # noqa: E402
+from ants_invasion_vectorized import AntArrays  # noqa: E402
+
+
+class BareAgent(Agent):
+    """Mesa-Agent ohne eigene Felder (nur Registrierung, unique_id, pos)."""
+
+
+class LegacyNativeAnt(Agent):
+    """Alte Variante von NativeAnt.__init__: Konstanten pro Instanz, Modus als String."""
+
+    def __init__(self, model, energy, metabolism, bite_size):
+        super().__init__(model)
+        self.energy = float(energy)
+        self.metabolism = float(metabolism)
+        self.bite_size = float(bite_size)
+        self.min_energy = 6
+        self.return_threshold = 6.0
+        self.min_food_to_move = 1.0
+        self.mode = "search"
+        self.max_energy = 208
+        self.max_foraging_dist = 15
+
+
+class LegacyInvasiveAnt(Agent):
+    """Alte Variante von InvasiveAnt.__init__."""
+
+    def __init__(self, model, energy, metabolism, bite_size, attack_prob):
+        super().__init__(model)
+        self.energy = float(energy)
+        self.metabolism = float(metabolism)
+        self.bite_size = float(bite_size)
+        self.attack_prob = float(attack_prob)
+        self.min_energy = 1.0
+        self.return_threshold = 6.0
+        self.min_food_to_move = 1.0
+        self.mode = "search"
+        self.max_energy = 14.0
+
+
+def new_ant(model, ant_type, i: int):
+    kwargs = {"energy": 5.0 + i * 1e-9, "metabolism": 0.2, "bite_size": 0.8}
+    if ant_type in (InvasiveAnt, LegacyInvasiveAnt):
+        kwargs["attack_prob"] = 0.4
+    return ant_type(model, **kwargs)
+
+
+def bytes_per_item(make, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    items = [make(i) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for item in items:
+        if isinstance(item, Agent):
+            item.remove()
+    return current / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speicher pro Ameise (vorher/nachher)")
+    parser.add_argument("--ants", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    n = args.ants
+
+    model = AntInvasionModel(width=10, height=10, initial_native=0, initial_invasive=0, resource_field=True)
+    mesa_only = bytes_per_item(lambda i: BareAgent(model), n)
+
+    print(f"Ameisen: {n}")
+    print(f"Mesa-Agent ohne Felder    : {mesa_only:7.0f} B/Ameise (Registrierung, unique_id, pos)")
+    for ant_type, legacy_type in ((NativeAnt, LegacyNativeAnt), (InvasiveAnt, LegacyInvasiveAnt)):
+        before = bytes_per_item(lambda i: new_ant(model, legacy_type, i), n)
+        after = bytes_per_item(lambda i: new_ant(model, ant_type, i), n)
+        print(f"{ant_type.__name__:<12} vorher      : {before:7.0f} B/Ameise ({before - mesa_only:4.0f} eigene)")
+        print(f"{ant_type.__name__:<12} nachher     : {after:7.0f} B/Ameise ({after - mesa_only:4.0f} eigene)")
+
+    arrays = AntArrays()
+    arrays.add(n, (0, 0), energy=5.0, metabolism=0.2, bite_size=0.8)
+    soa = sum(getattr(arrays, name).nbytes for name in AntArrays.FIELDS) / n
+    print(f"AntArrays (vektorisiert)  : {soa:7.0f} B/Ameise")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# bench_step_phases.py
+# Benchmark: Laufzeit von AntInvasionModel.step() pro Phase über Grid-Grössen
+# und Populationen.
+#
+# Phasen (model.step_phases):
+#   native, invasive, hills_native, hills_invasive, regen, environment, collect
+#
+# Die Resultate landen als JSON (Umgebung + eine Zeile pro Konfiguration),
+# damit Versionen verglichen werden können:
+#
+# Ausführen (aus dem Ordner LE3):
+#     python benchmarks/bench_step_phases.py --out bench_vorher.json
+#     python benchmarks/bench_step_phases.py --out bench_nachher.json --compare bench_vorher.json
+#
+#     python benchmarks/bench_step_phases.py --sizes 51,251,1000 --populations 40:5,4000:500 --resource-field
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mesa  # noqa: E402
+import numpy as np  # noqa: E402
+
+from ants_invasion_model import AntInvasionModel  # noqa: E402
+
+
+# -------------------------------------------------------
+# Phasen (model.step_phases, gleiche Reihenfolge wie AntInvasionModel.step)
+# -------------------------------------------------------
+
+PHASES = ["native", "invasive", "hills_native", "hills_invasive", "regen", "environment", "collect"]
+
+
+def timed_step(model, timings: dict):
+    """Ein Step Phase für Phase, Zeiten (s) werden in timings aufsummiert."""
+    model.steps += 1
+    for name, phase in model.step_phases:
+        t0 = time.perf_counter()
+        phase()
+        timings[name] += time.perf_counter() - t0
+
+
+def build_model(size: int, n_native: int, n_invasive: int, resource_field: bool, seed: int):
+    return AntInvasionModel(
+        width=size,
+        height=size,
+        initial_native=n_native,
+        initial_invasive=n_invasive,
+        resource_field=resource_field,
+        seed=seed,
+    )
+
+
+# -------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------
+
+def bench_config(size, n_native, n_invasive, resource_field, steps, warmup, seed) -> dict:
+    t0 = time.perf_counter()
+    model = build_model(size, n_native, n_invasive, resource_field, seed)
+    build_s = time.perf_counter() - t0
+
+    warm = dict.fromkeys(PHASES, 0.0)
+    for _ in range(warmup):
+        timed_step(model, warm)
+
+    timings = dict.fromkeys(PHASES, 0.0)
+    n_agents = 0
+    for _ in range(steps):
+        n_agents += model.n_native + model.n_invasive
+        timed_step(model, timings)
+
+    phases_ms = {name: total / steps * 1000 for name, total in timings.items()}
+    return {
+        "size": size,
+        "initial_native": n_native,
+        "initial_invasive": n_invasive,
+        "resource_field": resource_field,
+        "steps": steps,
+        "warmup": warmup,
+        "build_s": build_s,
+        "mean_ants": n_agents / steps,
+        "step_ms": sum(phases_ms.values()),
+        "phases_ms": phases_ms,
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "mesa": mesa.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def config_key(row: dict):
+    return (row["size"], row["initial_native"], row["initial_invasive"], row["resource_field"])
+
+
+def print_row(row: dict, baseline=None):
+    phases = "  ".join(f"{name} {ms:8.2f}" for name, ms in row["phases_ms"].items())
+    line = (
+        f"{row['size']:5d}  {row['initial_native']:6d}:{row['initial_invasive']:<6d} "
+        f"{'field' if row['resource_field'] else 'patch'}  "
+        f"step {row['step_ms']:9.2f} ms | {phases}"
+    )
+    if baseline is not None:
+        line += f" | vs. Basis {row['step_ms'] / baseline['step_ms']:5.2f}x"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laufzeit von AntInvasionModel.step() pro Phase")
+    parser.add_argument("--sizes", default="51,101,251,501,1000", help="Grid-Kantenlängen, Komma-getrennt")
+    parser.add_argument("--populations", default="40:5,400:50,4000:500",
+                        help="initial_native:initial_invasive, Komma-getrennt")
+    parser.add_argument("--resource-field", action="store_true", help="ResourceField statt Patch-Agenten")
+    parser.add_argument("--steps", type=int, default=20, help="gemessene Steps pro Konfiguration")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench_step_phases.json")
+    parser.add_argument("--compare", help="frühere JSON-Datei als Vergleichsbasis")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    populations = [tuple(int(n) for n in p.split(":")) for p in args.populations.split(",")]
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = {config_key(row): row for row in json.load(fh)["results"]}
+
+    results = []
+    for size in sizes:
+        for n_native, n_invasive in populations:
+            row = bench_config(size, n_native, n_invasive, args.resource_field,
+                               args.steps, args.warmup, args.seed)
+            results.append(row)
+            print_row(row, baseline.get(config_key(row)))
+
+    with open(args.out, "w") as fh:
+        json.dump({"environment": environment(), "results": results}, fh, indent=2)
+    print(f"Resultate: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
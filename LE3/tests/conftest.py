@@ -0,0 +1,40 @@
+# Tests für LE3 (aus dem Projektordner: python -m pytest -q LE3/tests)
+#
+# Die Module in LE3 werden wie in den Skripten direkt importiert
+# (from ants_invasion_model import ...), darum LE3 in den Suchpfad.
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ENGINE_STEPS = 150
+
+# Mehrere Hügel pro Art, damit Reproduktion und Hügel-Tabellen mit mehr als
+# einem Hügel laufen. Schwache Erwärmung und wenig Angriffe, damit die
+# Habitatqualität > 0 bleibt und beide Arten bis zum Schluss Ameisen erzeugen.
+ENGINE_PARAMS = {
+    "width": 40, "height": 40, "seed": 3,
+    "initial_native": 150, "initial_invasive": 150,
+    "n_native_hills": 4, "n_invasive_hills": 3, "native_hill_placement": "random",
+    "warming_rate": 0.00005, "attack_prob": 0.05,
+}
+
+
+@pytest.fixture
+def engine_data():
+    """run(model_cls, **kwargs) -> Modelldaten nach ENGINE_STEPS Steps mit ENGINE_PARAMS."""
+
+    def run(model_cls, **kwargs):
+        model = model_cls(**{**ENGINE_PARAMS, "n_steps": ENGINE_STEPS, **kwargs})
+        try:
+            for _ in range(ENGINE_STEPS):
+                model.step()
+            return model.datacollector.get_model_vars_dataframe()
+        finally:
+            if hasattr(model, "close"):
+                model.close()
+
+    return run
@@ -0,0 +1,107 @@
+# Checkpoint/Restore: speichern -> laden -> weiterrechnen ist bit-identisch
+# zu einem Lauf ohne Unterbruch (siehe ants_invasion_checkpoint.py).
+
+import pandas as pd
+import pytest
+from mesa import Agent
+
+from ants_invasion_checkpoint import _id_counters, load_checkpoint, save_checkpoint
+from ants_invasion_model import AntInvasionModel, InvasiveAnt, NativeAnt
+
+BEFORE, AFTER = 60, 60
+
+CONFIGS = {
+    "standard": {},
+    "resource_field": {"resource_field": True, "lazy_regen": True, "n_steps": BEFORE + AFTER},
+    "hills_profile_stop": {
+        "n_native_hills": 3, "n_invasive_hills": 2, "native_hill_placement": "random",
+        "collect_hills": True, "hill_events": True, "profile": True,
+        "steady_window": 500, "steady_tol": 0.01,
+    },
+    "death_events": {"death_events": True, "metabolism_native": 0.6, "metabolism_invasive": 0.5},
+}
+
+
+def _run(model, n: int):
+    for _ in range(n):
+        model.step()
+
+
+def _ants(model) -> list:
+    return [
+        (type(a).__name__, a.unique_id, a.pos, a.energy, a.mode)
+        for agent_type in (NativeAnt, InvasiveAnt)
+        for a in model.agents_by_type.get(agent_type, [])
+    ]
+
+
+def _profile(model) -> pd.DataFrame:
+    # Laufzeiten (<phase>_s) sind nie gleich, nur Anzahlen und Zähler vergleichen
+    df = model.profiler.get_dataframe()
+    return df[[name for name in df.columns if not name.endswith("_s")]]
+
+
+@pytest.mark.parametrize("name", sorted(CONFIGS))
+def test_restore_continues_bit_identical(name, tmp_path):
+    kwargs = {"width": 25, "height": 25, "seed": 11, **CONFIGS[name]}
+
+    reference = AntInvasionModel(**kwargs)
+    _run(reference, BEFORE + AFTER)
+
+    model = AntInvasionModel(**kwargs)
+    _run(model, BEFORE)
+    path = save_checkpoint(model, tmp_path / "checkpoint.npz")
+    restored = load_checkpoint(path)
+    _run(restored, AFTER)
+
+    assert restored.steps == reference.steps
+    pd.testing.assert_frame_equal(
+        restored.datacollector.get_model_vars_dataframe(),
+        reference.datacollector.get_model_vars_dataframe(),
+    )
+    assert _ants(restored) == _ants(reference)
+    if reference.hill_datacollector is not None:
+        pd.testing.assert_frame_equal(
+            restored.hill_datacollector.get_hill_vars_dataframe(),
+            reference.hill_datacollector.get_hill_vars_dataframe(),
+        )
+    if reference.profiler is not None:
+        pd.testing.assert_frame_equal(_profile(restored), _profile(reference))
+
+
+def test_reseed_branches_differ(tmp_path):
+    model = AntInvasionModel(width=25, height=25, seed=11)
+    _run(model, BEFORE)
+    path = save_checkpoint(model, tmp_path / "checkpoint.npz")
+
+    branches = []
+    for seed in (1, 2):
+        branch = load_checkpoint(path, reseed=seed)
+        _run(branch, AFTER)
+        branches.append(branch.datacollector.get_model_vars_dataframe())
+
+    pd.testing.assert_frame_equal(branches[0].iloc[:BEFORE], branches[1].iloc[:BEFORE])
+    assert not branches[0].equals(branches[1])
+
+
+def test_unique_ids_continue(tmp_path):
+    # Geburten nach dem Laden bekommen dieselben unique_ids wie ohne Unterbruch
+    kwargs = {"width": 25, "height": 25, "seed": 11}
+    reference = AntInvasionModel(**kwargs)
+    _run(reference, BEFORE + AFTER)
+
+    model = AntInvasionModel(**kwargs)
+    _run(model, BEFORE)
+    restored = load_checkpoint(save_checkpoint(model, tmp_path / "checkpoint.npz"))
+    _run(restored, AFTER)
+
+    assert max(a.unique_id for a in restored.agents) > max(a.unique_id for a in model.agents)
+    assert [a.unique_id for a in restored.agents] == [a.unique_id for a in reference.agents]
+    assert next(_id_counters(restored)[restored]) == next(_id_counters(reference)[reference])
+
+
+def test_unknown_id_counter_fails(tmp_path, monkeypatch):
+    model = AntInvasionModel(width=10, height=10, seed=1)
+    monkeypatch.setattr(Agent, "_ids", {model: iter(range(10**6))})
+    with pytest.raises(RuntimeError, match="Agent._ids"):
+        save_checkpoint(model, tmp_path / "checkpoint.npz")
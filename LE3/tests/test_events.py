@@ -0,0 +1,68 @@
+# Ereignisgesteuerte Varianten (hill_events, death_events) müssen dieselben
+# Läufe ergeben wie das Abfragen in jedem Step.
+
+import pandas as pd
+import pytest
+
+from ants_invasion_model import AntInvasionModel, InvasiveAnt, NativeAnt
+from ants_invasion_vectorized import VectorizedAntInvasionModel
+
+N_STEPS = 150
+
+# Mehrere Hügel, kurze Lebensdauer ohne Futter (es wird verhungert, gefressen
+# und eingelagert) und Habitatqualität > 0, damit beide Arten nachkommen.
+PARAMS = {
+    "width": 30, "height": 30, "seed": 5,
+    "initial_native": 120, "initial_invasive": 120,
+    "n_native_hills": 3, "n_invasive_hills": 2, "native_hill_placement": "random",
+    "metabolism_native": 0.6, "metabolism_invasive": 0.5,
+    "warming_rate": 0.00005, "attack_prob": 0.05,
+}
+
+
+def _run(model_cls, **kwargs):
+    model = model_cls(**{**PARAMS, "n_steps": N_STEPS, **kwargs})
+    for _ in range(N_STEPS):
+        model.step()
+    return model
+
+
+def _ants(model) -> list:
+    return [
+        (a.unique_id, a.pos, a.energy, a.mode)
+        for agent_type in (NativeAnt, InvasiveAnt)
+        for a in model.agents_by_type.get(agent_type, [])
+    ]
+
+
+@pytest.mark.parametrize("model_cls", [AntInvasionModel, VectorizedAntInvasionModel])
+def test_hill_events_identical(model_cls):
+    pd.testing.assert_frame_equal(
+        _run(model_cls, hill_events=True).datacollector.get_model_vars_dataframe(),
+        _run(model_cls, hill_events=False).datacollector.get_model_vars_dataframe(),
+    )
+
+
+@pytest.mark.parametrize("extra", [{}, {"hill_events": True, "resource_field": True}])
+def test_death_events_identical(extra):
+    polled = _run(AntInvasionModel, **extra)
+    events = _run(AntInvasionModel, death_events=True, **extra)
+    pd.testing.assert_frame_equal(
+        events.datacollector.get_model_vars_dataframe(),
+        polled.datacollector.get_model_vars_dataframe(),
+    )
+    assert _ants(events) == _ants(polled)
+
+
+def test_death_events_starve_on_schedule():
+    # ohne Futter und Hügel: jede Ameise verhungert nach ceil(energy / metabolism) Steps
+    model = AntInvasionModel(width=10, height=10, seed=1, resource_density=0.0,
+                             patch_initial_share=0.0, patch_regen=0.0,
+                             initial_native=10, initial_invasive=0, native_energy=5.0,
+                             metabolism_native=0.5, death_events=True)
+    alive = []
+    for _ in range(12):
+        model.step()
+        alive.append(model.n_native)
+    assert alive[:9] == [10] * 9 and alive[9:] == [0, 0, 0]
+    assert len(model.death_queue) == 0
@@ -0,0 +1,26 @@
+# Numba-Kernels (ants_invasion_kernels.py) rechnen Zahl für Zahl dasselbe wie
+# der NumPy-Pfad: gleiche Modelldaten mit kernels="numba" und "numpy".
+
+import pandas as pd
+import pytest
+
+from ants_invasion_kernels import HAVE_NUMBA
+from ants_invasion_tiled import TiledAntInvasionModel
+from ants_invasion_vectorized import VectorizedAntInvasionModel
+
+pytestmark = pytest.mark.skipif(not HAVE_NUMBA, reason="Numba nicht installiert")
+
+
+@pytest.mark.parametrize("torus", [False, True])
+def test_vectorized_numba_equals_numpy(engine_data, torus):
+    pd.testing.assert_frame_equal(
+        engine_data(VectorizedAntInvasionModel, kernels="numba", torus=torus),
+        engine_data(VectorizedAntInvasionModel, kernels="numpy", torus=torus),
+    )
+
+
+def test_tiled_numba_equals_numpy(engine_data):
+    pd.testing.assert_frame_equal(
+        engine_data(TiledAntInvasionModel, tiles=(2, 2), processes=False, kernels="numba"),
+        engine_data(TiledAntInvasionModel, tiles=(2, 2), processes=False, kernels="numpy"),
+    )
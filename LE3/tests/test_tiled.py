@@ -0,0 +1,13 @@
+# Kachel-Modus (ants_invasion_tiled.py): gleicher seed und gleiche Kachelung
+# ergeben denselben Lauf, mit Worker-Prozessen und im eigenen Prozess.
+
+import pandas as pd
+
+from ants_invasion_tiled import TiledAntInvasionModel
+
+
+def test_tiled_processes_equal_inline(engine_data):
+    pd.testing.assert_frame_equal(
+        engine_data(TiledAntInvasionModel, tiles=(2, 2), processes=True),
+        engine_data(TiledAntInvasionModel, tiles=(2, 2), processes=False),
+    )
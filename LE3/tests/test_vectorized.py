@@ -0,0 +1,86 @@
+# VectorizedAntInvasionModel folgt den Regeln von AntInvasionModel: gleiche
+# Spalten im DataCollector, gleich viele Zeilen, und über mehrere Seeds
+# gemittelt dieselben Verläufe. Zahl für Zahl gleich sind die Läufe nicht
+# (andere Zufallszahlen, Arrays statt Agenten), darum ein Vergleich der
+# Mittelwerte mit Toleranz.
+#
+# Dazu ein festgehaltener Referenzlauf der vektorisierten Engine, damit auch
+# kleine Änderungen an den Regeln auffallen (z.B. in _reproduce), die im
+# Mittelwert untergehen. Ändern sich die Regeln absichtlich, REFERENCE neu setzen.
+
+import numpy as np
+import pytest
+
+from ants_invasion_model import MODEL_REPORTERS, AntInvasionModel
+from ants_invasion_vectorized import VectorizedAntInvasionModel
+
+SEEDS = range(12)
+N_STEPS = 200
+
+# kleineres Grid als ENGINE_PARAMS, damit 12 Läufe der Agenten-Engine schnell bleiben
+PARAMS = {
+    "width": 30, "height": 30,
+    "initial_native": 100, "initial_invasive": 100,
+    "n_native_hills": 2, "n_invasive_hills": 2, "native_hill_placement": "random",
+    "warming_rate": 0.00005, "attack_prob": 0.05,
+}
+
+# Mittelwerte über SEEDS dürfen in keinem Step weiter als TOLERANCE
+# Standardfehler der Differenz auseinanderliegen (Streuung über die Seeds
+# beider Engines, plus 0.5 für Steps ohne Streuung). Gemessen: höchstens 1.5.
+# Falsche Regeln in der vektorisierten Engine fallen auf, z.B. ohne den
+# Nahrungsbonus der Invasiven (4.2), mit halber Rückkehr-Wahrscheinlichkeit
+# (8.0) oder doppelter Angriffswahrscheinlichkeit (3.8).
+TOLERANCE = 3.5
+COMPARED = ["NativeAnts", "InvasiveAnts", "TotalResources"]
+
+
+def _runs(model_cls) -> list:
+    frames = []
+    for seed in SEEDS:
+        model = model_cls(**{**PARAMS, "seed": seed, "n_steps": N_STEPS})
+        for _ in range(N_STEPS):
+            model.step()
+        frames.append(model.datacollector.get_model_vars_dataframe())
+    return frames
+
+
+@pytest.fixture(scope="module")
+def both_engines():
+    return _runs(AntInvasionModel), _runs(VectorizedAntInvasionModel)
+
+
+def test_same_datacollector_layout(both_engines):
+    agents, vectorized = both_engines
+    for a, v in zip(agents, vectorized):
+        assert list(a.columns) == list(v.columns) == list(MODEL_REPORTERS)
+        assert len(a) == len(v) == N_STEPS
+        assert (a.dtypes == v.dtypes).all()
+
+
+@pytest.mark.parametrize("column", COMPARED)
+def test_mean_trajectories_agree(both_engines, column):
+    agents, vectorized = both_engines
+    a = np.array([df[column].to_numpy() for df in agents])
+    v = np.array([df[column].to_numpy() for df in vectorized])
+    diff = np.abs(a.mean(axis=0) - v.mean(axis=0))
+    se = np.sqrt(a.var(axis=0, ddof=1) / len(a) + v.var(axis=0, ddof=1) / len(v))
+    worst = (diff / (se + 0.5 / TOLERANCE)).max()
+    assert worst <= TOLERANCE, f"{column}: Mittelwerte weichen bis {worst:.1f} Standardfehler ab"
+
+
+# letzte Zeile von VectorizedAntInvasionModel(**ENGINE_PARAMS) nach ENGINE_STEPS Steps (conftest.py)
+REFERENCE = {
+    "NativeAnts": 52,
+    "InvasiveAnts": 354,
+    "TotalResources": 3648.05,
+    "HabitatQuality": 0.433700951,
+    "Warming": 0.0075,
+    "StoredFoodNative": 0.75,
+    "StoredFoodInvasive": 3930.435,
+}
+
+
+def test_vectorized_reference_run(engine_data):
+    last = engine_data(VectorizedAntInvasionModel).iloc[-1]
+    assert last.to_dict() == pytest.approx(REFERENCE, rel=1e-9)